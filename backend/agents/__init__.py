@@ -1,13 +1,22 @@
-from backend.agents.master_agent import MasterAgent
-from backend.agents.sales_agent import SalesAgent
+from backend.agents.master_agent import MasterAgent, get_master_agent
 from backend.agents.verification_agent import VerificationAgent
 from backend.agents.underwriting_agent import UnderwritingAgent
 from backend.agents.sanction_agent import SanctionAgent
 
 __all__ = [
     "MasterAgent",
+    "get_master_agent",
     "SalesAgent",
     "VerificationAgent",
     "UnderwritingAgent",
     "SanctionAgent",
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    # SalesAgent pulls in httpx; resolve it only when someone actually asks for it
+    if name == "SalesAgent":
+        from backend.agents.sales_agent import SalesAgent
+
+        return SalesAgent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,178 @@
+# backend/agents/conversation_flow.py
+
+import json
+import re
+import threading
+import time
+from pathlib import Path
+
+from backend.services.metrics import TURN_LATENCY
+
+FLOW_PATH = Path(__file__).resolve().parent.parent / "data" / "conversation_flow.json"
+
+# Input normalizers a "collect" state may name in its config
+NORMALIZERS = {
+    "strip": str.strip,
+    "title": lambda s: s.strip().title(),
+    "upper": lambda s: s.strip().upper(),
+    "digits": lambda s: re.sub(r"[^\d]", "", s),
+}
+
+
+class KeywordMatcher:
+    """
+    All keyword intents in one precompiled alternation.
+
+    Keywords match whole words (an optional plural 's' is allowed); a trailing '*'
+    makes a keyword a prefix ("borrow*" also matches "borrowing"). One scan returns
+    every tag present in the text.
+    """
+
+    def __init__(self, tagged: dict):
+        words = {}  # keyword -> tags (a keyword may belong to several intents)
+        for tag, keywords in tagged.items():
+            for word in keywords:
+                words.setdefault(word.lower(), set()).add(tag)
+
+        # One capture group per keyword, longest first so phrases win over their first word
+        self._group_tags = []
+        alternatives = []
+        for word in sorted(words, key=len, reverse=True):
+            body = re.escape(word.rstrip("*")).replace(r"\ ", r"\s+")
+            alternatives.append(f"({body}" + (r"\w*)" if word.endswith("*") else r"s?)\b"))
+            self._group_tags.append(frozenset(words[word]))
+        self._regex = re.compile(r"\b(?:" + "|".join(alternatives) + ")", re.IGNORECASE)
+
+    def scan(self, text: str) -> set:
+        found = set()
+        for m in self._regex.finditer(text or ""):
+            found |= self._group_tags[m.lastindex - 1]
+        return found
+
+
+class StateSpec:
+    """One row of the transition table."""
+
+    __slots__ = ("name", "handler", "next", "ai_routing", "always_ai", "options")
+
+    def __init__(self, name: str, spec: dict):
+        self.name = name
+        self.handler = spec["handler"]
+        self.next = spec.get("next")
+        self.ai_routing = spec.get("ai_routing", True)
+        self.always_ai = spec.get("always_ai", False)
+        self.options = spec
+        if "pattern" in spec:
+            self.options = {**spec, "pattern": re.compile(spec["pattern"])}
+        if "normalize" in spec and spec["normalize"] not in NORMALIZERS:
+            raise ValueError(f"State {name}: unknown normalizer '{spec['normalize']}'.")
+
+
+class FlowStats:
+    """Per-state turn counts and handler latency."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_state: dict = {}
+
+    def record(self, state: str, seconds: float):
+        TURN_LATENCY.observe(seconds, state=state)
+        with self._lock:
+            row = self._by_state.get(state)
+            if row is None:
+                row = self._by_state[state] = [0, 0.0, 0.0]
+            row[0] += 1
+            row[1] += seconds
+            row[2] = max(row[2], seconds)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                state: {
+                    "turns": n,
+                    "avg_ms": round(total / n * 1000, 4),
+                    "max_ms": round(peak * 1000, 3),
+                    "total_ms": round(total * 1000, 3),
+                }
+                for state, (n, total, peak) in self._by_state.items()
+            }
+
+
+class ConversationFlow:
+    """
+    The loan conversation declared as data (data/conversation_flow.json) and compiled once:
+    a transition table of StateSpecs, one KeywordMatcher covering AI routing, decline,
+    resend and every loan product, and the allowed tenures. Adding a state or a loan
+    product is a config change; `bind()` resolves handler names against an agent and
+    fails fast if one is missing.
+    """
+
+    def __init__(self, path: Path = FLOW_PATH):
+        with open(path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+        self.start = config["start"]
+        self.states = {name: StateSpec(name, spec) for name, spec in config["states"].items()}
+        for spec in self.states.values():
+            if spec.next and spec.next not in self.states:
+                raise ValueError(f"State {spec.name}: unknown next state '{spec.next}'.")
+
+        self.products = {p["key"]: p["label"] for p in config.get("loan_products", [])}
+        tagged = {tag: words for tag, words in config.get("keywords", {}).items()}
+        for p in config.get("loan_products", []):
+            tagged[f"loan:{p['key']}"] = p["keywords"]
+        self.matcher = KeywordMatcher(tagged)
+        self.tenures = tuple(config.get("tenures", (12, 24, 36)))
+        self.stats = FlowStats()
+
+    def bind(self, agent) -> dict:
+        """Map each state to the agent's `_<handler>` method."""
+        table = {}
+        for name, spec in self.states.items():
+            handler = getattr(agent, f"_{spec.handler}", None)
+            if handler is None:
+                raise ValueError(f"State {name}: {type(agent).__name__} has no handler '_{spec.handler}'.")
+            table[name] = handler
+        return table
+
+    def product(self, tags: set) -> str | None:
+        """First configured loan product whose keywords appear in the scanned tags."""
+        for key, label in self.products.items():
+            if f"loan:{key}" in tags:
+                return label
+        return None
+
+    def routes_to_ai(self, state: str, tags: set) -> bool:
+        spec = self.states.get(state)
+        if spec is None:
+            return False
+        return spec.always_ai or (spec.ai_routing and "ai" in tags)
+
+    def timed(self, state: str):
+        return _Timer(self.stats, state)
+
+
+class _Timer:
+    __slots__ = ("stats", "state", "t0")
+
+    def __init__(self, stats, state):
+        self.stats, self.state = stats, state
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.stats.record(self.state, time.perf_counter() - self.t0)
+
+
+_flow: ConversationFlow | None = None
+_flow_lock = threading.Lock()
+
+
+def get_conversation_flow() -> ConversationFlow:
+    """Process-wide compiled flow, built on first use."""
+    global _flow
+    if _flow is None:
+        with _flow_lock:
+            if _flow is None:
+                _flow = ConversationFlow()
+    return _flow
@@ -1,18 +1,41 @@
 import os
 import re
-import json
 import random
-from pathlib import Path
+import threading
 
 # === Import submodules ===
-from backend.services.email_otp_service import EmailOTPService
+from backend.services.credit_bureau import BureauUnavailable
+from backend.services.event_bus import get_event_bus
+from backend.services.otp_dispatcher import OTPDispatcher
 from backend.services.smart_advisor import SmartAdvisor, rupees
-from backend.agents.sales_agent import SalesAgent
 from backend.agents.verification_agent import VerificationAgent
 from backend.agents.underwriting_agent import UnderwritingAgent
 from backend.agents.sanction_agent import SanctionAgent
+from backend.services.session_store import ConversationSession
+from backend.agents.conversation_flow import NORMALIZERS, get_conversation_flow
+from backend.data.customer_store import get_customer_store
 
-DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+SANCTION_PROMPT = "Reply 'yes' to proceed and generate your sanction letter, or send one of the tenures above to switch."
+
+
+class _lazy:
+    """
+    Attribute built on first access, once per instance even under concurrent first requests.
+    Assigning the attribute directly (e.g. a stub in a benchmark) skips the factory.
+    """
+
+    def __init__(self, factory):
+        self.factory = factory
+        self.name = factory.__name__
+        self.lock = threading.Lock()
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        with self.lock:
+            if self.name not in obj.__dict__:
+                obj.__dict__[self.name] = self.factory(obj)
+        return obj.__dict__[self.name]
 
 
 class MasterAgent:
@@ -24,70 +47,98 @@ class MasterAgent:
 
     def __init__(self):
         # === Core Modules ===
-        self.sales_agent = SalesAgent()
+        # The LLM and SMTP collaborators (`sales_agent`, `otp_service`) need secrets and
+        # heavier imports, so they are built on first use or by the startup warm-up.
         self.verification_agent = VerificationAgent()
         self.underwriting_agent = UnderwritingAgent()
         self.sanction_agent = SanctionAgent()
         self.smart_advisor = SmartAdvisor()
-        self.otp_service = EmailOTPService()
-
-        # === State & Context ===
-        self.state = "GREETING"
-        self.pending_otp = None
-        self.otp_verified = False
-        self.ctx = {
-            "name": None,
-            "email": None,
-            "phone": None,
-            "pan": None,
-            "customer": None,
-            "otp": None,
-            "loan_type": None,
-            "requested_amount": None,
-            "preferred_tenure": None,
-            "approved": None,
-        }
+        self.customer_store = get_customer_store()
+
+        # Transition table and keyword matcher, compiled once from data/conversation_flow.json
+        self.flow = get_conversation_flow()
+        self.handlers = self.flow.bind(self)
+
+        # Per-applicant state (state, ctx, pending OTP) lives in a ConversationSession;
+        # this agent and its sub-agents are shared across all sessions.
+
+    @_lazy
+    def sales_agent(self):
+        from backend.agents.sales_agent import SalesAgent  # httpx + dotenv, only once an answer needs the LLM
+
+        return SalesAgent()
+
+    @_lazy
+    def otp_service(self):
+        from backend.services.email_otp_service import EmailOTPService
+
+        return EmailOTPService()
+
+    @_lazy
+    def otp_dispatcher(self):
+        return OTPDispatcher(self.otp_service, name="email-otp")
+
+    async def aclose(self):
+        """Release whatever was actually built: pooled LLM connections, AI cache, OTP workers."""
+        if "sales_agent" in self.__dict__:
+            self.sales_agent.llm.close()
+            await self.sales_agent.client.aclose()
+            self.sales_agent.cache.save()
+        if "otp_dispatcher" in self.__dict__:
+            self.otp_dispatcher.shutdown()
 
     # ==============================
     # MAIN ENTRY POINT
     # ==============================
-    def process_message(self, message: str) -> dict:
+    def process_message(self, message: str, session: ConversationSession) -> dict:
         text = (message or "").strip()
+        state = session.state
 
         # AI fallback for generic financial questions
-        loan_keywords = ["loan", "interest", "emi", "limit", "credit", "borrow"]
-        if any(w in text.lower() for w in loan_keywords):
-            if self.state not in [
-                "COLLECT_NAME", "COLLECT_EMAIL", "COLLECT_PHONE", "COLLECT_PAN", "OTP_SENT",
-            ]:
-                return self._ai_context_response(text)
-
-        # Map conversation states
-        state_map = {
-            "GREETING": self._greet,
-            "COLLECT_NAME": self._collect_name,
-            "COLLECT_EMAIL": self._collect_email,
-            "COLLECT_PHONE": self._collect_phone,
-            "COLLECT_PAN": self._collect_pan,
-            "OTP_SENT": self._verify_otp,
-            "VERIFYING": self._verify_in_crm,
-            "LOAN_INTENT": self._loan_intent,
-            "COLLECT_AMOUNT": self._collect_amount,
-            "COLLECT_TENURE": self._collect_tenure,
-            "UNDERWRITING": self._underwrite_and_decide,
-            "SANCTION": self._generate_sanction,
-            "DONE": self._handle_post_sanction,
-        }
+        if self._is_ai_question(session, text):
+            with self.flow.timed("AI"):
+                return self._ai_context_response(session, text)
+
+        handler = self.handlers.get(state)
+        if handler is None:
+            return self.sales_agent.provide_offer(text, fallback=self.ai_fallback(session, text))
+        with self.flow.timed(state):
+            return handler(session, text)
 
-        handler = state_map.get(self.state)
-        return handler(text) if handler else self.sales_agent.provide_offer(text)
+    def routes_to_ai(self, session: ConversationSession, message: str) -> bool:
+        """True when this turn is answered by the LLM rather than the structured flow."""
+        return self.flow.routes_to_ai(session.state, self.flow.matcher.scan(message))
 
     # ==============================
     # AI CONTEXTUAL REPLIES
     # ==============================
-    def _ai_context_response(self, user_text: str):
-        cust = self.ctx.get("customer")
-        approved = self.ctx.get("approved")
+    def _is_ai_question(self, session, text: str) -> bool:
+        spec = self.flow.states.get(session.state)
+        return bool(spec and spec.ai_routing and "ai" in self.flow.matcher.scan(text))
+
+    def _ai_context_response(self, session, user_text: str):
+        context, personalized = self.ai_context(session)
+        reply = self.sales_agent.provide_offer(
+            user_text, context=context, personalized=personalized, transcript=session.transcript,
+            fallback=self.ai_fallback(session, user_text),
+        )
+        if not reply.get("fallback"):  # canned answers would read as model history and disable the cache
+            self.remember_exchange(session, user_text, reply["message"])
+        return reply
+
+    def remember_exchange(self, session: ConversationSession, question: str, answer: str):
+        """Keep an advisor Q&A so later AI turns see the conversation (older turns get summarized)."""
+        if answer and not answer.startswith("⚠️"):  # transport errors are not part of the conversation
+            self.sales_agent.prompts.record(session.transcript, question, answer)
+
+    def ai_context(self, session: ConversationSession) -> tuple[str, bool]:
+        """
+        Build the advisor context for this session, kept separate from the user's question.
+        Returns (context, personalized) — personalized contexts carry customer data and
+        must never be answered from the shared response cache.
+        """
+        cust = session.ctx.get("customer")
+        approved = session.ctx.get("approved")
 
         context = "You are CapitalMitra, a professional loan advisor assisting a verified customer."
         if cust:
@@ -95,205 +146,301 @@ class MasterAgent:
                 f" Customer: {cust['name']}, Credit Score: {cust['credit_score']}, "
                 f"Pre-approved Limit: ₹{cust['pre_approved_limit']}."
             )
+        envelope = session.ctx.get("envelope")
+        if envelope and envelope["eligible"] and not approved:
+            context += f" Eligible to borrow up to ₹{envelope['max_amount']}."
         if approved:
+            plan = approved["chosen_plan"]
             context += (
-                f" They were approved for ₹{approved['approved_amount']} at {approved['rate']}% "
-                f"for {approved['tenure']} months."
+                f" They were approved for ₹{approved['approved_amount']} at {plan['rate']}% "
+                f"for {plan['tenure']} months."
             )
 
-        prompt = f"{context}\nUser: {user_text}"
-        return self.sales_agent.provide_offer(prompt)
+        return context, bool(cust or approved)
+
+    def ai_fallback(self, session: ConversationSession, question: str) -> str:
+        """Templated answer from the session's ctx, for when the model is slow, failing or circuit-broken."""
+        return self.smart_advisor.fallback_answer(question, session.ctx)
 
     # ==============================
     # STRUCTURED CONVERSATION FLOW
     # ==============================
-    def _greet(self, _):
-        self.state = "COLLECT_NAME"
+    def _advance(self, session, state: str | None = None):
+        """Move to `state`, or to the current state's configured next state."""
+        session.state = state or self.flow.states[session.state].next
+
+    def _greet(self, session, _):
+        self._advance(session)
         return {"message": "👋 Hi! I’m CapitalMitra, your AI loan assistant. May I know your full name?"}
 
-    def _collect_name(self, text):
-        if len(text.split()) < 2:
-            return {"message": "Please share your full name (first & last)."}
-        self.ctx["name"] = text.title().strip()
-        self.state = "COLLECT_EMAIL"
-        return {"message": f"Thanks, {self.ctx['name']}! 📧 Could you share your email address?"}
-
-    def _collect_email(self, text):
-        if not re.fullmatch(r"[^@\s]+@[^@\s]+\.[^@\s]+", text):
-            return {"message": "That doesn’t look like a valid email. Please re-enter it."}
-        self.ctx["email"] = text.strip()
-        self.state = "COLLECT_PHONE"
-        return {"message": "Got it! Please enter your 10-digit phone number."}
-
-    def _collect_phone(self, text):
-        phone = re.sub(r"[^\d]", "", text)
-        if not re.fullmatch(r"\d{10}", phone):
-            return {"message": "That didn’t look like a valid 10-digit number. Try again (e.g., 9876543210)."}
-        self.ctx["phone"] = phone
-        self.state = "COLLECT_PAN"
-        return {"message": "Perfect! Lastly, please enter your PAN (e.g., ABCDE1234F)."}
-
-    def _collect_pan(self, text):
-        pan = text.strip().upper()
-        if not re.fullmatch(r"[A-Z]{5}\d{4}[A-Z]", pan):
-            return {"message": "PAN format seems invalid. Please re-enter like ABCDE1234F."}
-
-        self.ctx["pan"] = pan
-        otp = str(random.randint(100000, 999999))
-        self.pending_otp = otp
-        self.otp_service.send_otp(self.ctx["email"], otp)
-        self.state = "OTP_SENT"
-        return {"message": f"🔐 OTP sent to {self.ctx['email']}. Please enter it to verify."}
+    def _collect(self, session, text):
+        """Generic config-driven field capture: normalize, validate, store, optional action, advance."""
+        opts = self.flow.states[session.state].options
+        value = NORMALIZERS[opts.get("normalize", "strip")](text)
+        if not opts["pattern"].fullmatch(value):
+            return {"message": opts["error"]}
+        session.ctx[opts["field"]] = value
+        if opts.get("action"):
+            getattr(self, f"_{opts['action']}")(session)
+        self._advance(session)
+        return {"message": opts["reply"].format(**session.ctx)}
+
+    def _verify_otp(self, session, text):
+        if "resend" in self.flow.matcher.scan(text):
+            self._send_otp(session)
+            return {"message": f"🔁 A new OTP is on its way to {session.ctx['email']}."}
 
-    def _verify_otp(self, text):
         otp = re.sub(r"[^\d]", "", text)
-        if otp == self.pending_otp:
-            self.pending_otp = None
-            self.otp_verified = True
-            return self._verify_in_crm()
+        if otp == session.pending_otp:
+            session.pending_otp = None
+            session.otp_verified = True
+            return self._verify_in_crm(session)
+
+        delivery = self.otp_dispatcher.status(session.otp_job)
+        if delivery and delivery["status"] == "failed":
+            return {"message": "⚠️ We couldn’t deliver your OTP email. Type 'resend' to try again."}
         return {"message": "❌ Incorrect OTP. Please try again."}
 
-    def _verify_in_crm(self, _=None):
-        cust = self._find_customer(self.ctx["pan"], self.ctx["email"], self.ctx["phone"])
+    def _verify_in_crm(self, session, _=None):
+        cust = self._find_customer(session.ctx["pan"], session.ctx["email"], session.ctx["phone"])
         if not cust:
-            self.state = "DONE"
+            self._advance(session, "DONE")
             return {"message": "❌ No matching KYC record found. Please contact our nearest branch."}
 
-        self.ctx["customer"] = cust
-        if not self.verification_agent.verify_customer(cust):
-            self.state = "DONE"
+        session.ctx["customer"] = cust
+        if not self.verification_agent.verify_customer(cust, session_id=session.session_id):
+            self._advance(session, "DONE")
             return {"message": "❌ KYC verification failed. Please contact support."}
 
-        self.state = "LOAN_INTENT"
+        # Everything underwriting will decide about the amount, computed once so later turns answer instantly
+        try:
+            envelope = self.underwriting_agent.eligibility_envelope(cust, tenures=self.flow.tenures)
+        except BureauUnavailable:
+            self._advance(session, "VERIFYING")  # the next message retries from here
+            return {"message": "⚠️ We couldn’t reach the credit bureau just now. Send any message to retry."}
+        session.ctx["envelope"] = envelope
+        if not envelope["eligible"]:
+            self._advance(session, "DONE")
+            return {"message": f"✅ KYC verified, but you’re not eligible for a loan right now: {envelope['reason']}"}
+
+        self._advance(session, self.flow.states["VERIFYING"].next)
         return {
             "message": (
                 f"✅ KYC verified successfully! Credit Score: {cust['credit_score']} | "
-                f"Pre-approved Limit: ₹{cust['pre_approved_limit']:,}.\n"
+                f"Pre-approved Limit: ₹{cust['pre_approved_limit']:,} | "
+                f"Eligible up to ₹{envelope['max_amount']:,}.\n"
                 "Which type of loan are you interested in — personal, car, or home?"
             )
         }
 
-    def _loan_intent(self, text):
-        low = text.lower()
-        if any(w in low for w in ["no", "later", "not now"]):
-            self.state = "DONE"
+    def _loan_intent(self, session, text):
+        tags = self.flow.matcher.scan(text)
+        if "decline" in tags:
+            self._advance(session, "DONE")
             return {"message": "No problem! You can return anytime to apply for a loan. 😊"}
 
-        loan_types = {
-            "car": "Car Loan 🚗",
-            "auto": "Car Loan 🚗",
-            "home": "Home Loan 🏠",
-            "education": "Education Loan 🎓",
-            "business": "Business Loan 💼",
-            "personal": "Personal Loan 💰",
-        }
-
-        for key, loan_name in loan_types.items():
-            if key in low:
-                self.ctx["loan_type"] = loan_name
-                self.state = "COLLECT_AMOUNT"
-                return {"message": f"Got it! How much would you like to borrow for your {loan_name.lower()}?"}
+        loan_name = self.flow.product(tags)
+        if loan_name:
+            session.ctx["loan_type"] = loan_name
+            self._advance(session)
+            return {"message": f"Got it! How much would you like to borrow for your {loan_name.lower()}?"}
 
         return {"message": "Please mention what type of loan you’d like — car, home, or personal?"}
 
-    def _collect_amount(self, text):
+    def _collect_amount(self, session, text):
         amt = self._extract_amount(text)
         if not amt:
             return {"message": "Please enter a valid amount (e.g., 500000)."}
-        self.ctx["requested_amount"] = amt
-        self.state = "COLLECT_TENURE"
+
+        envelope = session.ctx.get("envelope")
+        if envelope and amt > envelope["max_amount"]:
+            if amt > envelope["hard_cap"]:
+                why = "that’s more than 2× your pre-approved limit"
+            else:
+                why = "the EMI would exceed 50% of your monthly income at every tenure"
+            return {
+                "message": (
+                    f"❌ ₹{amt:,} is above what you’re eligible for — {why}. "
+                    f"You can borrow up to ₹{envelope['max_amount']:,}. Please enter a lower amount."
+                )
+            }
+
+        session.ctx["requested_amount"] = amt
+        self._advance(session)
         return {
             "message": (
                 f"You’d like a loan of ₹{amt:,}. Now please select your preferred tenure — "
-                "12, 24, or 36 months? 💡 Shorter tenure = higher EMI but lower total interest."
+                f"{self._tenure_choices(self._feasible_tenures(session, amt))} months? "
+                "💡 Shorter tenure = higher EMI but lower total interest."
             )
         }
 
-    def _collect_tenure(self, text):
+    def _collect_tenure(self, session, text):
         tenure = re.sub(r"[^\d]", "", text)
-        if not tenure or int(tenure) not in [12, 24, 36]:
-            return {"message": "Please enter a valid tenure — 12, 24, or 36 months."}
-        self.ctx["preferred_tenure"] = int(tenure)
-        self.state = "UNDERWRITING"
-        return self._underwrite_and_decide()
+        if not tenure or int(tenure) not in self.flow.tenures:
+            return {"message": f"Please enter a valid tenure — {self._tenure_choices()} months."}
+
+        amount = session.ctx["requested_amount"]
+        feasible = self._feasible_tenures(session, amount)
+        if int(tenure) not in feasible:
+            return {
+                "message": (
+                    f"At {tenure} months the EMI on ₹{amount:,} would exceed 50% of your income. "
+                    f"Please choose {self._tenure_choices(feasible)} months."
+                )
+            }
+        session.ctx["preferred_tenure"] = int(tenure)
+        self._advance(session)
+        return self._underwrite_and_decide(session)
 
     # ==============================
     # SMART UNDERWRITING
     # ==============================
-    def _underwrite_and_decide(self, _=None):
-        cust = self.ctx["customer"]
-        amount = self.ctx["requested_amount"]
-        tenure = self.ctx.get("preferred_tenure", 36)
+    def _underwrite_and_decide(self, session, _=None):
+        cust = session.ctx["customer"]
+        amount = session.ctx["requested_amount"]
+        tenure = session.ctx.get("preferred_tenure", 36)
 
         loan_details = {"proposed_amount": amount, "rate": 10.95, "tenure": tenure}
         result = self.underwriting_agent.evaluate_loan(cust, loan_details)
         if result["status"] == "rejected":
-            self.state = "DONE"
+            self._advance(session, "DONE")
             return {"message": f"❌ Loan rejected: {result['reason']}"}
 
-        # Generate multiple plan comparisons
-        all_options = self.smart_advisor.compare_tenures(amount, base_rate=10.95)
-        summary_text = "\n".join(
-            [
-                f"• {opt['tenure']} months @ {opt['rate']}% → EMI {rupees(opt['emi'])}/month, Total Interest {rupees(opt['total_interest'])}"
-                for opt in all_options
-            ]
+        # The few non-dominated plans across 6–84 months, rather than every fixed tenure
+        plan = result["chosen_plan"]
+        score = (session.ctx.get("envelope") or {}).get("credit_score", cust["credit_score"])
+        advice = self.smart_advisor.compare_tenures(
+            amount, int(cust.get("monthly_income", 0)), score, base_rate=10.95, preferred_tenure=plan["tenure"]
+        )
+        plans = advice["plans"] or result["all_options"]
+        best = min(plans, key=lambda opt: (opt["total_interest"], opt["emi"]))
+        summary = self.smart_advisor.summarize(amount, plans, plan, best)
+
+        session.ctx["approved"] = result
+        session.ctx["plans"] = plans
+        self._advance(session, self.flow.states["UNDERWRITING"].next)
+
+        comfortable = advice["comfortable"]
+        tip = (
+            f"💡 Borrowing {rupees(comfortable['amount'])} instead would bring the EMI down to "
+            f"{rupees(comfortable['emi'])}/month ({comfortable['affordability']:g}% of your income).\n"
+            if comfortable else ""
         )
-
-        self.ctx["approved"] = result
-        self.state = "SANCTION"
-
         return {
             "message": (
-                f"✅ Based on your profile, here are the options for your ₹{amount:,} loan:\n\n"
-                f"{summary_text}\n\n"
-                f"For your selected {tenure}-month plan:\n"
-                f"📆 Tenure: {tenure} months | 💰 EMI: {rupees(result['emi'])}/month\n"
-                f"💸 Rate: {result['rate']}% | 🧾 Processing Fee: {rupees(result['processing_fee'])}\n\n"
-                "Would you like me to proceed with this plan and generate your sanction letter?"
-            )
+                f"✅ Based on your profile, here are the best plans for your ₹{amount:,} loan:\n\n"
+                + "\n".join(summary["plan_lines"]) + "\n\n"
+                f"For your selected {plan['tenure']}-month plan:\n"
+                f"📆 Tenure: {plan['tenure']} months | 💰 EMI: {rupees(plan['emi'])}/month\n"
+                f"💸 Rate: {plan['rate']}% | 🧾 Processing Fee: {rupees(plan['processing_fee'])}\n"
+                f"{tip}\n"
+                + "\n".join(summary["summary_lines"]) + "\n\n"
+                + SANCTION_PROMPT
+            ),
+            "plans": plans,
         }
 
-    def _generate_sanction(self, _=None):
-        cust = self.ctx["customer"]
-        res = self.ctx["approved"]
-        path = self.sanction_agent.generate_letter(
-            name=cust["name"], amount=res["approved_amount"], rate=res["rate"], tenure=res["tenure"]
+    def _generate_sanction(self, session, text=None):
+        offered = [opt["tenure"] for opt in session.ctx.get("plans") or ()]
+        chosen = session.ctx["approved"]["chosen_plan"]["tenure"]
+        named = re.search(r"\d+", text or "")
+        if named and int(named.group()) != chosen:
+            if int(named.group()) in offered:
+                session.ctx["preferred_tenure"] = int(named.group())
+                return self._underwrite_and_decide(session)
+            return {
+                "message": (
+                    f"{named.group()} months isn’t one of the plans above — choose from "
+                    f"{', '.join(map(str, offered))} months, or reply 'yes' to go ahead with {chosen} months."
+                ),
+                "plans": session.ctx["plans"],
+            }
+
+        # Only an explicit yes sanctions the loan; anything else keeps the offer open
+        tags = self.flow.matcher.scan(text)
+        if "confirm" not in tags or "decline" in tags:
+            return {
+                "message": f"No problem — your {chosen}-month plan is on hold. {SANCTION_PROMPT}",
+                "plans": session.ctx["plans"],
+            }
+
+        cust = session.ctx["customer"]
+        res = session.ctx["approved"]
+        plan = res["chosen_plan"]
+        job_id = self.sanction_agent.submit_letter(
+            name=cust["name"], amount=res["approved_amount"], rate=plan["rate"], tenure=plan["tenure"],
+            customer_id=cust["customer_id"], notify=self._notifier(session, "letter"),
         )
-        self.state = "DONE"
+        session.ctx["letter_job"] = job_id
+        self._advance(session)
+        link = f"/sanction/jobs/{job_id}/download"
         return {
             "message": (
                 f"🎉 Congratulations {cust['name']}! Your ₹{res['approved_amount']:,} "
-                f"loan has been sanctioned. 📄 Download your sanction letter: /{path}"
+                f"loan has been sanctioned. 📄 Your sanction letter is being prepared: {link}"
             ),
-            "sanction_letter": f"/{path}",
+            "sanction_letter": link,
+            "letter_job": job_id,
         }
 
-    def _handle_post_sanction(self, text):
-        return self._ai_context_response(text)
+    def _handle_post_sanction(self, session, text):
+        return self._ai_context_response(session, text)
 
     # ==============================
     # HELPERS
     # ==============================
+    def _send_otp(self, session):
+        """Queue OTP delivery in the background so the reply doesn't wait on SMTP."""
+        otp = str(random.randint(100000, 999999))
+        session.pending_otp = otp
+        session.otp_job = self.otp_dispatcher.submit(session.ctx["email"], otp, notify=self._notifier(session, "otp"))
+
+    @staticmethod
+    def _notifier(session, kind: str):
+        """Job callback that pushes the outcome to the session's live connections (WebSocket)."""
+        bus, topic = get_event_bus(), session.session_id
+
+        def notify(job_id, status):
+            status = status or {}
+            event = {"type": kind, "job": job_id, "status": status.get("status"), "error": status.get("error")}
+            if kind == "letter" and event["status"] == "done":
+                event["download"] = f"/sanction/jobs/{job_id}/download"
+            bus.publish(topic, event)
+
+        return notify
+
+    def _feasible_tenures(self, session, amount) -> list:
+        """Tenures the KYC-time envelope allows for `amount` (all of them when there is no envelope)."""
+        envelope = session.ctx.get("envelope")
+        if not envelope:
+            return list(self.flow.tenures)
+        return [row["tenure"] for row in envelope["tenures"] if amount <= row["max_amount"]]
+
+    def _tenure_choices(self, tenures=None) -> str:
+        *head, last = tenures or self.flow.tenures
+        if not head:
+            return str(last)
+        return f"{', '.join(map(str, head))}{',' if len(head) > 1 else ''} or {last}"
+
     def _find_customer(self, pan, email, phone):
-        customers = self._read_json(DATA_DIR / "customers.json")
-        phone_norm = re.sub(r"[^\d]", "", phone or "")
-        for c in customers:
-            c_phone = re.sub(r"[^\d]", "", c.get("phone", ""))
-            if (
-                c.get("pan", "").upper() == pan.upper()
-                and c.get("email", "").lower() == email.lower()
-                and c_phone.endswith(phone_norm)
-            ):
-                return c
-        return None
+        return self.customer_store.find_kyc(pan, email, phone)
 
     @staticmethod
     def _extract_amount(text: str) -> int | None:
         digits = re.sub(r"[^\d]", "", text or "")
         return int(digits) if digits else None
 
-    @staticmethod
-    def _read_json(path: Path):
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
\ No newline at end of file
+
+_agent: MasterAgent | None = None
+_agent_lock = threading.Lock()
+
+
+def get_master_agent() -> MasterAgent:
+    """Process-wide orchestrator, built on first use (or by the startup warm-up)."""
+    global _agent
+    if _agent is None:
+        with _agent_lock:
+            if _agent is None:
+                _agent = MasterAgent()
+    return _agent
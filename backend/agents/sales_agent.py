@@ -1,21 +1,34 @@
 import os
-import requests
 from dotenv import load_dotenv
 
+from backend.services.llm_guard import LLMGuard, LLMUnavailable
+from backend.services.openrouter_client import OpenRouterClient
+from backend.services.prompt_builder import PromptBuilder
+from backend.services.response_cache import ResponseCache, cache_key
+
 load_dotenv()
 
+FALLBACK_REPLY = "I'm here to help with your loan needs! 😊"
+NOISE_TAGS = ["<s>", "</s>", "[USER]", "[/USER]"]
+
+
+class FallbackReply(str):
+    """A templated answer streamed in place of the model's; not part of the conversation history."""
+
+
 class SalesAgent:
     def __init__(self):
         self.api_key = os.getenv("OPENROUTER_API_KEY")
-        self.api_url = "https://openrouter.ai/api/v1/chat/completions"
         if not self.api_key:
             raise ValueError("❌ OpenRouter API key not found. Please set OPENROUTER_API_KEY in .env")
 
-        self.headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "HTTP-Referer": "https://capitalmitra.ai",  # optional, helps OpenRouter track usage
-            "Content-Type": "application/json"
-        }
+        # Pooled keep-alive client; HTTP-Referer is optional, helps OpenRouter track usage
+        self.client = OpenRouterClient(self.api_key, headers={"HTTP-Referer": "https://capitalmitra.ai"})
+        self.model = os.getenv("OPENROUTER_MODEL", "mistralai/mistral-7b-instruct")  # stable, fast & free model
+        # Latency budget, hedging to OPENROUTER_HEDGE_MODEL (default: the same model) and circuit breaker
+        self.llm = LLMGuard(self.client, self.model, os.getenv("OPENROUTER_HEDGE_MODEL"))
+        self.cache = ResponseCache()
+        self.prompts = PromptBuilder()
 
         # Friendly and precise tone system prompt
         self.system_prompt = (
@@ -24,45 +37,90 @@ class SalesAgent:
             "Be confident, clear, and helpful. Avoid technical jargon or long paragraphs."
         )
 
-    def provide_offer(self, user_message: str = "Tell me about personal loans."):
-        """Generate concise, friendly, and supportive AI responses using OpenRouter."""
+    def provide_offer(self, user_message: str = "Tell me about personal loans.", context: str = "", personalized: bool = False,
+                      transcript=None, fallback: str | None = None):
+        """
+        Generate concise, friendly, and supportive AI responses using OpenRouter.
+        Generic questions are served from the response cache; `personalized` prompts
+        (those whose context carries customer data) and follow-ups that depend on
+        earlier turns in `transcript` always go to the model. When the model is slow,
+        failing or circuit-broken, the templated `fallback` answer is returned instead.
+        """
+        key = None if personalized or transcript else cache_key(user_message, context)
+        if key is None:
+            self.cache.record_bypass()
+        else:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return {"message": cached, "cached": True}
+
+        prompt = self.prompts.build(self.system_prompt, user_message, context, transcript)
         try:
-            payload = {
-                "model": "mistralai/mistral-7b-instruct",  # stable, fast & free model
-                "messages": [
-                    {"role": "system", "content": self.system_prompt},
-                    {"role": "user", "content": user_message}
-                ],
-                "max_tokens": 150,
-                "temperature": 0.8  # slightly creative but still focused
-            }
-
-            res = requests.post(self.api_url, headers=self.headers, json=payload)
-            res.raise_for_status()
-            data = res.json()
-
-            ai_message = (
-                data.get("choices", [{}])[0]
-                .get("message", {})
-                .get("content", "I'm here to help with your loan needs! 😊")
-                .strip()
-            )
-
-            # Remove unwanted tags from AI response
-            for tag in ["<s>", "</s>", "[USER]", "[/USER]"]:
-                ai_message = ai_message.replace(tag, "")
-            ai_message = ai_message.strip()
-
-            # Ensure short, polished message
-            if len(ai_message.split()) > 60:
-                ai_message = "Here’s a quick summary: " + " ".join(ai_message.split()[:50]) + "..."
-
-            return {"message": ai_message}
-
-        except requests.exceptions.RequestException as e:
-            return {"message": f"⚠️ Network error while contacting AI: {str(e)}"}
-        except Exception as e:
-            return {"message": f"⚠️ AI agent error: {str(e)}"}
+            data = self.llm.complete(self._payload(prompt.messages))
+        except LLMUnavailable:
+            return {"message": fallback or FALLBACK_REPLY, "fallback": True}
+
+        ai_message = self.polish_reply(
+            (data.get("choices") or [{}])[0]
+            .get("message", {})
+            .get("content") or FALLBACK_REPLY
+        )
+        if key is not None:
+            self.cache.put(key, ai_message)
+        return {"message": ai_message, "prompt": prompt.report()}
+
+    async def stream_offer(self, user_message: str, context: str = "", personalized: bool = False, transcript=None,
+                           fallback: str | None = None):
+        """
+        Yield the AI reply token by token as OpenRouter streams it (cache hits and the
+        templated `fallback` arrive in one piece; a stream that breaks off just ends).
+        The fallback is yielded as a FallbackReply so callers can tell it from model output.
+        """
+        key = None if personalized or transcript else cache_key(user_message, context)
+        if key is None:
+            self.cache.record_bypass()
+        else:
+            cached = self.cache.get(key)
+            if cached is not None:
+                yield cached
+                return
+
+        tokens = []
+        try:
+            prompt = self.prompts.build(self.system_prompt, user_message, context, transcript)
+            async for token in self.llm.stream(self._payload(prompt.messages)):
+                for tag in NOISE_TAGS:
+                    token = token.replace(tag, "")
+                if token:
+                    tokens.append(token)
+                    yield token
+        except LLMUnavailable:
+            if not tokens:
+                yield FallbackReply(fallback or FALLBACK_REPLY)
+            return
+        if key is not None and tokens:
+            self.cache.put(key, self.polish_reply("".join(tokens)))
+
+    def _payload(self, messages: list) -> dict:
+        return {
+            "model": self.model,
+            "messages": messages,
+            "max_tokens": 150,
+            "temperature": 0.8  # slightly creative but still focused
+        }
+
+    @staticmethod
+    def polish_reply(ai_message: str) -> str:
+        # Remove unwanted tags from AI response
+        ai_message = ai_message.strip()
+        for tag in NOISE_TAGS:
+            ai_message = ai_message.replace(tag, "")
+        ai_message = ai_message.strip()
+
+        # Ensure short, polished message
+        if len(ai_message.split()) > 60:
+            ai_message = "Here’s a quick summary: " + " ".join(ai_message.split()[:50]) + "..."
+        return ai_message or FALLBACK_REPLY
 
     def propose_loan(self, customer: dict):
         """Create a friendly loan proposal for the given customer."""
@@ -1,36 +1,23 @@
-from fpdf import FPDF
-from pathlib import Path
-
-STATIC_DIR = Path(__file__).resolve().parent.parent / "static"
-LETTERS_DIR = STATIC_DIR / "letters"
-FONTS_DIR = STATIC_DIR / "fonts"
+from backend.services.audit_log import get_audit_log
+from backend.services.letter_jobs import BACKEND_DIR, get_letter_jobs
+from backend.services.letter_store import letter_key
 
 class SanctionAgent:
-    def generate_letter(self, name, amount, rate, tenure):
-        LETTERS_DIR.mkdir(parents=True, exist_ok=True)
-        FONTS_DIR.mkdir(parents=True, exist_ok=True)
-
-        pdf = FPDF()
-        pdf.add_page()
+    def __init__(self):
+        self.jobs = get_letter_jobs()
+        self.audit = get_audit_log()
 
-        # Try Unicode (for ₹). If not present, fall back to core font + 'Rs.'
-        dejavu = FONTS_DIR / "DejaVuSans.ttf"
-        if dejavu.exists():
-            pdf.add_font("DejaVu", "", str(dejavu), uni=True)
-            pdf.set_font("DejaVu", size=12)
-            rupee = "₹"
-        else:
-            pdf.set_font("Arial", size=12)
-            rupee = "Rs."
+    def generate_letter(self, name, amount, rate, tenure, customer_id=None):
+        """Render (or reuse) synchronously in this process; returns the letter's path relative to backend/."""
+        key = self.jobs.render_now(name, amount, rate, tenure)
+        self.audit.record("letter", customer_id=customer_id, key=key, amount=amount, rate=rate, tenure=tenure)
+        return str(self.jobs.store.path(key).relative_to(BACKEND_DIR))
 
-        pdf.cell(200, 10, txt="CapitalMitra - Loan Sanction Letter", ln=True, align="C")
-        pdf.ln(4)
-        pdf.cell(200, 10, txt=f"Dear {name},", ln=True)
-        pdf.cell(200, 10, txt=f"Your personal loan of {rupee}{amount:,} has been approved.", ln=True)
-        pdf.cell(200, 10, txt=f"Interest Rate: {rate}% | Tenure: {tenure} months", ln=True)
-        pdf.ln(6)
-        pdf.multi_cell(0, 8, txt="Thank you for choosing CapitalMitra. This is a system-generated letter.")
-        out = LETTERS_DIR / f"{name.replace(' ', '_')}_sanction_letter.pdf"
-        pdf.output(str(out), "F")
-        print(f"📄 Sanction letter generated at {out}")
-        return str(out.relative_to(Path(__file__).resolve().parent.parent))  # 'static/letters/...'
\ No newline at end of file
+    def submit_letter(self, name, amount, rate, tenure, customer_id=None, notify=None) -> str:
+        """Queue rendering on the letter process pool; returns a job id immediately."""
+        job_id = self.jobs.submit(name, amount, rate, tenure, notify=notify)
+        key = letter_key(name=name, amount=amount, rate=rate, tenure=tenure)
+        self.audit.record(
+            "letter", customer_id=customer_id, job=job_id, key=key, amount=amount, rate=rate, tenure=tenure
+        )
+        return job_id
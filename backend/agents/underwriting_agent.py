@@ -1,18 +1,24 @@
-import json
 import math
-from pathlib import Path
 
-DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+from backend.services.amortization import emi, max_principal
+from backend.services.audit_log import get_audit_log
+from backend.services.credit_bureau import get_credit_bureau
+from backend.services.underwriting_policy import (  # noqa: F401 - re-exported for callers of this module
+    AFFORDABILITY_CAP,
+    LIMIT_MULTIPLE,
+    MIN_SCORE,
+    NO_HIT_SCORE,
+    REASONS,
+    TENURES,
+)
 
 
 class UnderwritingAgent:
     def __init__(self):
-        with open(DATA_DIR / "credit_scores.json", "r", encoding="utf-8") as f:
-            self.credit_data = json.load(f)
+        self.bureau = get_credit_bureau()
+        self.audit = get_audit_log()
 
     def evaluate_loan(self, customer, loan_details):
-        print(f"📊 UnderwritingAgent: Evaluating optimal loan for {customer['name']}")
-
         score = self._get_credit_score(customer["customer_id"])
         amount = int(loan_details["proposed_amount"])
         base_rate = float(loan_details.get("rate", 10.95))
@@ -21,16 +27,15 @@ class UnderwritingAgent:
         income = int(customer.get("monthly_income", 0))
 
         # 🔴 Rule 1: Hard rejections
-        if score < 650:
-            return {"status": "rejected", "reason": "Credit score below 650 — not eligible for a loan."}
-        if amount > 2 * pre_limit:
-            return {"status": "rejected", "reason": "Requested amount exceeds 2× pre-approved limit."}
-        if income <= 0:
-            return {"status": "rejected", "reason": "Monthly income details missing."}
+        cid = customer["customer_id"]
+        reason = self._hard_rejection(score, pre_limit, income, amount)
+        if reason:
+            return self._decide(cid, {"status": "rejected", "reason": reason})
 
-        # ✅ Evaluate multiple tenure options (12, 24, 36, 48, 60 months)
+        # ✅ Evaluate multiple tenure options (12, 24, 36, 48, 60 months, plus a preferred one off that list)
+        tenures = TENURES if preferred_tenure in TENURES else tuple(sorted(TENURES + (preferred_tenure,)))
         options = []
-        for tenure in [12, 24, 36, 48, 60]:
+        for tenure in tenures:
             rate = self._adjust_rate(base_rate, tenure, score)
             emi = self._calc_emi(amount, rate, tenure)
             total_payment = emi * tenure
@@ -47,25 +52,93 @@ class UnderwritingAgent:
                 "affordability": affordability,
             })
 
+        self.audit.record("options", customer_id=cid, amount=amount, credit_score=score, options=options)
+
         # 🔍 Filter affordable plans (EMI <= 50% of monthly income)
-        feasible = [opt for opt in options if opt["affordability"] <= 50]
+        feasible = [opt for opt in options if opt["affordability"] <= AFFORDABILITY_CAP]
         if not feasible:
-            return {"status": "rejected", "reason": "EMI exceeds 50% of income for all plans."}
+            return self._decide(cid, {"status": "rejected", "reason": REASONS["unaffordable"]})
 
         # ✅ Choose best (lowest total interest) and chosen (preferred or fallback)
         best = min(feasible, key=lambda x: (x["total_interest"], x["emi"]))
         chosen = next((opt for opt in feasible if opt["tenure"] == preferred_tenure), best)
 
         # Final decision
-        return {
+        return self._decide(cid, {
             "status": "approved",
             "approved_amount": amount,
             "preferred_tenure": preferred_tenure,
             "chosen_plan": chosen,
             "best_plan": best,
             "all_options": feasible,
+        })
+
+    def eligibility_envelope(self, customer, base_rate=10.95, tenures=TENURES):
+        """
+        Everything evaluate_loan would decide about *amount* for this customer, computed once
+        at KYC: for each tenure, the adjusted rate and the largest principal whose EMI stays
+        within the affordability cap (closed form), capped at LIMIT_MULTIPLE × pre-approved limit.
+        Any amount up to a tenure's `max_amount` is approved for that tenure.
+        """
+        score = self._get_credit_score(customer["customer_id"])
+        pre_limit = int(customer["pre_approved_limit"])
+        income = int(customer.get("monthly_income", 0))
+        hard_cap = LIMIT_MULTIPLE * pre_limit
+
+        reason = self._hard_rejection(score, pre_limit, income)
+        if reason:
+            return {"eligible": False, "reason": reason, "credit_score": score}
+
+        # evaluate_loan compares affordability rounded to 2 dp, so its true EMI ceiling is cap + 0.005%
+        max_emi = income * (AFFORDABILITY_CAP + 0.005) / 100
+        rows = []
+        for tenure in tenures:
+            rate = self._adjust_rate(base_rate, tenure, score)
+            affordable = int(max_principal(max_emi, rate, tenure))
+            # Settle float error at the boundary against the exact rule (a step or two at most)
+            while affordable > 0 and not self._affordable(affordable, rate, tenure, income):
+                affordable -= 1
+            while self._affordable(affordable + 1, rate, tenure, income):
+                affordable += 1
+            rows.append({"tenure": tenure, "rate": round(rate, 2), "max_amount": min(affordable, hard_cap)})
+        return {
+            "eligible": True,
+            "credit_score": score,
+            "hard_cap": hard_cap,
+            "max_amount": max(r["max_amount"] for r in rows),
+            "tenures": rows,
         }
 
+    def _affordable(self, amount, rate, tenure, income):
+        return round((self._calc_emi(amount, rate, tenure) / income) * 100, 2) <= AFFORDABILITY_CAP
+
+    # ------------------------------------
+    # Helper: Hard Rejections
+    # ------------------------------------
+    @staticmethod
+    def _hard_rejection(score, pre_limit, income, amount=0):
+        if score < MIN_SCORE:
+            return REASONS["low_score"]
+        if amount > LIMIT_MULTIPLE * pre_limit:
+            return REASONS["over_limit"]
+        if income <= 0:
+            return REASONS["no_income"]
+        return None
+
+    # ------------------------------------
+    # Helper: Audit Trail
+    # ------------------------------------
+    def _decide(self, customer_id, result):
+        """Record the outcome (not the full option list, logged separately) and return it."""
+        if result["status"] == "approved":
+            self.audit.record(
+                "decision", customer_id=customer_id, status="approved",
+                amount=result["approved_amount"], plan=result["chosen_plan"],
+            )
+        else:
+            self.audit.record("decision", customer_id=customer_id, status="rejected", reason=result["reason"])
+        return result
+
     # ------------------------------------
     # Helper: Interest Rate Adjustment
     # ------------------------------------
@@ -100,16 +173,15 @@ class UnderwritingAgent:
     # ------------------------------------
     @staticmethod
     def _calc_emi(principal, annual_rate_percent, months):
-        r = (annual_rate_percent / 100.0) / 12.0
-        if r == 0:
-            return principal / months
-        return principal * r * (1 + r) ** months / ((1 + r) ** months - 1)
+        return emi(principal, annual_rate_percent, months)
 
     # ------------------------------------
     # Helper: Credit Score Fetch
     # ------------------------------------
     def _get_credit_score(self, customer_id):
-        for r in self.credit_data:
-            if r.get("customer_id") == customer_id:
-                return int(r.get("credit_score", 0))
-        return 700  # default fallback
\ No newline at end of file
+        """Bureau score (cached, coalesced); raises BureauUnavailable if the bureau can't be reached."""
+        score = self.bureau.score(customer_id)
+        if score is None:
+            self.audit.record("bureau_no_hit", customer_id=customer_id, assumed_score=NO_HIT_SCORE)
+            return NO_HIT_SCORE
+        return score
\ No newline at end of file
@@ -1,19 +1,12 @@
-import json
-from pathlib import Path
-
-DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+from backend.data.customer_store import get_customer_store
+from backend.services.audit_log import get_audit_log
 
 class VerificationAgent:
     def __init__(self):
-        with open(DATA_DIR / "crm_data.json", "r", encoding="utf-8") as f:
-            self.crm_data = json.load(f)
+        self.store = get_customer_store()
+        self.audit = get_audit_log()
 
-    def verify_customer(self, customer: dict) -> bool:
-        print(f"✅ VerificationAgent: Verifying KYC for {customer['name']}")
-        cid = customer.get("customer_id")
-        for rec in self.crm_data:
-            if rec.get("customer_id") == cid and rec.get("verified") is True:
-                print("KYC verified successfully.")
-                return True
-        print("❌ Verification failed.")
-        return False
\ No newline at end of file
+    def verify_customer(self, customer: dict, session_id: str | None = None) -> bool:
+        verified = bool(self.store.is_verified(customer.get("customer_id")))
+        self.audit.record("kyc", customer_id=customer.get("customer_id"), session=session_id, verified=verified)
+        return verified
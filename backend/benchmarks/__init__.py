@@ -0,0 +1,2 @@
+# backend/benchmarks/__init__.py
+# Local stand-ins for external services and performance benchmarks
@@ -0,0 +1,92 @@
+# backend/benchmarks/bench_cold_start.py
+"""
+Cold-start cost of the web process: importing backend.main, then the startup warm-up.
+
+    python -m backend.benchmarks.bench_cold_start --runs 7
+
+Each run is a fresh interpreter. "import" is when a worker can start answering `/`;
+"warm-up" is the first pass of background work (data indexes and agents, which gate
+/ready, plus the LLM and SMTP clients, which do not). The slowest imports come from one `python -X importtime` run.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parents[2]
+
+_PROBE = """
+import json, time
+t0 = time.perf_counter()
+import backend.main as m
+t1 = time.perf_counter()
+m.readiness.start()
+m.readiness.wait()
+t2 = time.perf_counter()
+print(json.dumps({"import_ms": (t1 - t0) * 1000, "warm_ms": (t2 - t1) * 1000, **m.readiness.report()}))
+"""
+
+
+def _env(secrets: bool) -> dict:
+    env = {k: v for k, v in os.environ.items() if k not in ("OPENROUTER_API_KEY", "SMTP_USER", "SMTP_PASSWORD")}
+    if secrets:
+        env.update(OPENROUTER_API_KEY="bench", SMTP_USER="bench@capitalmitra.local", SMTP_PASSWORD="bench")
+    return env
+
+
+def probe(secrets: bool) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE], cwd=REPO_DIR, env=_env(secrets), capture_output=True, text=True, check=True
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(n: int) -> list:
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import backend.main"],
+        cwd=REPO_DIR, env=_env(True), capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line[13:]:
+            continue
+        _, cumulative, name = line[12:].split("|")
+        if cumulative.strip().isdigit():
+            rows.append((int(cumulative) / 1000, name.strip()))
+    best = {}  # a module can appear twice when a package import triggers its submodule
+    for ms, name in rows:
+        if "." not in name or name.startswith("backend."):
+            best[name] = max(ms, best.get(name, 0.0))
+    return sorted(((ms, name) for name, ms in best.items()), reverse=True)[:n]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--top", type=int, default=12, help="slowest top-level imports to list")
+    args = parser.parse_args()
+
+    runs = [probe(secrets=True) for _ in range(args.runs)]
+    imp = statistics.median(r["import_ms"] for r in runs)
+    warm = statistics.median(r["warm_ms"] for r in runs)
+    print(f"import backend.main  : {imp:8.1f} ms (median of {args.runs})")
+    print(f"warm-up until /ready : {warm:8.1f} ms")
+    print("warm-up steps (last run):")
+    for name, step in runs[-1]["steps"].items():
+        print(f"  {name:<18} {step['status']:<7} {step['ms']:8.2f} ms")
+
+    bare = probe(secrets=False)
+    failed = [name for name, step in bare["steps"].items() if step["status"] == "failed"]
+    print(f"without secrets      : imports in {bare['import_ms']:.1f} ms, ready={bare['ready']} (failed: {', '.join(failed)})")
+
+    print("slowest imports (cumulative):")
+    for ms, name in slowest_imports(args.top):
+        print(f"  {ms:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
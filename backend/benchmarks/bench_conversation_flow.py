@@ -0,0 +1,112 @@
+# backend/benchmarks/bench_conversation_flow.py
+"""
+Messages per second through the MasterAgent state machine, with per-state timing.
+
+    python -m backend.benchmarks.bench_conversation_flow --applicants 20000
+
+Each applicant walks the whole flow (greeting → KYC → OTP → loan → tenure → sanction)
+against the real customer data, underwriting and verification. The LLM, OTP delivery
+and letter rendering are stubbed so only the orchestration itself is measured.
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from backend.agents.conversation_flow import get_conversation_flow
+from backend.agents.master_agent import MasterAgent
+from backend.agents.underwriting_agent import UnderwritingAgent
+from backend.agents.verification_agent import VerificationAgent
+from backend.data.customer_store import get_customer_store, normalize_phone
+from backend.services.audit_log import AuditLog
+from backend.services.prompt_builder import PromptBuilder
+from backend.services.session_store import ConversationSession
+from backend.services.smart_advisor import SmartAdvisor
+
+
+class _Stub:
+    prompts = PromptBuilder()
+
+    def provide_offer(self, text, context="", personalized=False, transcript=None):
+        return {"message": "stub"}
+
+    def submit(self, email, otp, notify=None):
+        return "otp-job"
+
+    def status(self, job_id):
+        return None
+
+    def submit_letter(self, **letter):
+        return "letter-job"
+
+
+class _OfflineMaster(MasterAgent):
+    """MasterAgent with network-bound collaborators replaced by in-process stubs."""
+
+    def __init__(self):
+        self.sales_agent = self.otp_dispatcher = self.sanction_agent = _Stub()
+        self.verification_agent = VerificationAgent()
+        self.underwriting_agent = UnderwritingAgent()
+        self.smart_advisor = SmartAdvisor()
+        # Audit events still go through the real writer, just not into the live log
+        self.verification_agent.audit = self.underwriting_agent.audit = AuditLog(Path(tempfile.mkdtemp()))
+        self.customer_store = get_customer_store()
+        self.flow = get_conversation_flow()
+        self.handlers = self.flow.bind(self)
+
+
+LEGACY_KEYWORDS = ["loan", "interest", "emi", "limit", "credit", "borrow"]
+
+
+def applicant_script(cust):
+    # The OTP is only known once the PAN turn has run, so it is resolved lazily
+    return [
+        "hi", cust["name"], cust["email"], normalize_phone(cust["phone"]), cust["pan"],
+        lambda session: session.pending_otp, "personal", "500000", "36", "yes please",
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--applicants", type=int, default=20000)
+    args = parser.parse_args()
+
+    agent = _OfflineMaster()
+    customers = [c for c in agent.customer_store.customers() if agent.customer_store.is_verified(c["customer_id"])]
+    scripts = [applicant_script(c) for c in customers]
+
+    messages = 0
+    final_states = {}
+    t0 = time.perf_counter()
+    for i in range(args.applicants):
+        session = ConversationSession(str(i))
+        for step in scripts[i % len(scripts)]:
+            agent.process_message(step(session) if callable(step) else step, session)
+            messages += 1
+        final_states[session.state] = final_states.get(session.state, 0) + 1
+    elapsed = time.perf_counter() - t0
+
+    sample = [s for script in scripts for s in script if isinstance(s, str)] * 2000
+    t0 = time.perf_counter()
+    for text in sample:
+        any(w in text.lower() for w in LEGACY_KEYWORDS)
+    t_legacy = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for text in sample:
+        agent.flow.matcher.scan(text)
+    t_compiled = time.perf_counter() - t0
+
+    print(f"applicants / messages: {args.applicants:,} / {messages:,}")
+    print(f"throughput           : {messages / elapsed:,.0f} messages/s ({elapsed * 1e6 / messages:.1f} us/message)")
+    print(f"final states         : {final_states}")
+    print(f"audit events         : {agent.underwriting_agent.audit.stats()}")
+    print(f"keyword scan, legacy : {t_legacy / len(sample) * 1e6:.2f} us/message (AI keywords only)")
+    print(f"keyword scan, compiled: {t_compiled / len(sample) * 1e6:.2f} us/message (all intents + products)")
+    print("per state:")
+    for state, row in sorted(agent.flow.stats.snapshot().items(), key=lambda kv: -kv[1]["total_ms"]):
+        print(f"  {state:<15} {row['turns']:>8,} turns  avg {row['avg_ms'] * 1000:8.1f} us  max {row['max_ms']:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# backend/benchmarks/bench_credit_bureau.py
+"""
+Credit bureau lookups: direct client calls vs. the CreditBureau cache front.
+
+    python -m backend.benchmarks.bench_credit_bureau --latency-ms 20 --batch 5000
+
+Uses the file-backed bureau with simulated per-round-trip latency and counts billed
+bureau requests for:
+  * a burst of concurrent lookups for a few customers (single-flight coalescing);
+  * applicants looked up at KYC and again at the underwriting decision (TTL cache);
+  * a batch run over many customers (bulk prefetch vs. one request per applicant).
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from backend.benchmarks.load_test import write_customer_base
+
+
+def _counting(base):
+    """FileBureau subclass counting round trips and the customers they covered."""
+
+    class Counting(base):
+        def __init__(self, latency):
+            super().__init__(latency)
+            self.requests = self.customers = 0
+            self._lock = threading.Lock()
+
+        def fetch(self, customer_id):
+            with self._lock:
+                self.requests += 1
+                self.customers += 1
+            return super().fetch(customer_id)
+
+        def fetch_many(self, customer_ids):
+            with self._lock:
+                self.requests += 1
+                self.customers += len(customer_ids)
+            return super().fetch_many(customer_ids)
+
+    return Counting
+
+
+def burst(lookup, ids, threads):
+    """`threads` concurrent callers, each looking up every id in `ids`."""
+    start = threading.Barrier(threads)
+
+    def worker():
+        start.wait()
+        for cid in ids:
+            lookup(cid)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    t0 = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency-ms", type=float, default=20, help="simulated bureau round trip")
+    parser.add_argument("--threads", type=int, default=32, help="concurrent callers in the burst")
+    parser.add_argument("--hot", type=int, default=4, help="customers looked up by every caller in the burst")
+    parser.add_argument("--applicants", type=int, default=200, help="applicants looked up at KYC and decision")
+    parser.add_argument("--batch", type=int, default=5000, help="customers in the batch run")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="capitalmitra-bureau-") as tmp:
+        os.environ.update({"CUSTOMER_DATA_DIR": tmp, "CUSTOMER_SNAPSHOT": ""})
+        ids = [c["customer_id"] for c in write_customer_base(Path(tmp), max(args.batch, args.applicants, args.hot))]
+
+        from backend.services.credit_bureau import CreditBureau, FileBureau
+
+        Counting = _counting(FileBureau)
+        latency = args.latency_ms / 1000
+        rows = []
+
+        def run(name, direct_fn, cached_fn):
+            direct = Counting(latency)
+            t_direct = direct_fn(direct)
+            bureau = CreditBureau(Counting(latency))
+            t_cached = cached_fn(bureau)
+            rows.append((name, direct.requests, t_direct, bureau.client.requests, t_cached, bureau.stats()))
+
+        hot = ids[:args.hot]
+        run(f"burst: {args.threads} threads x {args.hot} customers",
+            lambda c: burst(c.fetch, hot, args.threads),
+            lambda b: burst(b.score, hot, args.threads))
+
+        applicants = ids[:args.applicants]
+
+        def kyc_then_decision(lookup):
+            t0 = time.perf_counter()
+            for cid in applicants:
+                lookup(cid)  # eligibility envelope at KYC
+                lookup(cid)  # evaluate_loan at the decision
+            return time.perf_counter() - t0
+
+        run(f"{args.applicants} applicants, KYC + decision",
+            lambda c: kyc_then_decision(c.fetch),
+            lambda b: kyc_then_decision(b.score))
+
+        batch = ids[:args.batch]
+
+        def per_applicant(c):
+            t0 = time.perf_counter()
+            for cid in batch:
+                c.fetch(cid)
+            return time.perf_counter() - t0
+
+        def bulk(b):
+            t0 = time.perf_counter()
+            b.scores(batch)
+            return time.perf_counter() - t0
+
+        run(f"batch of {args.batch}", per_applicant, bulk)
+
+    print(f"bureau round trip {args.latency_ms:g} ms")
+    print(f"{'':<40} {'direct req':>10} {'direct s':>9} {'cached req':>10} {'cached s':>9} {'hit rate':>9} {'coalesced':>9}")
+    for name, d_req, d_t, c_req, c_t, stats in rows:
+        print(f"{name:<40} {d_req:>10,} {d_t:>9.2f} {c_req:>10,} {c_t:>9.2f} {stats['hit_rate']:>9.0%} {stats['coalesced']:>9,}")
+
+
+if __name__ == "__main__":
+    main()
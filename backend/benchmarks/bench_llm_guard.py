@@ -0,0 +1,112 @@
+# backend/benchmarks/bench_llm_guard.py
+"""
+AI answers with and without the LLM guard (latency budget, hedging, circuit breaker).
+
+    python -m backend.benchmarks.bench_llm_guard --calls 200
+
+Runs SalesAgent.provide_offer against the OpenRouter stub in three conditions and
+compares each with a bare OpenRouterClient call (the unguarded path):
+  * slow tail — a small fraction of calls take seconds to answer (hedged away);
+  * hung upstream — every call stalls past the budget (breaker opens, templates served);
+  * failing upstream — every call returns 502 (templates instead of raw errors).
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from backend.benchmarks.load_test import _free_port, _start
+
+QUESTION = "How much interest will I pay overall?"
+FALLBACK = "Your ₹500,000 loan is approved at 10.95% for 36 months, with an EMI of ₹16,357."
+
+
+def _summary(samples, answered) -> str:
+    samples = sorted(samples)
+    pick = lambda q: samples[min(len(samples) - 1, int(len(samples) * q))] * 1000
+    return (
+        f"p50 {statistics.median(samples) * 1000:7.1f}  p95 {pick(0.95):7.1f}  p99 {pick(0.99):7.1f}  "
+        f"max {samples[-1] * 1000:7.1f} ms   model answers {answered}/{len(samples)}"
+    )
+
+
+def unguarded(agent, calls: int):
+    samples, answered = [], 0
+    payload = agent._payload([{"role": "user", "content": QUESTION}])
+    for _ in range(calls):
+        t0 = time.perf_counter()
+        try:
+            agent.client.complete(payload)
+            answered += 1
+        except Exception:
+            pass  # previously surfaced to the customer as "⚠️ Network error ..."
+        samples.append(time.perf_counter() - t0)
+    return samples, answered
+
+
+def guarded(agent, calls: int):
+    samples, answered = [], 0
+    for _ in range(calls):
+        t0 = time.perf_counter()
+        reply = agent.provide_offer(QUESTION, personalized=True, fallback=FALLBACK)
+        samples.append(time.perf_counter() - t0)
+        answered += not reply.get("fallback")
+    return samples, answered
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200, help="AI questions per condition")
+    parser.add_argument("--latency", type=float, default=0.1, help="stub latency of a normal call")
+    parser.add_argument("--slow-rate", type=float, default=0.05, help="fraction of slow calls in the slow-tail run")
+    parser.add_argument("--slow-latency", type=float, default=2.0, help="seconds a slow call takes")
+    parser.add_argument("--outage-calls", type=int, default=3, help="unguarded calls against the hung upstream")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="cm-llm-"))
+    port = _free_port()
+    os.environ.update({
+        "OPENROUTER_API_KEY": "bench",
+        "OPENROUTER_API_URL": f"http://127.0.0.1:{port}/api/v1/chat/completions",
+        "AI_CACHE_PATH": str(workdir / "ai_cache.json"),
+        "OPENROUTER_READ_TIMEOUT": os.getenv("OPENROUTER_READ_TIMEOUT", "20"),
+    })
+    from backend.agents.sales_agent import SalesAgent
+
+    conditions = (
+        ("slow tail", ["--latency", str(args.latency), "--slow-rate", str(args.slow_rate),
+                       "--slow-latency", str(args.slow_latency)], args.calls),
+        ("hung upstream", ["--latency", "60"], args.outage_calls),
+        ("failing upstream", ["--latency", str(args.latency), "--error-rate", "1"], args.calls),
+    )
+    try:
+        for name, stub_args, bare_calls in conditions:
+            stub = _start([sys.executable, "-m", "backend.benchmarks.stub_openrouter", "--port", str(port), *stub_args],
+                          dict(os.environ), port, workdir / "stub.log")
+            try:
+                agent = SalesAgent()
+                bare = unguarded(agent, bare_calls)
+                agent = SalesAgent()  # fresh breaker and latency history
+                guard = guarded(agent, args.calls)
+                stats = agent.llm.stats()
+                agent.llm.close()
+            finally:
+                stub.terminate()
+                stub.wait()
+            print(f"{name}:")
+            print(f"  unguarded : {_summary(*bare)}")
+            print(f"  guarded   : {_summary(*guard)}")
+            print(f"              breaker {stats['state']}, hedged {stats['hedged']} (won {stats['hedge_wins']}), "
+                  f"timeouts {stats['timeouts']}, errors {stats['errors']}, served from template while open "
+                  f"{stats['rejected']}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# backend/benchmarks/bench_prompt_budget.py
+"""
+Prompt size of history-aware LLM calls: budgeted builder vs. sending the full transcript.
+
+    python -m backend.benchmarks.bench_prompt_budget --turns 40
+
+Replays a long post-sanction advisor conversation (synthetic questions, answers of
+realistic length) through PromptBuilder and reports estimated prompt tokens per call,
+the total sent over the conversation, and the time to build each prompt.
+"""
+
+import argparse
+import random
+import time
+
+from backend.services.prompt_builder import PromptBuilder, Transcript
+
+SYSTEM = (
+    "You are CapitalMitra — a friendly and professional AI loan advisor. "
+    "Always reply in 2–3 short, supportive sentences that make the customer feel understood. "
+    "Be confident, clear, and helpful. Avoid technical jargon or long paragraphs."
+)
+CONTEXT = (
+    "You are CapitalMitra, a professional loan advisor assisting a verified customer. "
+    "Customer: Rajesh Kumar, Credit Score: 785, Pre-approved Limit: ₹800000. "
+    "They were approved for ₹500000 at 10.95% for 36 months."
+)
+QUESTIONS = [
+    "How much interest will I pay in total over the loan?",
+    "What happens if I prepay ₹50,000 after a year?",
+    "Can I reduce the tenure instead of the EMI after a prepayment?",
+    "Is there a foreclosure charge if I close the loan early?",
+    "How does a missed EMI affect my credit score?",
+    "Could I top up this loan later if I need more money?",
+    "What documents will I need for disbursement?",
+    "Would a 24-month tenure save me a lot compared to 36?",
+]
+ANSWER_WORDS = (
+    "your EMI stays fixed for the tenure and the interest portion falls every month as the balance reduces "
+    "prepayments go straight to principal so they cut the total interest you pay and you can choose shorter tenure "
+    "or lower EMI we are happy to walk you through the numbers whenever you like"
+).split()
+
+
+def answer(rng) -> str:
+    n = rng.randint(35, 60)
+    words = [rng.choice(ANSWER_WORDS) for _ in range(n)]
+    return " ".join(words).capitalize() + "."
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=40, help="AI exchanges in the conversation")
+    parser.add_argument("--budget", type=int, default=None, help="token ceiling (default LLM_PROMPT_BUDGET)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    builder = PromptBuilder(budget=args.budget)
+    transcript = Transcript()
+    sent = full = 0
+    build_time = 0.0
+    peak = 0
+
+    print(f"budget {builder.budget} tokens, {builder.recent_turns} verbatim turns, summary ≤ {builder.summary_tokens} tokens")
+    print(f"{'turn':>5} {'prompt':>8} {'full':>8} {'verbatim':>9} {'summary':>8}")
+    for i in range(1, args.turns + 1):
+        question = rng.choice(QUESTIONS)
+        t0 = time.perf_counter()
+        prompt = builder.build(SYSTEM, question, CONTEXT, transcript)
+        build_time += time.perf_counter() - t0
+        sent += prompt.tokens
+        full += prompt.full_tokens
+        peak = max(peak, prompt.tokens)
+        if i in (1, 2, 5) or i % 10 == 0:
+            print(f"{i:>5} {prompt.tokens:>8} {prompt.full_tokens:>8} {prompt.turns:>9} {prompt.summary_lines:>8}")
+        builder.record(transcript, question, answer(rng))
+
+    print(f"tokens sent, budgeted    : {sent:,} (peak {peak} per call)")
+    print(f"tokens sent, full history: {full:,}")
+    print(f"saved                    : {1 - sent / full:.1%}")
+    print(f"prompt build             : {build_time / args.turns * 1e6:.1f} us/call")
+
+
+if __name__ == "__main__":
+    main()
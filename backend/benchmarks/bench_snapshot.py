@@ -0,0 +1,111 @@
+# backend/benchmarks/bench_snapshot.py
+"""
+Customer data from JSON vs. the memory-mapped columnar snapshot.
+
+    python -m backend.benchmarks.bench_snapshot --n 200000
+
+Writes a synthetic customer base (customers, CRM, credit scores), compiles it, then in
+fresh interpreters measures CustomerStore startup, memory after load, and KYC lookup
+latency for both backends. The compile runs in its own process too, so its peak
+memory shows the streaming ingester never holds a whole source file.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from backend.benchmarks.load_test import write_customer_base
+
+REPO_DIR = Path(__file__).resolve().parents[2]
+
+# ru_maxrss survives exec on Linux (it would report this process's peak), so read /proc instead
+_MEMORY = """
+def memory_mb(field):
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1]) / 1024
+"""
+
+_PROBE = _MEMORY + """
+import json, random, sys, time
+from backend.data.customer_store import CustomerStore
+n, lookups = int(sys.argv[1]), int(sys.argv[2])
+before = memory_mb("VmRSS")
+t0 = time.perf_counter()
+store = CustomerStore(check_interval=3600)
+load = time.perf_counter() - t0
+after = memory_mb("VmRSS")
+
+rng = random.Random(1)
+probe = [store.by_id(f"LT{rng.randrange(n):06d}") for _ in range(200)]
+keys = [(c["pan"], c["email"], c["phone"]) for c in probe]
+t0 = time.perf_counter()
+for i in range(lookups):
+    pan, email, phone = keys[i % len(keys)]
+    cust = store.find_kyc(pan, email, phone)
+    store.credit_score(cust["customer_id"])
+    store.is_verified(cust["customer_id"])
+kyc = time.perf_counter() - t0
+print(json.dumps({
+    "snapshot": store.snapshot is not None,
+    "load_ms": load * 1000,
+    "rss_mb": after - before,
+    "kyc_us": kyc / lookups * 1e6,
+}))
+"""
+
+_COMPILE = _MEMORY + """
+import json, sys, time
+from pathlib import Path
+from backend.data.customer_store import SNAPSHOT_TABLES
+from backend.data.snapshot import compile_snapshot
+if sys.argv[1] == "-":
+    print(json.dumps({"peak_rss_mb": memory_mb("VmHWM")}))
+    raise SystemExit
+t0 = time.perf_counter()
+compile_snapshot(SNAPSHOT_TABLES, Path(sys.argv[1]), Path(sys.argv[1]) / "customers.snap")
+print(json.dumps({"ms": (time.perf_counter() - t0) * 1000, "peak_rss_mb": memory_mb("VmHWM")}))
+"""
+
+
+def run(code: str, env: dict, *args) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", code, *map(str, args)], cwd=REPO_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n", type=int, default=200000, help="synthetic customers")
+    parser.add_argument("--lookups", type=int, default=20000, help="KYC lookups per backend")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="capitalmitra-snap-") as tmp:
+        data = Path(tmp)
+        write_customer_base(data, args.n)
+        source_bytes = sum((data / name).stat().st_size for name in ("customers.json", "crm_data.json", "credit_scores.json"))
+        env = {**os.environ, "CUSTOMER_DATA_DIR": str(data)}
+
+        baseline = run(_COMPILE, env, "-")  # same imports, no compile
+        compiled = run(_COMPILE, env, data)
+        snap_bytes = (data / "customers.snap").stat().st_size
+        as_json = run(_PROBE, {**env, "CUSTOMER_SNAPSHOT": ""}, args.n, args.lookups)
+        as_snap = run(_PROBE, env, args.n, args.lookups)
+        assert as_snap["snapshot"] and not as_json["snapshot"]
+
+    print(f"{args.n:,} customers: JSON sources {source_bytes / 1e6:.1f} MB, snapshot {snap_bytes / 1e6:.1f} MB")
+    print(f"compile              : {compiled['ms']:8.0f} ms, peak RSS {compiled['peak_rss_mb']:.0f} MB "
+          f"(imports alone {baseline['peak_rss_mb']:.0f} MB)")
+    print(f"{'':<20} {'load ms':>10} {'RSS +MB':>10} {'KYC us':>10}")
+    for name, r in (("json.load + index", as_json), ("mmap snapshot", as_snap)):
+        print(f"{name:<20} {r['load_ms']:>10.1f} {r['rss_mb']:>10.1f} {r['kyc_us']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+# backend/benchmarks/bench_websocket.py
+"""
+WebSocket chat transport vs. one POST /chat/ per message.
+
+    python -m backend.benchmarks.bench_websocket --turns 1000 --idle 2000
+
+Starts the real app under uvicorn (with the OpenRouter stub and the SMTP sink) and
+measures, on the same structured flow turn:
+  * round-trip latency per turn over HTTP keep-alive and over one WebSocket;
+  * time from the PAN reply until the pushed OTP `sent` event (vs. polling /chat/otp-status);
+  * server memory held per idle WebSocket connection.
+
+The app runs with --ws-per-message-deflate false, as it should in production: chat
+frames are small JSON, and each socket's zlib contexts would cost ~300 KB (--deflate
+measures that configuration).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+import websockets
+
+from backend.benchmarks.load_test import _free_port, _start, _wait_ready, write_customer_base
+from backend.benchmarks.stub_smtp import SMTPSink
+
+BAD_EMAIL = "not-an-email"  # keeps the conversation in COLLECT_EMAIL, so every turn does the same work
+
+
+def _rss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def _ms(samples) -> str:
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    return f"p50 {statistics.median(samples) * 1000:7.2f} ms  p95 {p95 * 1000:7.2f} ms"
+
+
+async def http_turns(base: str, turns: int) -> list:
+    async with httpx.AsyncClient(base_url=base) as client:
+        r = await client.post("/chat/", json={"message": "hi"})
+        headers = {"X-Session-ID": r.json()["session_id"]}
+        await client.post("/chat/", json={"message": "Bench User"}, headers=headers)
+        out = []
+        for _ in range(turns):
+            t0 = time.perf_counter()
+            r = await client.post("/chat/", json={"message": BAD_EMAIL}, headers=headers)
+            r.raise_for_status()
+            out.append(time.perf_counter() - t0)
+        return out
+
+
+async def _reply(ws) -> dict:
+    while True:
+        frame = json.loads(await ws.recv())
+        if frame["type"] == "reply":
+            return frame
+
+
+async def ws_turns(ws_base: str, turns: int) -> list:
+    async with websockets.connect(f"{ws_base}/chat/ws") as ws:
+        await ws.recv()  # session frame
+        for msg in ("hi", "Bench User"):
+            await ws.send(json.dumps({"type": "message", "message": msg}))
+            await _reply(ws)
+        out = []
+        for _ in range(turns):
+            t0 = time.perf_counter()
+            await ws.send(json.dumps({"type": "message", "message": BAD_EMAIL}))
+            await _reply(ws)
+            out.append(time.perf_counter() - t0)
+        return out
+
+
+async def otp_push(ws_base: str, base: str, cust: dict) -> tuple[float, float]:
+    """Seconds from the PAN reply to the OTP `sent` event, and to the first poll that sees it."""
+    async with websockets.connect(f"{ws_base}/chat/ws") as ws:
+        session_id = json.loads(await ws.recv())["session_id"]
+        for msg in ("hi", cust["name"], cust["email"], cust["phone"]):
+            await ws.send(json.dumps({"type": "message", "message": msg}))
+            await _reply(ws)
+        await ws.send(json.dumps({"type": "message", "message": cust["pan"]}))
+        await _reply(ws)
+        t0 = time.perf_counter()
+        poll = asyncio.create_task(_poll_otp(base, session_id, t0))
+        while json.loads(await ws.recv()).get("type") != "otp":
+            pass
+        pushed = time.perf_counter() - t0
+        return pushed, await poll
+
+
+async def _poll_otp(base: str, session_id: str, t0: float, interval: float = 0.25) -> float:
+    """What a client without push sees, polling every `interval` seconds."""
+    async with httpx.AsyncClient(base_url=base, headers={"X-Session-ID": session_id}) as client:
+        while True:
+            r = await client.get("/chat/otp-status")
+            if r.status_code == 200 and r.json().get("status") in ("sent", "failed"):
+                return time.perf_counter() - t0
+            await asyncio.sleep(interval)
+
+
+async def idle_connections(ws_base: str, n: int, pid: int) -> tuple[float, float]:
+    before = _rss_mb(pid)
+    conns = []
+    for i in range(0, n, 100):
+        batch = await asyncio.gather(*(websockets.connect(f"{ws_base}/chat/ws") for _ in range(min(100, n - i))))
+        await asyncio.gather(*(ws.recv() for ws in batch))
+        conns += batch
+    await asyncio.sleep(1.0)
+    after = _rss_mb(pid)
+    await asyncio.gather(*(ws.close() for ws in conns))
+    return before, after
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=1000, help="turns per transport")
+    parser.add_argument("--idle", type=int, default=2000, help="idle WebSocket connections to hold open")
+    parser.add_argument("--deflate", action="store_true", help="leave permessage-deflate on")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="cm-ws-"))
+    cust = write_customer_base(workdir / "data", 1)[0]
+    sink = SMTPSink(latency=0.05).start()
+    llm_port, app_port = _free_port(), _free_port()
+    env = {
+        **os.environ,
+        "CUSTOMER_DATA_DIR": str(workdir / "data"),
+        "AI_CACHE_PATH": str(workdir / "ai_cache.json"),
+        "AUDIT_LOG_DIR": str(workdir / "audit"),
+        "SESSION_DB_PATH": str(workdir / "sessions.db"),
+        "OPENROUTER_API_KEY": "bench",
+        "OPENROUTER_API_URL": f"http://127.0.0.1:{llm_port}/api/v1/chat/completions",
+        "SMTP_SERVER": "127.0.0.1",
+        "SMTP_PORT": str(sink.port),
+        "SMTP_STARTTLS": "false",
+        "SMTP_USER": "bench@capitalmitra.local",
+        "SMTP_PASSWORD": "bench",
+        "SESSION_MAX": str(max(10000, args.idle * 2)),
+    }
+    base, ws_base = f"http://127.0.0.1:{app_port}", f"ws://127.0.0.1:{app_port}"
+    procs = []
+    try:
+        procs.append(_start([sys.executable, "-m", "backend.benchmarks.stub_openrouter", "--port", str(llm_port)],
+                            env, llm_port, workdir / "openrouter_stub.log"))
+        app = _start([sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(app_port),
+                      "--ws", "websockets", "--ws-per-message-deflate", str(args.deflate).lower(),
+                      "--log-level", "warning"], env, app_port, workdir / "app.log")
+        procs.append(app)
+        _wait_ready(base)
+
+        http = asyncio.run(http_turns(base, args.turns))
+        ws = asyncio.run(ws_turns(ws_base, args.turns))
+        pushed, polled = asyncio.run(otp_push(ws_base, base, cust))
+        before, after = asyncio.run(idle_connections(ws_base, args.idle, app.pid))
+    finally:
+        for proc in reversed(procs):
+            proc.terminate()
+            try:
+                proc.wait(timeout=15)
+            except Exception:
+                proc.kill()
+        sink.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"turn over HTTP keep-alive : {_ms(http)}")
+    print(f"turn over one WebSocket   : {_ms(ws)}")
+    print(f"OTP delivered, pushed     : {pushed * 1000:7.1f} ms after the PAN reply (polling every 250 ms: {polled * 1000:.1f} ms)")
+    print(f"{args.idle:,} idle sockets      : server RSS {before:.1f} → {after:.1f} MB "
+          f"({(after - before) * 1024 / args.idle:.1f} KB per connection)")
+
+
+if __name__ == "__main__":
+    main()
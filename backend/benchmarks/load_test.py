@@ -0,0 +1,328 @@
+# backend/benchmarks/load_test.py
+"""
+End-to-end load test: N simulated applicants through the full chat flow.
+
+    python -m backend.benchmarks.load_test --applicants 200 --concurrency 50 --out load.json
+    python -m backend.benchmarks.load_test --applicants 200 --compare load.json
+
+Starts the real app under uvicorn (separate process) against a synthetic customer
+base, a local OpenRouter stub (separate process) and an in-process SMTP sink. Each
+applicant walks GREETING → KYC → OTP (read back from the sink) → loan → tenure →
+underwriting → sanction, asks one post-sanction AI question and downloads the
+letter. Client-side latency is recorded per conversation state; the summary
+(throughput, p50/p95/p99 per state, server-side flow stats) is written as JSON so
+runs can be compared with --compare.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import socket
+import string
+import subprocess
+import sys
+import tempfile
+import time
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from pathlib import Path
+
+import httpx
+import numpy as np
+
+from backend.benchmarks.stub_smtp import SMTPSink
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+REPO_DIR = BACKEND_DIR.parent
+
+
+# ==============================
+# FIXTURES
+# ==============================
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _pan(i: int) -> str:
+    letters = string.ascii_uppercase
+    head = "".join(letters[(i // 26 ** k) % 26] for k in range(5))
+    return f"{head}{i % 10000:04d}{letters[(i // 10000) % 26]}"
+
+
+def write_customer_base(directory: Path, n: int) -> list[dict]:
+    """Synthetic, verified, approvable customers with unique KYC details."""
+    customers, crm, scores = [], [], []
+    for i in range(n):
+        cid = f"LT{i:06d}"
+        cust = {
+            "customer_id": cid,
+            "name": f"Applicant {_pan(i)[:5].title()}",
+            "age": 30,
+            "city": "Mumbai",
+            "phone": f"9{i:09d}",
+            "email": f"applicant{i}@loadtest.local",
+            "pan": _pan(i),
+            "credit_score": 780,
+            "pre_approved_limit": 1000000,
+            "monthly_income": 150000,
+            "employment_type": "Salaried",
+            "company": "LoadTest",
+            "existing_loans": [],
+        }
+        customers.append(cust)
+        crm.append({"customer_id": cid, "pan": cust["pan"], "verified": True})
+        scores.append({"customer_id": cid, "credit_score": 780})
+
+    directory.mkdir(parents=True, exist_ok=True)
+    for name, records in (("customers.json", customers), ("crm_data.json", crm), ("credit_scores.json", scores)):
+        (directory / name).write_text(json.dumps(records), encoding="utf-8")
+    shutil.copy(BACKEND_DIR / "data" / "offers.json", directory / "offers.json")
+    return customers
+
+
+def _start(cmd, env, port, log: Path, timeout=60.0) -> subprocess.Popen:
+    # Output goes to a file: an unread pipe would fill up and stall the server under load
+    with open(log, "wb") as out:
+        proc = subprocess.Popen(cmd, cwd=REPO_DIR, env=env, stdout=out, stderr=subprocess.STDOUT)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"{cmd[2]} exited early:\n{log.read_text(errors='replace')[-2000:]}")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return proc
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError(f"{cmd[2]} did not start listening on port {port}")
+
+
+def _wait_ready(base_url: str, timeout=60.0):
+    """Poll /ready so applicants never pay for the app's startup warm-up."""
+    deadline = time.monotonic() + timeout
+    detail = "no response"
+    while time.monotonic() < deadline:
+        try:
+            r = httpx.get(f"{base_url}/ready", timeout=1.0)
+            if r.status_code == 200:
+                return
+            detail = r.text
+        except httpx.HTTPError as e:
+            detail = str(e)
+        time.sleep(0.1)
+    raise RuntimeError(f"app did not become ready: {detail}")
+
+
+# ==============================
+# APPLICANT
+# ==============================
+class Recorder:
+    def __init__(self):
+        self.samples: dict[str, list[float]] = {}
+        self.errors: dict[str, int] = {}
+
+    def add(self, state, seconds):
+        self.samples.setdefault(state, []).append(seconds)
+
+    def fail(self, state):
+        self.errors[state] = self.errors.get(state, 0) + 1
+
+
+async def run_applicant(client, cust, sink, rec, otp_timeout):
+    headers = {}
+
+    async def turn(state, message, expect=None):
+        t0 = time.perf_counter()
+        r = await client.post("/chat/", json={"message": message}, headers=headers)
+        rec.add(state, time.perf_counter() - t0)
+        body = r.json() if r.status_code == 200 else {}
+        headers["X-Session-ID"] = body.get("session_id") or headers.get("X-Session-ID", "")
+        if r.status_code != 200 or (expect and expect not in body):
+            rec.fail(state)
+            raise RuntimeError(f"{state}: HTTP {r.status_code} {body.get('message', r.text)[:120]}")
+        return body
+
+    await turn("GREETING", "hi")
+    await turn("COLLECT_NAME", cust["name"])
+    await turn("COLLECT_EMAIL", cust["email"])
+    await turn("COLLECT_PHONE", cust["phone"])
+    await turn("COLLECT_PAN", cust["pan"])
+
+    t0 = time.perf_counter()
+    while not sink.otps_for(cust["email"]):
+        if time.perf_counter() - t0 > otp_timeout:
+            rec.fail("OTP_DELIVERY")
+            raise RuntimeError("OTP_DELIVERY: no email received")
+        await asyncio.sleep(0.01)
+    rec.add("OTP_DELIVERY", time.perf_counter() - t0)
+
+    await turn("OTP_SENT", sink.otps_for(cust["email"])[-1])
+    await turn("LOAN_INTENT", "personal")
+    await turn("COLLECT_AMOUNT", "500000")
+    await turn("COLLECT_TENURE", "36")
+    sanction = await turn("SANCTION", "yes, proceed", expect="sanction_letter")
+    await turn("DONE", "what will my interest cost be over the loan?")
+
+    t0 = time.perf_counter()
+    r = await client.get(sanction["sanction_letter"])
+    while r.status_code == 202:
+        r = await client.get(sanction["sanction_letter"])
+    rec.add("LETTER", time.perf_counter() - t0)
+    if r.status_code != 200 or not r.content.startswith(b"%PDF"):
+        rec.fail("LETTER")
+        raise RuntimeError(f"LETTER: HTTP {r.status_code}")
+
+
+async def drive(base_url, customers, sink, concurrency, otp_timeout):
+    rec = Recorder()
+    sem = asyncio.Semaphore(concurrency)
+    failures = []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    # Applicants share one connection pool but must not share the session cookie
+    no_cookies = CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+    async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits, cookies=no_cookies) as client:
+        async def one(cust):
+            async with sem:
+                try:
+                    await run_applicant(client, cust, sink, rec, otp_timeout)
+                except Exception as e:
+                    failures.append(str(e))
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*(one(c) for c in customers))
+        elapsed = time.perf_counter() - t0
+        flow_stats = (await client.get("/chat/flow/stats")).json()
+    return rec, failures, elapsed, flow_stats
+
+
+# ==============================
+# REPORT
+# ==============================
+def summarize(rec, failures, elapsed, flow_stats, config) -> dict:
+    states = {}
+    for state, samples in rec.samples.items():
+        ms = np.asarray(samples) * 1000
+        p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+        states[state] = {
+            "count": len(samples),
+            "errors": rec.errors.get(state, 0),
+            "mean_ms": round(float(ms.mean()), 2),
+            "p50_ms": round(float(p50), 2),
+            "p95_ms": round(float(p95), 2),
+            "p99_ms": round(float(p99), 2),
+            "max_ms": round(float(ms.max()), 2),
+        }
+    requests = sum(len(s) for k, s in rec.samples.items() if k != "OTP_DELIVERY")
+    completed = config["applicants"] - len(failures)
+    return {
+        "config": config,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "duration_s": round(elapsed, 3),
+        "applicants_completed": completed,
+        "applicants_failed": len(failures),
+        "requests": requests,
+        "throughput_rps": round(requests / elapsed, 2),
+        "applicants_per_s": round(completed / elapsed, 2),
+        "states": states,
+        "server_flow_stats": flow_stats,
+        "sample_failures": failures[:10],
+    }
+
+
+def print_report(report, baseline=None):
+    print(f"applicants: {report['applicants_completed']} completed, {report['applicants_failed']} failed "
+          f"in {report['duration_s']:.1f}s — {report['throughput_rps']:.1f} req/s, "
+          f"{report['applicants_per_s']:.2f} applicants/s")
+    header = f"{'state':<15}{'count':>7}{'err':>5}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    print(header + ("   Δp95 vs baseline" if baseline else ""))
+    for state, row in report["states"].items():
+        line = f"{state:<15}{row['count']:>7}{row['errors']:>5}{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}{row['p99_ms']:>10.1f}"
+        base = (baseline or {}).get("states", {}).get(state)
+        if base:
+            delta = row["p95_ms"] - base["p95_ms"]
+            pct = delta / base["p95_ms"] * 100 if base["p95_ms"] else 0.0
+            line += f"   {delta:+9.1f} ({pct:+.0f}%)"
+        print(line)
+    for failure in report["sample_failures"]:
+        print(f"  ! {failure}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--applicants", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=25)
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="OpenRouter stub latency (s)")
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--smtp-latency", type=float, default=0.05, help="SMTP sink latency per message (s)")
+    parser.add_argument("--smtp-error-rate", type=float, default=0.0)
+    parser.add_argument("--otp-timeout", type=float, default=30.0)
+    parser.add_argument("--app-workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--keep-workdir", action="store_true", help="keep the temp dir with server logs")
+    parser.add_argument("--out", help="write the JSON report here")
+    parser.add_argument("--compare", help="baseline JSON report to diff p95 against")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="cm-load-"))
+    customers = write_customer_base(workdir / "data", args.applicants)
+    sink = SMTPSink(latency=args.smtp_latency, error_rate=args.smtp_error_rate).start()
+
+    llm_port, app_port = _free_port(), _free_port()
+    env = {
+        **os.environ,
+        "CUSTOMER_DATA_DIR": str(workdir / "data"),
+        "AI_CACHE_PATH": str(workdir / "ai_cache.json"),
+        "AUDIT_LOG_DIR": str(workdir / "audit"),
+        "SESSION_DB_PATH": str(workdir / "sessions.db"),
+        "OPENROUTER_API_KEY": "load-test",
+        "OPENROUTER_API_URL": f"http://127.0.0.1:{llm_port}/api/v1/chat/completions",
+        "SMTP_SERVER": "127.0.0.1",
+        "SMTP_PORT": str(sink.port),
+        "SMTP_STARTTLS": "false",
+        "SMTP_USER": "loadtest@capitalmitra.local",
+        "SMTP_PASSWORD": "load-test",
+        "SESSION_MAX": str(max(10000, args.applicants * 2)),
+    }
+    procs = []
+    try:
+        procs.append(_start(
+            [sys.executable, "-m", "backend.benchmarks.stub_openrouter", "--port", str(llm_port),
+             "--latency", str(args.llm_latency), "--error-rate", str(args.llm_error_rate)],
+            env, llm_port, workdir / "openrouter_stub.log",
+        ))
+        procs.append(_start(
+            [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(app_port),
+             "--workers", str(args.app_workers), "--log-level", "warning"],
+            env, app_port, workdir / "app.log",
+        ))
+        _wait_ready(f"http://127.0.0.1:{app_port}")
+        rec, failures, elapsed, flow_stats = asyncio.run(
+            drive(f"http://127.0.0.1:{app_port}", customers, sink, args.concurrency, args.otp_timeout)
+        )
+    finally:
+        for proc in reversed(procs):
+            proc.terminate()
+            try:
+                proc.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+        sink.stop()
+        if args.keep_workdir:
+            print(f"server logs and data kept in {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    config = {k: v for k, v in vars(args).items() if k not in ("out", "compare", "keep_workdir")}
+    report = summarize(rec, failures, elapsed, flow_stats, config)
+    baseline = json.loads(Path(args.compare).read_text()) if args.compare else None
+    print_report(report, baseline)
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, indent=2))
+        print(f"report written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
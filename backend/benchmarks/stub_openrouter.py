@@ -0,0 +1,75 @@
+# backend/benchmarks/stub_openrouter.py
+"""
+Local stand-in for the OpenRouter chat-completions API.
+
+    python -m backend.benchmarks.stub_openrouter --port 8099 --latency 0.3
+    OPENROUTER_API_URL=http://127.0.0.1:8099/api/v1/chat/completions uvicorn backend.main:app
+
+Supports both plain JSON responses and `"stream": true` SSE chunks, with
+configurable first-token latency, per-token delay, slow-tail and error injection.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+DEFAULT_REPLY = (
+    "Personal loans at CapitalMitra start from 10.5% with flexible tenures. "
+    "Your EMI depends on the amount and tenure you choose. I can help you pick the right plan!"
+)
+
+
+def create_app(latency: float = 0.2, token_delay: float = 0.01, error_rate: float = 0.0, reply: str = DEFAULT_REPLY,
+               slow_rate: float = 0.0, slow_latency: float = 5.0):
+    app = FastAPI(title="OpenRouter stub")
+    app.state.calls = 0
+
+    @app.post("/api/v1/chat/completions")
+    async def completions(request: Request):
+        body = await request.json()
+        app.state.calls += 1
+        await asyncio.sleep(slow_latency if slow_rate and random.random() < slow_rate else latency)
+        if error_rate and random.random() < error_rate:
+            return JSONResponse({"error": {"message": "stub: injected upstream failure"}}, status_code=502)
+
+        model = body.get("model", "stub-model")
+        if not body.get("stream"):
+            return {
+                "id": f"gen-{app.state.calls}",
+                "model": model,
+                "created": int(time.time()),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": reply}, "finish_reason": "stop"}],
+            }
+
+        async def chunks():
+            yield ": OPENROUTER PROCESSING\n\n"
+            for i, word in enumerate(reply.split(" ")):
+                delta = {"content": word if i == 0 else " " + word}
+                yield f"data: {json.dumps({'model': model, 'choices': [{'index': 0, 'delta': delta}]})}\n\n"
+                await asyncio.sleep(token_delay)
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(chunks(), media_type="text/event-stream")
+
+    return app
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds before the first byte")
+    parser.add_argument("--token-delay", type=float, default=0.01, help="seconds between streamed tokens")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of calls answered with 502")
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="fraction of calls delayed by --slow-latency instead")
+    parser.add_argument("--slow-latency", type=float, default=5.0, help="seconds before the first byte of a slow call")
+    args = parser.parse_args()
+    app = create_app(args.latency, args.token_delay, args.error_rate, slow_rate=args.slow_rate, slow_latency=args.slow_latency)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
@@ -0,0 +1,161 @@
+# backend/benchmarks/stub_smtp.py
+"""
+Local SMTP sink that accepts (and records) every message.
+
+    python -m backend.benchmarks.stub_smtp --port 2525 --latency 0.05
+    SMTP_SERVER=127.0.0.1 SMTP_PORT=2525 SMTP_STARTTLS=false uvicorn backend.main:app
+
+Speaks enough ESMTP for smtplib: EHLO/HELO, AUTH PLAIN/LOGIN (any credentials),
+MAIL, RCPT, DATA, RSET, NOOP, QUIT. No STARTTLS — run the app with SMTP_STARTTLS=false.
+Latency and transient-failure injection make it usable for retry and load testing.
+"""
+
+import argparse
+import asyncio
+import random
+import re
+import threading
+
+
+_OTP = re.compile(r"\b(\d{6})\b")
+
+
+def _address(line: str) -> str:
+    m = re.search(r"<([^>]*)>", line)
+    return m.group(1) if m else line.split(":", 1)[-1].strip()
+
+
+class SMTPSink:
+    """In-process SMTP server; `messages` collects (mail_from, rcpt_tos, data) tuples."""
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, error_rate=0.0):
+        self.host, self.port = host, port
+        self.latency, self.error_rate = latency, error_rate
+        self.messages: list[tuple[str, list[str], str]] = []
+        self.connections = 0
+        self._otps: dict[str, list[str]] = {}  # recipient -> codes, indexed as messages arrive
+        self._loop = None
+        self._server = None
+        self._thread = None
+
+    # ------------------------------------
+    # Lifecycle
+    # ------------------------------------
+    def start(self):
+        """Serve on a background thread; returns once the port is bound."""
+        ready = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            self._server = self._loop.run_until_complete(
+                asyncio.start_server(self._handle, self.host, self.port)
+            )
+            self.port = self._server.sockets[0].getsockname()[1]
+            ready.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name="smtp-sink", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def stop(self):
+        if self._loop:
+            self._loop.call_soon_threadsafe(self._server.close)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+
+    def otps_for(self, rcpt: str) -> list[str]:
+        """Six-digit codes sent to `rcpt`, oldest first."""
+        return list(self._otps.get(rcpt, ()))
+
+    # ------------------------------------
+    # Protocol
+    # ------------------------------------
+    async def _handle(self, reader, writer):
+        self.connections += 1
+
+        async def reply(line):
+            writer.write((line + "\r\n").encode())
+            await writer.drain()
+
+        mail_from, rcpts = None, []
+        await reply("220 capitalmitra-sink ESMTP ready")
+        try:
+            while True:
+                raw = await reader.readline()
+                if not raw:
+                    break
+                line = raw.decode(errors="replace").rstrip("\r\n")
+                cmd = line.split(" ", 1)[0].upper()
+
+                if cmd == "EHLO":
+                    writer.write(b"250-capitalmitra-sink\r\n250-AUTH PLAIN LOGIN\r\n250 8BITMIME\r\n")
+                    await writer.drain()
+                elif cmd == "HELO":
+                    await reply("250 capitalmitra-sink")
+                elif cmd == "AUTH":
+                    parts = line.split()
+                    if parts[1].upper() == "LOGIN":
+                        for prompt in ("VXNlcm5hbWU6", "UGFzc3dvcmQ6"):  # 'Username:', 'Password:'
+                            if len(parts) > 2 and prompt == "VXNlcm5hbWU6":
+                                continue  # initial response already carried the username
+                            await reply(f"334 {prompt}")
+                            await reader.readline()
+                    await reply("235 2.7.0 Authentication successful")
+                elif cmd == "MAIL":
+                    mail_from, rcpts = _address(line), []
+                    await reply("250 OK")
+                elif cmd == "RCPT":
+                    rcpts.append(_address(line))
+                    await reply("250 OK")
+                elif cmd == "DATA":
+                    await reply("354 End data with <CR><LF>.<CR><LF>")
+                    chunks = []
+                    while True:
+                        data_line = await reader.readline()
+                        if data_line in (b".\r\n", b".\n", b""):
+                            break
+                        chunks.append(data_line.decode(errors="replace"))
+                    if self.latency:
+                        await asyncio.sleep(self.latency)
+                    if self.error_rate and random.random() < self.error_rate:
+                        await reply("451 4.3.0 Injected transient failure")
+                    else:
+                        data = "".join(chunks)
+                        self.messages.append((mail_from, rcpts, data))
+                        m = _OTP.search(data)
+                        if m:
+                            for rcpt in rcpts:
+                                self._otps.setdefault(rcpt, []).append(m.group(1))
+                        await reply("250 OK queued")
+                elif cmd == "RSET":
+                    mail_from, rcpts = None, []
+                    await reply("250 OK")
+                elif cmd == "NOOP":
+                    await reply("250 OK")
+                elif cmd == "QUIT":
+                    await reply("221 Bye")
+                    break
+                else:
+                    await reply("502 Command not implemented")
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=2525)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds to hold each DATA reply")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of messages answered with 451")
+    args = parser.parse_args()
+
+    sink = SMTPSink(args.host, args.port, args.latency, args.error_rate).start()
+    print(f"📬 SMTP sink listening on {args.host}:{sink.port} (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        sink.stop()
@@ -0,0 +1,285 @@
+# backend/data/customer_store.py
+
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+
+from backend.data.snapshot import Snapshot, TableSpec
+from backend.services.metrics import DEPENDENCY_LATENCY
+
+# Overridable so load tests and staging can point the store at another customer base
+DATA_DIR = Path(os.getenv("CUSTOMER_DATA_DIR") or Path(__file__).resolve().parent)
+
+_NON_DIGIT = re.compile(r"[^\d]")
+
+
+def normalize_phone(phone: str | None) -> str:
+    """Last 10 digits of a phone number, so '+91-9876543210' and '9876543210' collide."""
+    return _NON_DIGIT.sub("", phone or "")[-10:]
+
+
+# Columnar layout of the compiled snapshot (python -m backend.data.snapshot compile).
+# Fields missing here still round-trip through the snapshot's per-row extras.
+SNAPSHOT_TABLES = (
+    TableSpec(
+        "customers",
+        "customers.json",
+        columns=(
+            ("customer_id", "str"), ("name", "str"), ("age", "int"), ("city", "str"), ("phone", "str"),
+            ("email", "str"), ("pan", "str"), ("credit_score", "int"), ("pre_approved_limit", "int"),
+            ("monthly_income", "int"), ("employment_type", "str"), ("company", "str"), ("existing_loans", "json"),
+        ),
+        indexes=(("id", "customer_id", None), ("pan", "pan", str.upper), ("email", "email", str.lower),
+                 ("phone", "phone", normalize_phone)),
+    ),
+    TableSpec(
+        "crm", "crm_data.json",
+        columns=(("customer_id", "str"), ("pan", "str"), ("verified", "bool")),
+        indexes=(("id", "customer_id", None),),
+    ),
+    TableSpec(
+        "credit", "credit_scores.json",
+        columns=(("customer_id", "str"), ("credit_score", "int")),
+        indexes=(("id", "customer_id", None),),
+    ),
+)
+
+
+_SNAPSHOT_NAMES = {spec.name for spec in SNAPSHOT_TABLES}
+
+
+def snapshot_path(data_dir: Path = DATA_DIR) -> Path | None:
+    """CUSTOMER_SNAPSHOT if set (empty disables snapshots), else customers.snap beside the JSON."""
+    configured = os.getenv("CUSTOMER_SNAPSHOT")
+    if configured is not None:
+        return Path(configured) if configured else None
+    return Path(data_dir) / "customers.snap"
+
+
+class _Source:
+    """One JSON file plus the (mtime, size) signature it was last loaded at."""
+
+    __slots__ = ("path", "signature", "records")
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.signature = None
+        self.records = []
+
+
+class CustomerStore:
+    """
+    Single in-process repository for customers, CRM and credit-bureau data.
+
+    Every file is parsed once into O(1) hash indexes (PAN, email, normalized phone,
+    customer_id). Files are re-stat'ed at most once per `check_interval` seconds and
+    re-parsed only when their mtime or size changes; indexes are swapped atomically
+    so readers never see a half-built view.
+
+    When a compiled snapshot (see backend.data.snapshot) is present and none of its
+    source files changed since it was built, customers, CRM and credit data are served
+    from the memory-mapped snapshot instead: nothing is parsed or indexed at startup
+    and the pages are shared by every worker. A stale snapshot is ignored until it is
+    recompiled.
+    """
+
+    def __init__(self, data_dir: Path = DATA_DIR, check_interval: float | None = None):
+        self.data_dir = Path(data_dir)
+        self.check_interval = (
+            check_interval if check_interval is not None else float(os.getenv("DATA_RELOAD_INTERVAL", 1.0))
+        )
+        self._sources = {
+            "customers": _Source(self.data_dir / "customers.json"),
+            "crm": _Source(self.data_dir / "crm_data.json"),
+            "credit": _Source(self.data_dir / "credit_scores.json"),
+            "offers": _Source(self.data_dir / "offers.json"),
+        }
+        snapshot = snapshot_path(self.data_dir)
+        self._snapshot_src = _Source(snapshot) if snapshot else None
+        self._snapshot: Snapshot | None = None
+        self._lock = threading.Lock()
+        self._checked_at = 0.0
+        self.reloads = 0
+
+        self._mapped: Snapshot | None = None  # last snapshot opened, fresh or not
+        self._customer_index: dict = {"id": {}, "pan": {}, "email": {}, "phone": {}}
+        self._crm_by_id: dict = {}
+        self._score_by_id: dict = {}
+        self.refresh(force=True)
+
+    # ==============================
+    # LOOKUPS
+    # ==============================
+    def by_id(self, customer_id: str) -> dict | None:
+        return self._customer("id", customer_id)
+
+    def by_pan(self, pan: str) -> dict | None:
+        return self._customer("pan", (pan or "").upper())
+
+    def by_email(self, email: str) -> dict | None:
+        return self._customer("email", (email or "").lower())
+
+    def by_phone(self, phone: str) -> dict | None:
+        return self._customer("phone", normalize_phone(phone))
+
+    def find_kyc(self, pan: str, email: str, phone: str) -> dict | None:
+        """Customer whose PAN, email and phone all match the applicant's KYC details."""
+        cust = self.by_pan(pan)
+        if (
+            cust
+            and cust.get("email", "").lower() == (email or "").lower()
+            and normalize_phone(cust.get("phone")) == normalize_phone(phone)
+        ):
+            return cust
+        return None
+
+    def _customer(self, index: str, key: str) -> dict | None:
+        self.refresh()
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot["customers"].lookup(index, key)
+        return self._customer_index[index].get(key)
+
+    def crm_record(self, customer_id: str) -> dict | None:
+        self.refresh()
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot["crm"].lookup("id", customer_id)
+        return self._crm_by_id.get(customer_id)
+
+    def is_verified(self, customer_id: str) -> bool:
+        rec = self.crm_record(customer_id)
+        return bool(rec and rec.get("verified") is True)
+
+    def credit_score(self, customer_id: str) -> int | None:
+        self.refresh()
+        snapshot = self._snapshot
+        if snapshot is not None:
+            rec = snapshot["credit"].lookup("id", customer_id)
+            return None if rec is None else int(rec.get("credit_score", 0))
+        return self._score_by_id.get(customer_id)
+
+    def customers(self):
+        """Every customer record; the same sequence object until the data changes."""
+        self.refresh()
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot["customers"].records()
+        return self._sources["customers"].records
+
+    def offers(self) -> list:
+        self.refresh()
+        return self._sources["offers"].records
+
+    # ==============================
+    # RELOADING
+    # ==============================
+    def refresh(self, force: bool = False):
+        now = time.monotonic()
+        if not force and now - self._checked_at < self.check_interval:
+            return
+        with self._lock:
+            if not force and now - self._checked_at < self.check_interval:
+                return
+            changed = set()
+            snapshot = self._fresh_snapshot()
+            if snapshot is not self._snapshot:
+                for spec in SNAPSHOT_TABLES:
+                    changed.add(spec.name)
+                    self._sources[spec.name].signature = None  # reparse the JSON if we fall back to it
+                self._snapshot = snapshot
+            for name, src in self._sources.items():
+                if snapshot is not None and name in _SNAPSHOT_NAMES:
+                    continue
+                if self._load_if_changed(src):
+                    changed.add(name)
+            self._checked_at = now
+            if changed:
+                self._reindex(changed)
+                self.reloads += 1
+
+    @property
+    def snapshot(self) -> Snapshot | None:
+        """The mapped snapshot currently serving lookups, if any."""
+        return self._snapshot
+
+    def _fresh_snapshot(self) -> Snapshot | None:
+        src = self._snapshot_src
+        if src is None:
+            return None
+        try:
+            st = src.path.stat()
+        except FileNotFoundError:
+            src.signature, self._mapped = None, None
+            return None
+        signature = (st.st_mtime_ns, st.st_size)
+        if signature != src.signature:
+            src.signature = signature
+            try:
+                with DEPENDENCY_LATENCY.time(dependency="data_load", operation=src.path.name):
+                    self._mapped = Snapshot(src.path, SNAPSHOT_TABLES)
+            except (OSError, ValueError):
+                self._mapped = None  # unreadable or built for another schema: serve the JSON
+        mapped = self._mapped
+        return mapped if mapped is not None and mapped.is_fresh(self.data_dir) else None
+
+    @staticmethod
+    def _load_if_changed(src: _Source) -> bool:
+        try:
+            st = src.path.stat()
+        except FileNotFoundError:
+            return False
+        signature = (st.st_mtime_ns, st.st_size)
+        if signature == src.signature:
+            return False
+        with DEPENDENCY_LATENCY.time(dependency="data_load", operation=src.path.name):
+            with open(src.path, "r", encoding="utf-8") as f:
+                src.records = json.load(f)
+        src.signature = signature
+        return True
+
+    def _reindex(self, changed: set):
+        if self._snapshot is not None and changed & _SNAPSHOT_NAMES:
+            # Served from the mapping: drop the parsed copies and their indexes
+            for name in _SNAPSHOT_NAMES:
+                self._sources[name].records = []
+            self._customer_index = {"id": {}, "pan": {}, "email": {}, "phone": {}}
+            self._crm_by_id, self._score_by_id = {}, {}
+            changed = changed - _SNAPSHOT_NAMES
+
+        if "customers" in changed:
+            by_id, by_pan, by_email, by_phone = {}, {}, {}, {}
+            for c in self._sources["customers"].records:
+                by_id[c.get("customer_id")] = c
+                if c.get("pan"):
+                    by_pan[c["pan"].upper()] = c
+                if c.get("email"):
+                    by_email[c["email"].lower()] = c
+                if c.get("phone"):
+                    by_phone[normalize_phone(c["phone"])] = c
+            self._customer_index = {"id": by_id, "pan": by_pan, "email": by_email, "phone": by_phone}
+
+        if "crm" in changed:
+            self._crm_by_id = {r.get("customer_id"): r for r in self._sources["crm"].records}
+
+        if "credit" in changed:
+            self._score_by_id = {
+                r.get("customer_id"): int(r.get("credit_score", 0)) for r in self._sources["credit"].records
+            }
+
+
+_store: CustomerStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_customer_store() -> CustomerStore:
+    """Process-wide shared store, built on first use."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = CustomerStore()
+    return _store
@@ -1,6 +1,8 @@
 import json
 import os
 
+from backend.data.customer_store import get_customer_store
+
 DATA_DIR = os.path.dirname(__file__)
 
 def load_json(filename):
@@ -8,18 +10,16 @@ def load_json(filename):
     with open(path, "r", encoding="utf-8") as f:
         return json.load(f)
 
+# Lookups go through the shared, indexed CustomerStore instead of re-reading files
+
 def get_customer_by_id(cid):
-    data = load_json("customers.json")
-    return next((c for c in data if c["customer_id"] == cid), None)
+    return get_customer_store().by_id(cid)
 
 def get_customer_by_pan(pan):
-    data = load_json("customers.json")
-    return next((c for c in data if c["pan"].upper() == pan.upper()), None)
+    return get_customer_store().by_pan(pan)
 
 def get_credit_score(cid):
-    data = load_json("credit_scores.json")
-    record = next((r for r in data if r["customer_id"] == cid), None)
-    return record.get("credit_score") if record else None
+    return get_customer_store().credit_score(cid)
 
 def get_offers():
-    return load_json("offers.json")
\ No newline at end of file
+    return get_customer_store().offers()
@@ -0,0 +1,471 @@
+# backend/data/snapshot.py
+"""
+Memory-mapped columnar snapshot of the customer, CRM and credit-bureau files.
+
+    python -m backend.data.snapshot compile
+    python -m backend.data.snapshot compile --data-dir /srv/data --out /srv/data/customers.snap
+    python -m backend.data.snapshot verify
+
+The CustomerStore maps `customers.snap` (next to the JSON files) when it is present
+and newer than its sources, and falls back to parsing the JSON otherwise.
+"""
+
+import argparse
+import json
+import mmap
+import os
+import sys
+import tempfile
+import time
+import zlib
+from array import array
+from pathlib import Path
+
+MAGIC = b"CMSNAP01"
+EXTRA = "_extra"  # per-row JSON object holding fields the schema doesn't cover
+
+# Per-row presence byte of every column
+MISSING, PRESENT, NULL = 0, 1, 2
+
+_INT64 = (-(1 << 63), (1 << 63) - 1)
+_JSON = json.JSONDecoder()
+
+
+class TableSpec:
+    """
+    Schema of one source file: typed columns (int, bool, str, or json for nested
+    values) and hash indexes over string columns. An index `key` function normalizes
+    values at compile time; lookups must pass keys normalized the same way.
+    """
+
+    __slots__ = ("name", "source", "columns", "indexes")
+
+    def __init__(self, name: str, source: str, columns: tuple, indexes: tuple = ()):
+        self.name = name
+        self.source = source
+        self.columns = columns  # ((field, kind), ...)
+        self.indexes = indexes  # ((index, field, key function or None), ...)
+
+
+# ==============================
+# STREAMING JSON INGEST
+# ==============================
+def iter_json_array(path: Path, chunk_size: int = 1 << 16):
+    """
+    Yield the elements of a top-level JSON array one at a time, holding at most one
+    element plus one read chunk in memory.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buf, pos, eof = "", 0, False
+
+        def fill():
+            nonlocal buf, pos, eof
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buf, pos = buf[pos:] + chunk, 0
+
+        def skip_ws():
+            nonlocal pos
+            while True:
+                while pos < len(buf) and buf[pos] in " \t\r\n":
+                    pos += 1
+                if pos < len(buf) or eof:
+                    return
+                fill()
+
+        fill()
+        skip_ws()
+        if buf[pos:pos + 1] != "[":
+            raise ValueError(f"{path}: expected a top-level JSON array")
+        pos += 1
+        first = True
+        while True:
+            skip_ws()
+            if buf[pos:pos + 1] == "]":
+                return
+            if not first:
+                if buf[pos:pos + 1] != ",":
+                    raise ValueError(f"{path}: expected ',' or ']' at offset {f.tell() - len(buf) + pos}")
+                pos += 1
+                skip_ws()
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buf, pos)
+                    # A number cut by the chunk boundary ("4.5e|3") still parses: wait for a delimiter
+                    if eof or (end < len(buf) and buf[end] in " \t\r\n,]"):
+                        break
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                fill()
+            pos = end
+            first = False
+            yield value
+
+
+# ==============================
+# COMPILER
+# ==============================
+class _Column:
+    """Spills one column to temporary files while rows stream in."""
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.presence = tempfile.TemporaryFile()
+        self.values = tempfile.TemporaryFile()  # int64 / uint8 values, or uint64 end offsets
+        self.blob = tempfile.TemporaryFile() if kind in ("str", "json") else None
+        self.blob_size = 0
+
+    def accepts(self, value) -> bool:
+        if self.kind == "int":
+            return type(value) is int and _INT64[0] <= value <= _INT64[1]
+        if self.kind == "bool":
+            return type(value) is bool
+        if self.kind == "str":
+            return type(value) is str
+        return True
+
+    def append(self, state: int, value=None):
+        self.presence.write(bytes((state,)))
+        if self.kind == "int":
+            self.values.write(array("q", (value if state == PRESENT else 0,)).tobytes())
+        elif self.kind == "bool":
+            self.values.write(bytes((1 if state == PRESENT and value else 0,)))
+        else:
+            if state == PRESENT:
+                data = (value if self.kind == "str" else json.dumps(value, ensure_ascii=False)).encode("utf-8")
+                self.blob.write(data)
+                self.blob_size += len(data)
+            self.values.write(array("Q", (self.blob_size,)).tobytes())
+
+    def sections(self):
+        out = [("presence", self.presence), ("values", self.values)]
+        if self.blob is not None:
+            out.append(("blob", self.blob))
+        return out
+
+
+def _slots_for(rows: int) -> int:
+    slots = 8
+    while slots < rows * 2:  # load factor ≤ 0.5 keeps probe chains short
+        slots *= 2
+    return slots
+
+
+def _hash(key: str) -> int:
+    return zlib.crc32(key.encode("utf-8"))
+
+
+def _build_index(hashes: array, slots: int) -> array:
+    """Open-addressing table of row + 1 (0 = empty), linear probing on crc32(key)."""
+    table = array("I", bytes(4 * slots))
+    mask = slots - 1
+    # Insert the last rows first so a duplicate key resolves to its last occurrence,
+    # matching what re-assigning a dict entry would do
+    for row in range(len(hashes) - 1, -1, -1):
+        h = hashes[row]
+        if h < 0:
+            continue
+        slot = h & mask
+        while table[slot]:
+            slot = (slot + 1) & mask
+        table[slot] = row + 1
+    return table
+
+
+def _compile_table(spec: TableSpec, path: Path):
+    columns = {field: _Column(kind) for field, kind in spec.columns}
+    columns[EXTRA] = _Column("json")
+    known = dict(spec.columns)
+    hashes = {name: array("q") for name, _, _ in spec.indexes}
+    rows = 0
+    for rec in iter_json_array(path):
+        if not isinstance(rec, dict):
+            raise ValueError(f"{path}: row {rows} is not a JSON object")
+        extra = {k: v for k, v in rec.items() if k not in known}
+        for field in known:
+            col = columns[field]
+            if field not in rec:
+                col.append(MISSING)
+            elif rec[field] is None:
+                col.append(NULL)
+            elif col.accepts(rec[field]):
+                col.append(PRESENT, rec[field])
+            else:
+                # Off-schema value (e.g. a score sent as a string): keep it verbatim
+                col.append(MISSING)
+                extra[field] = rec[field]
+        columns[EXTRA].append(PRESENT if extra else MISSING, extra)
+        for name, field, key in spec.indexes:
+            value = rec.get(field)
+            if isinstance(value, str) and value:
+                hashes[name].append(_hash(key(value) if key else value))
+            else:
+                hashes[name].append(-1)  # not indexed
+        rows += 1
+    return rows, columns, {name: _build_index(h, _slots_for(rows)) for name, h in hashes.items()}
+
+
+def compile_snapshot(specs, data_dir: Path, out: Path) -> dict:
+    """
+    Stream every spec's source file into one columnar snapshot at `out` (written to a
+    temporary file and renamed, so a running server never maps a half-written one).
+    Returns the manifest.
+    """
+    data_dir, out = Path(data_dir), Path(out)
+    manifest = {"version": 1, "byteorder": sys.byteorder, "built_at": time.time(), "sources": {}, "tables": {}}
+    compiled = []
+    for spec in specs:
+        path = data_dir / spec.source
+        st = path.stat()  # before reading: a write during compile leaves the snapshot stale, not wrong
+        manifest["sources"][spec.source] = [st.st_mtime_ns, st.st_size]
+        compiled.append((spec, *_compile_table(spec, path)))
+
+    # Lay out every section 8-byte aligned after the header, then write them in order
+    sections, offset = [], 0
+
+    def place(size):
+        nonlocal offset
+        start = offset
+        offset += size + (-size % 8)
+        return start
+
+    for spec, rows, columns, indexes in compiled:
+        table = {"rows": rows, "columns": {}, "indexes": {}}
+        for field, col in columns.items():
+            meta = {"kind": col.kind}
+            for section, fh in col.sections():
+                size = fh.seek(0, os.SEEK_END)
+                meta[section] = [place(size), size]
+                sections.append((meta[section], fh, None))
+            table["columns"][field] = meta
+        for name, field, _ in spec.indexes:
+            data = indexes[name].tobytes()
+            table["indexes"][name] = {"field": field, "slots": len(indexes[name]), "at": [place(len(data)), len(data)]}
+            sections.append((table["indexes"][name]["at"], None, data))
+        manifest["tables"][spec.name] = table
+
+    header = json.dumps(manifest, separators=(",", ":")).encode("utf-8")
+    base = 16 + len(header) + (-(16 + len(header)) % 8)  # section offsets are relative to this
+
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_name(f".{out.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            f.write(MAGIC + len(header).to_bytes(8, "little") + header)
+            for (start, size), fh, data in sections:
+                f.seek(base + start)
+                if data is not None:
+                    f.write(data)
+                else:
+                    fh.seek(0)
+                    while chunk := fh.read(1 << 20):
+                        f.write(chunk)
+            f.truncate(base + offset)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, out)
+    finally:
+        tmp.unlink(missing_ok=True)
+        for _, _, columns, _ in compiled:
+            for col in columns.values():
+                for _, fh in col.sections():
+                    fh.close()
+    return manifest
+
+
+# ==============================
+# READER
+# ==============================
+class Table:
+    """
+    Read-only view of one table inside a mapped snapshot. Rows are materialized as
+    fresh dicts on access; nothing is decoded up front.
+    """
+
+    def __init__(self, buf: memoryview, base: int, spec: TableSpec, meta: dict):
+        self.spec = spec
+        self.rows = meta["rows"]
+        self._columns = {}
+        for field, col in meta["columns"].items():
+            presence = self._section(buf, base, col["presence"])
+            values = self._section(buf, base, col["values"])
+            if col["kind"] == "int":
+                values = values.cast("q")
+            elif col["kind"] in ("str", "json"):
+                values = values.cast("Q")
+            blob = self._section(buf, base, col["blob"]) if "blob" in col else None
+            self._columns[field] = (col["kind"], presence, values, blob)
+        self._indexes = {
+            name: (idx["field"], idx["slots"] - 1, self._section(buf, base, idx["at"]).cast("I"))
+            for name, idx in meta["indexes"].items()
+        }
+        self._keys = {name: key for name, _, key in spec.indexes}
+        self._fields = [(field, self._columns[field]) for field, _ in spec.columns]
+        self._extra = self._columns[EXTRA]
+        self._records = Records(self)
+
+    @staticmethod
+    def _section(buf, base, at):
+        start, size = at
+        return buf[base + start:base + start + size]
+
+    def __len__(self):
+        return self.rows
+
+    def value(self, row: int, field: str, default=None):
+        return _decode(self._columns[field], row, default)
+
+    def row(self, row: int) -> dict:
+        rec = {}
+        for field, column in self._fields:
+            if column[1][row] != MISSING:
+                rec[field] = _decode(column, row)
+        extra = _decode(self._extra, row)
+        if extra:
+            rec.update(extra)
+        return rec
+
+    def find(self, index: str, key: str) -> int | None:
+        """Row number whose indexed field normalizes to `key`, or None."""
+        field, mask, table = self._indexes[index]
+        normalize = self._keys[index]
+        slot = _hash(key) & mask
+        while True:
+            entry = table[slot]
+            if not entry:
+                return None
+            value = self.value(entry - 1, field)
+            if isinstance(value, str) and (normalize(value) if normalize else value) == key:
+                return entry - 1
+            slot = (slot + 1) & mask
+
+    def lookup(self, index: str, key: str) -> dict | None:
+        row = self.find(index, key) if key else None
+        return None if row is None else self.row(row)
+
+    def records(self) -> "Records":
+        return self._records
+
+
+def _decode(column, row: int, default=None):
+    kind, presence, values, blob = column
+    state = presence[row]
+    if state != PRESENT:
+        return default if state == MISSING else None
+    if kind == "int":
+        return values[row]
+    if kind == "bool":
+        return values[row] == 1
+    text = str(blob[values[row - 1] if row else 0:values[row]], "utf-8")
+    return text if kind == "str" else _JSON.decode(text)
+
+
+class Records:
+    """Sequence of a table's rows, materialized one at a time."""
+
+    __slots__ = ("table",)
+
+    def __init__(self, table: Table):
+        self.table = table
+
+    def __len__(self):
+        return self.table.rows
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self.table.row(r) for r in range(*i.indices(self.table.rows))]
+        if i < 0:
+            i += self.table.rows
+        if not 0 <= i < self.table.rows:
+            raise IndexError(i)
+        return self.table.row(i)
+
+    def __iter__(self):
+        return map(self.table.row, range(self.table.rows))
+
+
+class Snapshot:
+    """
+    A compiled snapshot mapped read-only. Pages come from the OS page cache, so every
+    worker process mapping the same file shares one copy of the data; opening costs a
+    header parse regardless of size.
+    """
+
+    def __init__(self, path: Path, specs):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buf = memoryview(self._mmap)
+        if bytes(buf[:8]) != MAGIC:
+            raise ValueError(f"{self.path} is not a customer snapshot")
+        length = int.from_bytes(buf[8:16], "little")
+        self.manifest = json.loads(bytes(buf[16:16 + length]))
+        if self.manifest.get("byteorder") != sys.byteorder:
+            raise ValueError(f"{self.path} was compiled on a {self.manifest.get('byteorder')}-endian machine")
+        base = 16 + length + (-(16 + length) % 8)
+        self.tables = {}
+        for spec in specs:
+            meta = self.manifest["tables"].get(spec.name)
+            if meta is None:
+                raise ValueError(f"{self.path} has no '{spec.name}' table")
+            if [list(c) for c in spec.columns] != [[f, m["kind"]] for f, m in meta["columns"].items() if f != EXTRA]:
+                raise ValueError(f"{self.path}: '{spec.name}' columns differ from the current schema; recompile it")
+            self.tables[spec.name] = Table(buf, base, spec, meta)
+
+    def __getitem__(self, name: str) -> Table:
+        return self.tables[name]
+
+    def is_fresh(self, data_dir: Path) -> bool:
+        """False if any source file next to it changed after the snapshot was compiled."""
+        for source, signature in self.manifest["sources"].items():
+            try:
+                st = (Path(data_dir) / source).stat()
+            except FileNotFoundError:
+                continue  # deployments may ship only the snapshot
+            if [st.st_mtime_ns, st.st_size] != signature:
+                return False
+        return True
+
+
+def verify(specs, data_dir: Path, path: Path) -> int:
+    """Compare every snapshot row with its JSON source; returns the number of mismatches."""
+    snap = Snapshot(path, specs)
+    bad = 0
+    for spec in specs:
+        table = snap[spec.name]
+        rows = 0
+        for i, rec in enumerate(iter_json_array(Path(data_dir) / spec.source)):
+            if i >= len(table) or table.row(i) != rec:
+                bad += 1
+            rows += 1
+        bad += max(len(table) - rows, 0)
+    return bad
+
+
+def main():
+    from backend.data.customer_store import DATA_DIR, SNAPSHOT_TABLES, snapshot_path
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in (("compile", "build the snapshot from the JSON files"), ("verify", "check it row by row")):
+        cmd = sub.add_parser(name, help=help_text)
+        cmd.add_argument("--data-dir", type=Path, default=DATA_DIR, help="directory holding the JSON files")
+        cmd.add_argument("--out", type=Path, default=None, help="snapshot path (default <data-dir>/customers.snap)")
+    args = parser.parse_args()
+    out = args.out or snapshot_path(args.data_dir)
+
+    if args.command == "compile":
+        t0 = time.perf_counter()
+        manifest = compile_snapshot(SNAPSHOT_TABLES, args.data_dir, out)
+        rows = ", ".join(f"{name} {t['rows']:,}" for name, t in manifest["tables"].items())
+        print(f"{out}: {out.stat().st_size:,} bytes ({rows}) in {time.perf_counter() - t0:.2f}s")
+    else:
+        bad = verify(SNAPSHOT_TABLES, args.data_dir, out)
+        print(f"{out}: {'OK' if not bad else f'{bad} mismatched rows'}")
+        sys.exit(1 if bad else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,58 @@
-from fastapi import FastAPI
+import time
+from contextlib import asynccontextmanager
+
+from dotenv import load_dotenv
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
-from backend.routers import chat, upload, sanction, offer  
 
-app = FastAPI(title="CapitalMitra Backend API")
+load_dotenv()  # before any module reads its settings from the environment
+
+from backend.routers import chat, upload, sanction, offer, underwrite, amortization, metrics
+from backend.agents import master_agent as master_agent_module
+from backend.services import audit_log as audit_log_module
+from backend.services import letter_jobs as letter_jobs_module
+from backend.agents.conversation_flow import get_conversation_flow
+from backend.agents.master_agent import get_master_agent
+from backend.data.customer_store import get_customer_store
+from backend.services.customer_feed import get_customer_feed
+from backend.services.letter_jobs import get_letter_jobs
+from backend.services.metrics import HTTP_LATENCY, HTTP_REQUESTS
+from backend.services.offer_engine import get_offer_engine
+from backend.services.readiness import Readiness
+
+# Warm-up, in order; nothing heavy is built at import so workers start serving `/` at once
+readiness = Readiness()
+readiness.add("customer_data", get_customer_store)
+readiness.add("conversation_flow", get_conversation_flow)
+readiness.add("offer_index", lambda: get_offer_engine().rules())
+readiness.add("offer_feed", lambda: get_customer_feed().page())
+readiness.add("letter_store", get_letter_jobs)
+readiness.add("session_db", lambda: chat.sessions.db and chat.sessions.db.count())
+readiness.add("master_agent", get_master_agent)
+# Need OPENROUTER_API_KEY / SMTP credentials: warmed when configured, but never gate /ready
+readiness.add("llm_client", lambda: get_master_agent().sales_agent, critical=False)
+readiness.add("otp_delivery", lambda: get_master_agent().otp_dispatcher, critical=False)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    readiness.start()
+    yield
+    # Release pooled keep-alive connections to OpenRouter and persist cached AI answers.
+    # Only singletons that were actually built are closed; building one here would just slow shutdown.
+    readiness.stop(timeout=10)
+    if master_agent_module._agent is not None:
+        await master_agent_module._agent.aclose()
+    if letter_jobs_module._jobs is not None:
+        letter_jobs_module._jobs.shutdown()
+    chat.sessions.close()  # commits any queued session writes
+    if audit_log_module._audit is not None:
+        audit_log_module._audit.shutdown()  # drains and fsyncs queued audit events
+
+
+app = FastAPI(title="CapitalMitra Backend API", lifespan=lifespan)
 
 # --- 1️⃣ CORS Setup ---
 app.add_middleware(
@@ -14,6 +63,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# --- Request metrics (labelled by route template, not raw path, to bound cardinality) ---
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    t0 = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = getattr(request.scope.get("route"), "path", "unmatched")
+        HTTP_LATENCY.observe(time.perf_counter() - t0, method=request.method, route=route)
+        HTTP_REQUESTS.inc(method=request.method, route=route, status=status)
+
 # --- 2️⃣ Mount Static Folder ---
 app.mount("/static", StaticFiles(directory="backend/static"), name="static")
 
@@ -22,8 +85,18 @@ app.include_router(chat.router)
 app.include_router(upload.router)
 app.include_router(sanction.router)
 app.include_router(offer.router)
+app.include_router(underwrite.router)
+app.include_router(amortization.router)
+app.include_router(metrics.router)
 
 # --- 4️⃣ Root Endpoint ---
 @app.get("/")
 def home():
-    return {"message": "✅ CapitalMitra backend is running successfully!"}
\ No newline at end of file
+    return {"message": "✅ CapitalMitra backend is running successfully!"}
+
+
+@app.get("/ready")
+def ready():
+    """Readiness probe: 200 once every critical warm-up step has succeeded, 503 (with per-step detail) until then."""
+    report = readiness.report()
+    return JSONResponse(report, status_code=200 if report["ready"] else 503)
@@ -1,4 +1,7 @@
 from .chat import router as chat_router
 from .upload import router as upload_router
 from .sanction import router as sanction_router
-from .offer import router as offer_router
\ No newline at end of file
+from .offer import router as offer_router
+from .underwrite import router as underwrite_router
+from .amortization import router as amortization_router
+from .metrics import router as metrics_router
\ No newline at end of file
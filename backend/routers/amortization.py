@@ -0,0 +1,78 @@
+from fastapi import APIRouter, HTTPException
+import numpy as np
+
+from backend.services.amortization import emi_array, schedule
+
+router = APIRouter(prefix="/amortization", tags=["Amortization"])
+
+MAX_TENURE = 480
+MAX_BATCH = 100000
+
+
+def _terms(loan, where: str = "") -> tuple[float, float, int]:
+    """(principal, rate, tenure) from a loan dict, or 422 if any is missing or out of range."""
+    try:
+        principal, rate, tenure = float(loan["principal"]), float(loan["rate"]), int(loan["tenure"])
+    except (KeyError, TypeError, ValueError):
+        raise HTTPException(status_code=422, detail=f"{where}Need numeric principal, rate and tenure.")
+    if not principal > 0 or not rate >= 0 or not 1 <= tenure <= MAX_TENURE:
+        raise HTTPException(status_code=422, detail=f"{where}Need principal > 0, rate >= 0 and 1-{MAX_TENURE} months.")
+    return principal, rate, tenure
+
+
+def _by_month(events, name: str, tenure: int, positive: bool) -> dict[int, float]:
+    """{month: value} from a prepayments/rate_resets map, or 422 on a bad month or value."""
+    if events is None:
+        return {}
+    if not isinstance(events, dict):
+        raise HTTPException(status_code=422, detail=f"{name} must map month to a number.")
+    try:
+        parsed = {int(month): float(value) for month, value in events.items()}
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=422, detail=f"{name}: need integer months and numeric values.")
+    bound = "> 0" if positive else ">= 0"
+    for month, value in parsed.items():
+        if not 1 <= month <= tenure or not (value > 0 if positive else value >= 0):
+            raise HTTPException(status_code=422, detail=f"{name}: need months 1-{tenure} and values {bound}.")
+    return parsed
+
+
+@router.post("/schedule")
+def repayment_schedule(request: dict):
+    """
+    Month-by-month schedule for one loan.
+    Body: {"principal", "rate", "tenure", "prepayments": {month: amount}, "rate_resets": {month: rate},
+    "keep": "emi" | "tenure"} — after a prepayment or reset, keep the EMI (shorter loan) or the end date.
+    Months must fall within the tenure, prepayments must be > 0 and rates >= 0 (422 otherwise).
+    """
+    principal, rate, tenure = _terms(request)
+    keep = request.get("keep", "emi")
+    if keep not in ("emi", "tenure"):
+        raise HTTPException(status_code=422, detail="keep must be 'emi' or 'tenure'.")
+    prepayments = _by_month(request.get("prepayments"), "prepayments", tenure, positive=True)
+    rate_resets = _by_month(request.get("rate_resets"), "rate_resets", tenure, positive=False)
+    return schedule(principal, rate, tenure, prepayments, rate_resets, keep)
+
+
+@router.post("/batch")
+def batch_summary(request: dict):
+    """
+    EMI and total interest for many plain loans at once.
+    Body: {"loans": [{"principal", "rate", "tenure"}, ...]}
+    Closed form (total interest = EMI × tenure − principal), so no N×T schedule is built.
+    """
+    loans = request.get("loans", [])
+    if not isinstance(loans, list):
+        raise HTTPException(status_code=422, detail="loans must be a list.")
+    if len(loans) > MAX_BATCH:
+        raise HTTPException(status_code=422, detail=f"At most {MAX_BATCH:,} loans per request.")
+    terms = np.array([_terms(loan, f"loans[{i}]: ") for i, loan in enumerate(loans)], dtype=float).reshape(-1, 3)
+    principals, rates, tenures = terms.T
+    emis = emi_array(principals, rates, tenures)
+    total_interest = emis * tenures - principals
+    return {
+        "loans": [
+            {"emi": round(e, 2), "total_interest": round(t, 2)}
+            for e, t in zip(emis.tolist(), total_interest.tolist())
+        ]
+    }
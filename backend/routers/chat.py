@@ -1,11 +1,283 @@
-from fastapi import APIRouter
-from backend.agents.master_agent import MasterAgent
+import asyncio
+import json
+import os
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import APIRouter, Cookie, Header, HTTPException, Query, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from backend.agents.master_agent import get_master_agent
+from backend.services.event_bus import get_event_bus
+from backend.services.session_store import SessionStore
 
 router = APIRouter(prefix="/chat", tags=["Chat"])
-agent = MasterAgent()
+
+# One shared agent (stateless sub-agents, built on first use), one isolated record per applicant
+sessions = SessionStore()
+
+SESSION_HEADER = "X-Session-ID"
+SESSION_COOKIE = "cm_session"
+
+# WebSocket transport. Serve it with `uvicorn --ws-per-message-deflate false`: frames are
+# small JSON and per-socket zlib contexts would cost ~300 KB per idle connection.
+WS_HEARTBEAT = float(os.getenv("WS_HEARTBEAT_SECONDS", 25))  # ping an otherwise silent socket this often
+WS_IDLE_TIMEOUT = float(os.getenv("WS_IDLE_SECONDS", 300))  # close after this long without a client frame
+WS_SEND_TIMEOUT = float(os.getenv("WS_SEND_TIMEOUT_SECONDS", 10))  # a client this far behind is dropped
+WS_MAX_MESSAGE = int(os.getenv("WS_MAX_MESSAGE_BYTES", 4096))
+
+
+def _run_turn(session, message):
+    with session.lock:
+        sessions.sync(session)  # another worker may have handled the previous turn
+        return _process(session, message)
+
+
+def _process(session, message):
+    """One structured-flow turn, persisted (caller holds session.lock)."""
+    reply = get_master_agent().process_message(message, session)
+    sessions.save(session)
+    return reply
+
+
+def _remember(session, question, answer):
+    """Record a streamed AI answer, persisted (caller holds session.lock)."""
+    get_master_agent().remember_exchange(session, question, answer)
+    sessions.save(session)
+
+
+@asynccontextmanager
+async def _turn_lock(session):
+    """
+    Hold session.lock for a whole async turn, so it excludes /chat/ turns and other
+    streams on the same session. Acquired on a worker thread to keep the event loop free.
+    """
+    acquiring = asyncio.ensure_future(run_in_threadpool(session.lock.acquire))
+    try:
+        await asyncio.shield(acquiring)
+    except asyncio.CancelledError:
+        # The worker thread may still get the lock after we stop waiting; hand it straight back
+        acquiring.add_done_callback(lambda f: _release_if_acquired(session, f))
+        raise
+    try:
+        yield
+    finally:
+        session.lock.release()
+
+
+def _release_if_acquired(session, future):
+    if not future.cancelled() and future.exception() is None:
+        session.lock.release()
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def _turn_events(session, message):
+    """
+    One chat turn as (event, data) pairs, shared by the SSE and WebSocket transports:
+    `token` pieces while an AI answer is generated, then `done` with the same body
+    /chat/ would have returned. Structured flow replies arrive whole. The session is
+    locked from the sync until the answer is saved, as _run_turn locks a /chat/ turn.
+    """
+    agent = get_master_agent()
+    async with _turn_lock(session):
+        await run_in_threadpool(sessions.sync, session)  # another worker may have handled the previous turn
+        if agent.routes_to_ai(session, message):
+            from backend.agents.sales_agent import FallbackReply  # loaded with agent.sales_agent, not at startup
+
+            with agent.flow.timed("AI"):
+                tokens, fallback = [], False
+                context, personalized = agent.ai_context(session)
+                text = (message or "").strip()
+                stream = agent.sales_agent.stream_offer(
+                    text, context=context, personalized=personalized, transcript=session.transcript,
+                    fallback=agent.ai_fallback(session, text),
+                )
+                async for token in stream:
+                    fallback = fallback or isinstance(token, FallbackReply)
+                    tokens.append(token)
+                    yield "token", {"token": token}
+                reply = {"message": agent.sales_agent.polish_reply("".join(tokens))}
+                if fallback:
+                    reply["fallback"] = True
+                else:
+                    await run_in_threadpool(_remember, session, text, reply["message"])
+        else:
+            reply = await run_in_threadpool(_process, session, message)
+    yield "done", {**reply, "session_id": session.session_id}
+
 
 @router.post("/")
-def chat_with_user(request: dict):
-    user_message = request.get("message")
-    response = agent.process_message(user_message)
-    return response
\ No newline at end of file
+def chat_with_user(
+    request: dict,
+    response: Response,
+    x_session_id: str | None = Header(None),
+    cm_session: str | None = Cookie(None),
+):
+    session = sessions.get_or_create(x_session_id or cm_session)
+    reply = _run_turn(session, request.get("message"))
+
+    response.headers[SESSION_HEADER] = session.session_id
+    response.set_cookie(SESSION_COOKIE, session.session_id, httponly=True, samesite="lax")
+    return {**reply, "session_id": session.session_id}
+
+
+@router.post("/stream")
+async def chat_stream(
+    request: dict,
+    x_session_id: str | None = Header(None),
+    cm_session: str | None = Cookie(None),
+):
+    """
+    Server-Sent Events variant of /chat/.
+    AI answers arrive as `token` events while the model generates them; structured
+    flow replies arrive whole. Every stream ends with one `done` event carrying the
+    same body /chat/ would have returned.
+    """
+    session = await run_in_threadpool(sessions.get_or_create, x_session_id or cm_session)  # SQLite read
+    message = request.get("message")
+
+    async def events():
+        async for event, data in _turn_events(session, message):
+            yield _sse(event, data)
+
+    headers = {SESSION_HEADER: session.session_id, "Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    response = StreamingResponse(events(), media_type="text/event-stream", headers=headers)
+    response.set_cookie(SESSION_COOKIE, session.session_id, httponly=True, samesite="lax")
+    return response
+
+
+@router.websocket("/ws")
+async def chat_socket(websocket: WebSocket, session_id: str | None = Query(None), cm_session: str | None = Cookie(None)):
+    """
+    Long-lived chat over one WebSocket, bound to a conversation session
+    (?session_id=..., else the cm_session cookie, else a new one).
+
+    Client → server: {"type": "message", "message": "..."} (a bare text frame works
+    too), {"type": "ping"} and {"type": "pong"}.
+    Server → client: {"type": "session"} on connect, then per turn `token` frames and
+    one `reply` frame with the /chat/ body; pushed {"type": "otp"} / {"type": "letter"}
+    events when a delivery or render finishes; `ping` heartbeats and `error` frames.
+    """
+    await websocket.accept()
+    session = await run_in_threadpool(sessions.get_or_create, session_id or cm_session)  # SQLite read
+    await _Socket(websocket, session).run()
+
+
+class _Socket:
+    """
+    One WebSocket conversation. Turns are handled one at a time as they are read, so a
+    client that floods messages is slowed by TCP rather than queued in memory; pushed
+    events wait for the turn in progress so they always follow its reply. An idle
+    connection costs one pending receive and one heartbeat task.
+    """
+
+    def __init__(self, websocket: WebSocket, session):
+        self.ws = websocket
+        self.session = session
+        self.bus = get_event_bus()
+        self.subscription = None
+        self.turn = asyncio.Lock()
+        self.send_lock = asyncio.Lock()
+        self.last_seen = time.monotonic()
+
+    async def run(self):
+        self._subscribe()
+        pusher = asyncio.create_task(self._push())
+        try:
+            await self.send({"type": "session", "session_id": self.session.session_id, "state": self.session.state})
+            while True:
+                frame = await self.ws.receive()
+                if frame["type"] == "websocket.disconnect":
+                    return
+                self.last_seen = time.monotonic()
+                text = frame.get("text")
+                if text is None or len(text) > WS_MAX_MESSAGE:
+                    await self.ws.close(code=1009 if text else 1003)
+                    return
+                await self._handle(text)
+        except (WebSocketDisconnect, RuntimeError, asyncio.TimeoutError):
+            pass  # client went away, or stopped reading (send timeout)
+        finally:
+            pusher.cancel()
+            self.bus.unsubscribe(self.subscription)
+
+    async def send(self, frame: dict):
+        async with self.send_lock:
+            await asyncio.wait_for(self.ws.send_text(json.dumps(frame, ensure_ascii=False)), WS_SEND_TIMEOUT)
+
+    async def _handle(self, text: str):
+        try:
+            frame = json.loads(text)
+        except ValueError:
+            frame = {"type": "message", "message": text}
+        if not isinstance(frame, dict):
+            frame = {"type": "message", "message": str(frame)}
+
+        kind = frame.get("type", "message")
+        if kind == "ping":
+            await self.send({"type": "pong"})
+        elif kind == "message":
+            async with self.turn:
+                await self._resume()
+                try:
+                    async for event, data in _turn_events(self.session, frame.get("message")):
+                        await self.send({"type": "reply" if event == "done" else event, **data})
+                except (WebSocketDisconnect, asyncio.TimeoutError):
+                    raise
+                except Exception:
+                    # Same outcome as a 500 on /chat/, without dropping the connection
+                    await self.send({"type": "error", "detail": "Something went wrong handling that message."})
+        elif kind != "pong":
+            await self.send({"type": "error", "detail": f"Unknown frame type: {kind}"})
+
+    async def _resume(self):
+        """Re-resolve the session before each turn: it may have expired while the socket sat idle."""
+        session = await run_in_threadpool(sessions.get_or_create, self.session.session_id)
+        if session is not self.session:
+            self.bus.unsubscribe(self.subscription)
+            self.session = session
+            self._subscribe()  # the reply carries the new session_id
+
+    def _subscribe(self):
+        self.subscription = self.bus.subscribe(self.session.session_id)
+
+    async def _push(self):
+        """Forward pushed events; ping when quiet and close the socket once idle too long."""
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(self.subscription.get(), WS_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    if time.monotonic() - self.last_seen > WS_IDLE_TIMEOUT:
+                        await self.ws.close(code=1001, reason="idle")
+                        return
+                    await self.send({"type": "ping"})
+                    continue
+                async with self.turn:
+                    await self.send(event)
+        except (WebSocketDisconnect, RuntimeError, asyncio.TimeoutError):
+            await self._abort()
+
+    async def _abort(self):
+        try:
+            await self.ws.close(code=1011)
+        except RuntimeError:
+            pass  # already closed
+
+
+@router.get("/otp-status")
+def otp_status(x_session_id: str | None = Header(None), cm_session: str | None = Cookie(None)):
+    """Delivery status of the session's latest OTP: queued, sending, retrying, sent or failed."""
+    session = sessions.get(x_session_id or cm_session or "")
+    if session is None or session.otp_job is None:
+        raise HTTPException(status_code=404, detail="No OTP has been requested in this session.")
+    return get_master_agent().otp_dispatcher.status(session.otp_job) or {"status": "unknown"}
+
+
+@router.get("/flow/stats")
+def flow_stats():
+    """Turns handled and handler latency per conversation state."""
+    return get_master_agent().flow.stats.snapshot()
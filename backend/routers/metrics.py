@@ -0,0 +1,78 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from backend.agents.master_agent import get_master_agent
+from backend.data.customer_store import get_customer_store
+from backend.routers.chat import sessions as _sessions
+from backend.services.audit_log import get_audit_log
+from backend.services.credit_bureau import get_credit_bureau
+from backend.services.customer_feed import get_customer_feed
+from backend.services.letter_jobs import get_letter_jobs
+from backend.services.llm_guard import STATE_CODES
+from backend.services.metrics import REGISTRY
+
+router = APIRouter(tags=["Metrics"])
+
+# ==============================
+# SCRAPE-TIME GAUGES
+# ==============================
+# Read straight from the live components, so the numbers cost nothing between scrapes
+
+
+def _built(attr: str):
+    """A lazily-built agent collaborator; raises KeyError (series omitted) rather than building it for a scrape."""
+    return get_master_agent().__dict__[attr]
+
+
+_jobs, _audit = get_letter_jobs, get_audit_log
+
+for name, help, fn, kind in (
+    ("capitalmitra_sessions_active", "Conversation sessions held in memory.", lambda: len(_sessions), "gauge"),
+    ("capitalmitra_sessions_evicted", "Sessions dropped for capacity.", lambda: _sessions.evicted, "counter"),
+    ("capitalmitra_sessions_expired", "Sessions dropped after idling past the TTL.", lambda: _sessions.expired, "counter"),
+    ("capitalmitra_sessions_persisted", "Live sessions in the shared session database.", lambda: _sessions.db.count(), "gauge"),
+    ("capitalmitra_session_db_writes", "Session rows written by this worker.", lambda: _sessions.db.writes, "counter"),
+    ("capitalmitra_session_db_commits", "Group commits issued by this worker.", lambda: _sessions.db.commits, "counter"),
+    ("capitalmitra_session_loads", "Sessions read from the database into this worker's cache.", lambda: _sessions.loads, "counter"),
+    ("capitalmitra_otp_queue_depth", "OTP deliveries waiting for a worker.", lambda: _built("otp_dispatcher").queue_depth(), "gauge"),
+    ("capitalmitra_otp_sent", "OTPs delivered.", lambda: _built("otp_dispatcher").sent, "counter"),
+    ("capitalmitra_otp_failed", "OTPs that exhausted their retries.", lambda: _built("otp_dispatcher").failed, "counter"),
+    ("capitalmitra_letter_jobs_pending", "Sanction letters queued or rendering.", lambda: _jobs().pending(), "gauge"),
+    ("capitalmitra_letter_renders", "Sanction letters rendered.", lambda: _jobs().renders, "counter"),
+    ("capitalmitra_letter_reused", "Letter requests answered by a cached or in-flight render.", lambda: _jobs().reused, "counter"),
+    ("capitalmitra_letter_store_memory_bytes", "Letter bytes held in memory.", lambda: _jobs().store.stats()["memory_bytes"], "gauge"),
+    ("capitalmitra_letter_store_disk_bytes", "Letter bytes on disk.", lambda: _jobs().store.stats()["disk_bytes"], "gauge"),
+    ("capitalmitra_ai_cache_entries", "Cached AI answers.", lambda: _built("sales_agent").cache.stats()["entries"], "gauge"),
+    ("capitalmitra_ai_cache_hits", "AI questions answered from the cache.", lambda: _built("sales_agent").cache.hits, "counter"),
+    ("capitalmitra_ai_cache_misses", "AI questions sent to the model.", lambda: _built("sales_agent").cache.misses, "counter"),
+    ("capitalmitra_ai_cache_bypassed", "Personalized AI questions that skipped the cache.", lambda: _built("sales_agent").cache.bypassed, "counter"),
+    ("capitalmitra_llm_breaker_state", "LLM circuit breaker: 0 closed, 1 half-open, 2 open.", lambda: STATE_CODES[_built("sales_agent").llm.breaker.state], "gauge"),
+    ("capitalmitra_llm_breaker_trips", "Times the LLM circuit breaker opened.", lambda: _built("sales_agent").llm.breaker.trips, "counter"),
+    ("capitalmitra_llm_rejected", "AI questions answered from a template while the circuit was open.", lambda: _built("sales_agent").llm.breaker.rejected, "counter"),
+    ("capitalmitra_llm_timeouts", "AI calls that ran out of latency budget.", lambda: _built("sales_agent").llm.timeouts, "counter"),
+    ("capitalmitra_llm_errors", "AI calls where every attempt failed.", lambda: _built("sales_agent").llm.errors, "counter"),
+    ("capitalmitra_llm_hedged", "AI calls that also went to the hedge model.", lambda: _built("sales_agent").llm.hedged, "counter"),
+    ("capitalmitra_llm_hedge_wins", "Hedged AI calls answered by the hedge model first.", lambda: _built("sales_agent").llm.hedge_wins, "counter"),
+    ("capitalmitra_audit_queue_depth", "Audit events waiting for the writer.", lambda: _audit().queue_depth(), "gauge"),
+    ("capitalmitra_audit_written", "Audit events written to disk.", lambda: _audit().written, "counter"),
+    ("capitalmitra_audit_dropped", "Audit events dropped because the queue was full.", lambda: _audit().dropped, "counter"),
+    ("capitalmitra_audit_write_errors", "Audit log writes that failed and were retried.", lambda: _audit().write_errors, "counter"),
+    ("capitalmitra_customer_data_reloads", "Customer data reloads after a file change.", lambda: get_customer_store().reloads, "counter"),
+    ("capitalmitra_customer_snapshot_mapped", "1 while customer data is served from the compiled snapshot.", lambda: int(get_customer_store().snapshot is not None), "gauge"),
+    ("capitalmitra_bureau_cache_entries", "Credit scores cached from the bureau.", lambda: get_credit_bureau().stats()["entries"], "gauge"),
+    ("capitalmitra_bureau_cache_hits", "Credit score lookups answered from the cache.", lambda: get_credit_bureau().hits, "counter"),
+    ("capitalmitra_bureau_cache_misses", "Credit score lookups that needed the bureau.", lambda: get_credit_bureau().misses, "counter"),
+    ("capitalmitra_bureau_cache_hit_ratio", "Share of credit score lookups answered from the cache.", lambda: get_credit_bureau().stats()["hit_rate"], "gauge"),
+    ("capitalmitra_bureau_coalesced", "Lookups that waited on another request's bureau call.", lambda: get_credit_bureau().coalesced, "counter"),
+    ("capitalmitra_bureau_requests", "Bureau round trips (single or bulk).", lambda: get_credit_bureau().fetches, "counter"),
+    ("capitalmitra_bureau_no_hits", "Customers the bureau holds no file on.", lambda: get_credit_bureau().no_hits, "counter"),
+    ("capitalmitra_bureau_errors", "Failed bureau round trips.", lambda: get_credit_bureau().errors, "counter"),
+    ("capitalmitra_offer_feed_hits", "Offer listing pages served from cache.", lambda: get_customer_feed().hits, "counter"),
+    ("capitalmitra_offer_feed_misses", "Offer listing pages built.", lambda: get_customer_feed().misses, "counter"),
+):
+    REGISTRY.callback(name, help, fn, kind)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Prometheus text exposition of request, state, dependency and queue metrics."""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
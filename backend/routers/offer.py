@@ -1,10 +1,83 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import Response, StreamingResponse
+from backend.services.customer_feed import get_customer_feed
+from backend.services.offer_engine import get_offer_engine
 import json
 
 router = APIRouter(prefix="/offer", tags=["Offer"])
 
 @router.get("/")
-def get_offers():
-    with open("data/customers.json") as f:
-        data = json.load(f)
-    return data
\ No newline at end of file
+def get_offers(
+    limit: int | None = None,
+    cursor: str | None = None,
+    fields: str | None = None,
+    city: str | None = None,
+    employment_type: str | None = None,
+    company: str | None = None,
+    if_none_match: str | None = Header(None),
+    accept_encoding: str | None = Header(None),
+):
+    """
+    Customer listing, served from a pre-serialized, pre-compressed page cache.
+    `fields=name,city` projects columns; city / employment_type / company filter rows;
+    follow `next_cursor` for the next page. Supports If-None-Match (304) and gzip.
+    """
+    args = {
+        "limit": limit,
+        "cursor": cursor,
+        "fields": [f.strip() for f in fields.split(",") if f.strip()] if fields else None,
+        "filters": {"city": city, "employment_type": employment_type, "company": company},
+    }
+    gz = "gzip" in (accept_encoding or "")
+    try:
+        etag = get_customer_feed().etag(**args)
+        if gz:
+            etag = etag[:-1] + '-gzip"'  # each encoding is its own representation
+        headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+        if if_none_match and etag in [t.strip() for t in if_none_match.split(",")]:
+            return Response(status_code=304, headers=headers)
+        page = get_customer_feed().page(**args)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if gz:
+        headers["Content-Encoding"] = "gzip"
+        return Response(page.gzipped, media_type="application/json", headers=headers)
+    return Response(page.body, media_type="application/json", headers=headers)
+
+
+@router.get("/cache/stats")
+def offer_feed_stats():
+    """Customer listing cache version, hit rate and rebuild count."""
+    return get_customer_feed().stats()
+
+
+@router.get("/catalogue")
+def offer_catalogue():
+    """Offers with their eligibility text compiled into structured rules."""
+    return [rule.describe() for rule in get_offer_engine().rules()]
+
+
+@router.get("/match/{customer_id}")
+def match_offers(customer_id: str, amount: int | None = None, limit: int | None = None):
+    """Ranked eligible offers for one customer (lowest rate first)."""
+    offers = get_offer_engine().match_customer(customer_id, amount, limit)
+    if offers is None:
+        raise HTTPException(status_code=404, detail="Unknown customer.")
+    return {"customer_id": customer_id, "offers": offers}
+
+
+@router.post("/match/batch")
+def match_offers_batch(request: dict):
+    """
+    Campaign matching. Body: {"customer_ids": [...] | "all", "amount": optional, "limit": optional}.
+    Streams newline-delimited JSON, one {"customer_id", "offers"} row per customer.
+    With "summary": true, returns per-offer audience counts instead.
+    """
+    ids = request.get("customer_ids", "all")
+    ids = None if ids == "all" else ids
+    if request.get("summary"):
+        return get_offer_engine().audience(ids, request.get("amount"))
+    rows = get_offer_engine().match_all(ids, request.get("amount"), request.get("limit"))
+    lines = (json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+    return StreamingResponse(lines, media_type="application/x-ndjson")
@@ -1,7 +1,70 @@
-from fastapi import APIRouter
+import os
+import re
+
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import JSONResponse, Response
+from backend.services.letter_jobs import get_letter_jobs
 
 router = APIRouter(prefix="/sanction", tags=["Sanction"])
 
+# How long a download request may wait for a letter that is still rendering
+DOWNLOAD_WAIT_SECONDS = float(os.getenv("LETTER_DOWNLOAD_WAIT", 10))
+
+_RANGE = re.compile(r"bytes=(\d*)-(\d*)$")
+
+
+def _letter_response(key: str, if_none_match: str | None, range_header: str | None) -> Response:
+    """Serve letter bytes from the store with strong ETag and single-range support."""
+    etag = f'"{key}"'
+    headers = {"ETag": etag, "Accept-Ranges": "bytes", "Cache-Control": "private, max-age=31536000, immutable"}
+    if if_none_match and etag in [t.strip() for t in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+
+    data = get_letter_jobs().store.get(key)
+    if data is None:
+        raise HTTPException(status_code=404, detail="Letter not found.")
+    headers["Content-Disposition"] = f'inline; filename="sanction_letter_{key[:12]}.pdf"'
+
+    m = _RANGE.match(range_header or "")
+    if m and (m.group(1) or m.group(2)):
+        size = len(data)
+        if m.group(1):
+            start = int(m.group(1))
+            end = min(int(m.group(2)), size - 1) if m.group(2) else size - 1
+        else:
+            start, end = max(size - int(m.group(2)), 0), size - 1  # suffix range: last N bytes
+        if start > end or start >= size:
+            return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        return Response(data[start:end + 1], status_code=206, media_type="application/pdf", headers=headers)
+    return Response(data, media_type="application/pdf", headers=headers)
+
+
 @router.get("/")
 def get_sanction_letter():
-    return {"link": "/static/letters/sanction_letter.pdf"}
\ No newline at end of file
+    return {"link": "/static/letters/sanction_letter.pdf"}
+
+@router.get("/cache/stats")
+def letter_cache_stats():
+    """Letter cache hit rate, renders and memory/disk usage."""
+    return get_letter_jobs().stats()
+
+@router.get("/jobs/{job_id}")
+def letter_job_status(job_id: str):
+    job = get_letter_jobs().status(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown letter job.")
+    if job["status"] == "done":
+        job["link"] = f"/sanction/jobs/{job_id}/download"
+    return job
+
+@router.get("/jobs/{job_id}/download")
+async def download_letter(job_id: str, if_none_match: str | None = Header(None), range: str | None = Header(None)):
+    job = await get_letter_jobs().wait(job_id, DOWNLOAD_WAIT_SECONDS)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown letter job.")
+    if job["status"] == "failed":
+        raise HTTPException(status_code=500, detail=f"Letter rendering failed: {job['error']}")
+    if job["status"] != "done":
+        return JSONResponse(job, status_code=202, headers={"Retry-After": "1"})
+    return _letter_response(job["key"], if_none_match, range)
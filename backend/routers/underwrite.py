@@ -0,0 +1,63 @@
+import itertools
+import json
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from backend.services.batch_underwriting import BatchUnderwriter
+
+router = APIRouter(prefix="/underwrite", tags=["Underwriting"])
+underwriter = BatchUnderwriter()
+
+
+@router.post("/batch")
+def underwrite_batch(request: dict):
+    """
+    Evaluate many (customer, amount, tenure) applications in one call.
+
+    Body is either {"items": [{"customer_id", "amount", "tenure"}, ...]} or a
+    campaign grid {"grid": {"customer_ids": [...] | "all", "amounts": [...], "tenures": [...]}}
+    whose cartesian product is evaluated. Optional "base_rate" defaults to 10.95.
+    Results stream back as newline-delimited JSON, one decision per application.
+    The body's shape is checked before streaming starts (422); an application that
+    cannot be underwritten comes back as a {"status": "invalid", "reason"} row.
+    """
+    base_rate = _base_rate(request)
+    if "items" in request:
+        items = request["items"]
+        if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+            raise HTTPException(status_code=422, detail="items must be a list of objects.")
+    elif "grid" in request:
+        ids, amounts, tenures = _grid(request["grid"])
+        if ids == "all":
+            ids = [c["customer_id"] for c in underwriter.store.customers()]
+        items = (
+            {"customer_id": cid, "amount": amt, "tenure": ten}
+            for cid, amt, ten in itertools.product(ids, amounts, tenures)
+        )
+    else:
+        raise HTTPException(status_code=422, detail="Provide either 'items' or 'grid'.")
+
+    lines = (json.dumps(d, ensure_ascii=False) + "\n" for d in underwriter.evaluate(items, base_rate))
+    return StreamingResponse(lines, media_type="application/x-ndjson")
+
+
+def _base_rate(request) -> float:
+    try:
+        base_rate = float(request.get("base_rate", 10.95))
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=422, detail="base_rate must be a number.")
+    if not 0 <= base_rate < 100:
+        raise HTTPException(status_code=422, detail="base_rate must be between 0 and 100.")
+    return base_rate
+
+
+def _grid(grid) -> tuple:
+    """(customer_ids, amounts, tenures) from a campaign grid, or 422 if it is malformed."""
+    if not isinstance(grid, dict):
+        raise HTTPException(status_code=422, detail="grid must be an object.")
+    ids, amounts, tenures = grid.get("customer_ids", "all"), grid.get("amounts", []), grid.get("tenures", [36])
+    if ids != "all" and not isinstance(ids, list):
+        raise HTTPException(status_code=422, detail="grid.customer_ids must be a list or \"all\".")
+    if not isinstance(amounts, list) or not isinstance(tenures, list):
+        raise HTTPException(status_code=422, detail="grid.amounts and grid.tenures must be lists.")
+    return ids, amounts, tenures
@@ -1,12 +1,171 @@
-from fastapi import APIRouter, File, UploadFile
+from contextlib import suppress
+from fastapi import APIRouter, HTTPException, Request
+from pathlib import Path
+import hashlib
 import os
+import secrets
+
+import aiofiles
+import aiofiles.os
+
+try:
+    from python_multipart.exceptions import MultipartParseError
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ModuleNotFoundError:  # python-multipart < 0.0.13
+    from multipart.exceptions import MultipartParseError
+    from multipart.multipart import MultipartParser, parse_options_header
 
 router = APIRouter(prefix="/upload", tags=["Upload"])
 
-@router.post("/")
-async def upload_document(file: UploadFile = File(...)):
-    os.makedirs("static/uploads", exist_ok=True)
-    path = f"static/uploads/{file.filename}"
-    with open(path, "wb") as f:
-        f.write(await file.read())
-    return {"message": "File uploaded successfully", "path": path}
\ No newline at end of file
+UPLOAD_DIR = Path(__file__).resolve().parent.parent / "static" / "uploads"
+MAX_UPLOAD_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", 10 * 1024 * 1024))
+MAX_BODY_BYTES = MAX_UPLOAD_BYTES + 64 * 1024  # allow for multipart framing and small fields
+FIELD = "file"
+
+TOO_LARGE = f"File exceeds the {MAX_UPLOAD_BYTES:,}-byte limit."
+OPENAPI_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {"multipart/form-data": {"schema": {
+            "type": "object",
+            "required": [FIELD],
+            "properties": {FIELD: {"type": "string", "format": "binary"}},
+        }}},
+    }
+}
+
+
+def _extension(filename: str | None) -> str:
+    suffix = Path(filename or "").suffix.lower()
+    return suffix if suffix[1:].isalnum() and len(suffix) <= 8 else ""
+
+
+class _FilePart:
+    """
+    MultipartParser callbacks that keep the bytes of the `file` field and drop every
+    other part. The parser calls back synchronously; `drain()` hands over what the
+    last `write` produced so it can be written to disk asynchronously.
+    """
+
+    __slots__ = ("filename", "pending", "_capture", "_field", "_value", "_headers")
+
+    def __init__(self):
+        self.filename = None  # set once the file part's headers have been read
+        self.pending = []
+        self._capture = False
+        self._field = self._value = b""
+        self._headers = {}
+
+    def callbacks(self) -> dict:
+        return {
+            "on_part_begin": self._part_begin,
+            "on_header_field": self._header_field,
+            "on_header_value": self._header_value,
+            "on_header_end": self._header_end,
+            "on_headers_finished": self._headers_finished,
+            "on_part_data": self._part_data,
+            "on_part_end": self._part_end,
+        }
+
+    def drain(self) -> list:
+        data, self.pending = self.pending, []
+        return data
+
+    def _part_begin(self):
+        self._headers = {}
+
+    def _header_field(self, data, start, end):
+        self._field += data[start:end]
+
+    def _header_value(self, data, start, end):
+        self._value += data[start:end]
+
+    def _header_end(self):
+        self._headers[self._field.lower()] = self._value
+        self._field = self._value = b""
+
+    def _headers_finished(self):
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        name = options.get(b"name", b"").decode("latin-1")
+        # Only the first `file` part is stored
+        self._capture = name == FIELD and self.filename is None and b"filename" in options
+        if self._capture:
+            self.filename = options[b"filename"].decode("utf-8", "replace")
+
+    def _part_data(self, data, start, end):
+        if self._capture:
+            self.pending.append(bytes(data[start:end]))
+
+    def _part_end(self):
+        self._capture = False
+
+
+@router.post("/", openapi_extra=OPENAPI_BODY)
+async def upload_document(request: Request):
+    """
+    Stream an uploaded document to disk in chunks, hashing it on the fly.
+    The multipart body is parsed as it arrives, so an oversized upload is cut off at
+    the limit whether or not it declares a Content-Length.
+    Documents are stored once per SHA-256 (`static/uploads/<sha256><ext>`), so
+    re-uploading the same file is detected and not written twice.
+    """
+    content_type, options = parse_options_header(request.headers.get("content-type", ""))
+    boundary = options.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise HTTPException(status_code=400, detail=f"Expected a multipart/form-data body with a '{FIELD}' field.")
+
+    # Reject obviously oversized bodies before reading anything
+    try:
+        declared = int(request.headers.get("content-length") or 0)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Malformed Content-Length header.")
+    if declared > MAX_BODY_BYTES:
+        raise HTTPException(status_code=413, detail=TOO_LARGE)
+
+    await aiofiles.os.makedirs(UPLOAD_DIR, exist_ok=True)
+    tmp = UPLOAD_DIR / f".{secrets.token_hex(8)}.part"
+    part = _FilePart()
+    parser = MultipartParser(boundary, part.callbacks())
+    sha = hashlib.sha256()
+    received = size = 0
+    try:
+        async with aiofiles.open(tmp, "wb") as out:
+            async for chunk in request.stream():
+                received += len(chunk)
+                if received > MAX_BODY_BYTES:
+                    raise HTTPException(status_code=413, detail=TOO_LARGE)
+                parser.write(chunk)
+                for data in part.drain():
+                    size += len(data)
+                    if size > MAX_UPLOAD_BYTES:
+                        raise HTTPException(status_code=413, detail=TOO_LARGE)
+                    sha.update(data)
+                    await out.write(data)
+            parser.finalize()
+        if part.filename is None:
+            raise HTTPException(status_code=400, detail=f"No '{FIELD}' field in the upload.")
+    except MultipartParseError as e:
+        with suppress(FileNotFoundError):
+            await aiofiles.os.remove(tmp)
+        raise HTTPException(status_code=400, detail=f"Malformed multipart body: {e}") from e
+    except BaseException:
+        with suppress(FileNotFoundError):
+            await aiofiles.os.remove(tmp)
+        raise
+
+    digest = sha.hexdigest()
+    dest = UPLOAD_DIR / f"{digest}{_extension(part.filename)}"
+    duplicate = await aiofiles.os.path.exists(dest)
+    if duplicate:
+        await aiofiles.os.remove(tmp)
+    else:
+        await aiofiles.os.replace(tmp, dest)
+
+    return {
+        "message": "Document already on file" if duplicate else "File uploaded successfully",
+        "path": f"static/uploads/{dest.name}",
+        "filename": part.filename,
+        "sha256": digest,
+        "size": size,
+        "duplicate": duplicate,
+    }
@@ -0,0 +1,162 @@
+# backend/services/amortization.py
+
+import numpy as np
+
+
+def emi(principal, annual_rate_percent, months):
+    """Equated monthly instalment for a fully amortizing loan (scalar)."""
+    r = (annual_rate_percent / 100.0) / 12.0
+    if r == 0:
+        return principal / months
+    return principal * r * (1 + r) ** months / ((1 + r) ** months - 1)
+
+
+def max_principal(max_emi, annual_rate_percent, months):
+    """Inverse of `emi`: the largest principal whose instalment is `max_emi` (scalar)."""
+    r = (annual_rate_percent / 100.0) / 12.0
+    if r == 0:
+        return max_emi * months
+    return max_emi * (1 - (1 + r) ** -months) / r
+
+
+def emi_array(principal, annual_rate_percent, months):
+    """Vectorized `emi`; arguments broadcast against each other."""
+    r = np.asarray(annual_rate_percent, dtype=float) / 100.0 / 12.0
+    months = np.asarray(months)
+    growth = (1 + r) ** months
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = principal * r * growth / (growth - 1)
+    return np.where(r == 0, principal / months, out)
+
+
+def amortize(principals, annual_rates, months):
+    """
+    Month-by-month schedules for N plain loans at once (closed form, no loop over time).
+
+    Returns a dict of arrays: `emi` (N,), and `interest`, `principal`, `balance`
+    (N×T, T = longest tenure). Months beyond a loan's own tenure are zero.
+    """
+    P = np.atleast_1d(np.asarray(principals, dtype=float))
+    R = np.broadcast_to(np.asarray(annual_rates, dtype=float), P.shape)
+    n = np.broadcast_to(np.asarray(months, dtype=np.int64), P.shape)
+    T = int(n.max()) if n.size else 0
+
+    r = (R / 1200.0)[:, None]
+    pay = emi_array(P, R, n)
+    k = np.arange(T + 1)[None, :]                       # 0..T
+    growth = (1 + r) ** k
+    with np.errstate(divide="ignore", invalid="ignore"):
+        annuity = np.where(r == 0, k, (growth - 1) / r)
+    balance = P[:, None] * growth - pay[:, None] * annuity  # balance after k payments
+    active = k <= n[:, None]
+    balance = np.where(active, np.maximum(balance, 0.0), 0.0)
+
+    opening, closing = balance[:, :-1], balance[:, 1:]
+    paid = np.arange(1, T + 1)[None, :] <= n[:, None]
+    interest = np.where(paid, opening * r, 0.0)
+    principal_part = np.where(paid, opening - closing, 0.0)
+    return {"emi": pay, "interest": interest, "principal": principal_part, "balance": closing}
+
+
+def simulate(principals, annual_rates, months, prepayments=None, rate_resets=None, keep="emi"):
+    """
+    Step N loans month by month (vectorized across loans) with part-prepayments and rate resets.
+
+    `prepayments` is an N×T array of extra principal paid at the end of each month and
+    `rate_resets` an N×T array of new annual rates (NaN = unchanged) taking effect from
+    that month. After a prepayment or reset, `keep="emi"` holds the instalment and
+    shortens the tenure; `keep="tenure"` re-amortizes the remaining balance over the
+    original end date (lower EMI). Schedules never run past the original end date, so
+    with `keep="emi"` a rate rise only raises the instalment as far as it must to
+    clear the loan by then.
+
+    Returns arrays `emi`, `interest`, `principal`, `prepayment`, `balance`, `rate` (N×T).
+    """
+    P = np.atleast_1d(np.asarray(principals, dtype=float))
+    rate = np.broadcast_to(np.asarray(annual_rates, dtype=float), P.shape).copy()
+    n = np.broadcast_to(np.asarray(months, dtype=np.int64), P.shape)
+    T = int(n.max()) if n.size else 0
+    N = len(P)
+
+    pre = np.zeros((N, T)) if prepayments is None else np.asarray(prepayments, dtype=float)
+    resets = np.full((N, T), np.nan) if rate_resets is None else np.asarray(rate_resets, dtype=float)
+
+    out = {key: np.zeros((N, T)) for key in ("emi", "interest", "principal", "prepayment", "balance", "rate")}
+    balance = P.copy()
+    pay = emi_array(P, rate, n)
+
+    for t in range(T):
+        reset = ~np.isnan(resets[:, t])
+        if reset.any():
+            rate[reset] = resets[reset, t]
+            remaining = np.maximum(n - t, 1)
+            needed = emi_array(balance, rate, remaining)
+            if keep == "emi":
+                needed = np.maximum(pay, needed)
+            pay = np.where(reset, needed, pay)
+
+        live = balance > 0.005
+        r = rate / 1200.0
+        interest = np.where(live, balance * r, 0.0)
+        due = np.where(live, np.minimum(pay, balance + interest), 0.0)  # final instalment clears the loan
+        principal_part = due - interest
+        balance = balance - principal_part
+
+        extra = np.minimum(np.where(live, pre[:, t], 0.0), balance)
+        balance = balance - extra
+        if keep == "tenure" and extra.any():
+            remaining = np.maximum(n - t - 1, 1)
+            pay = np.where(extra > 0, emi_array(balance, rate, remaining), pay)
+
+        out["emi"][:, t] = due
+        out["interest"][:, t] = interest
+        out["principal"][:, t] = principal_part
+        out["prepayment"][:, t] = extra
+        out["balance"][:, t] = np.maximum(balance, 0.0)
+        out["rate"][:, t] = rate
+    return out
+
+
+def schedule(principal, annual_rate_percent, months, prepayments: dict | None = None,
+             rate_resets: dict | None = None, keep: str = "emi") -> dict:
+    """
+    Full repayment schedule for one loan.
+    `prepayments` maps month number (1-based) → extra principal; `rate_resets` maps
+    month number → new annual rate effective from that month's instalment.
+    """
+    months = int(months)
+    if prepayments or rate_resets:
+        pre = np.zeros((1, months))
+        resets = np.full((1, months), np.nan)
+        for m, amount in (prepayments or {}).items():
+            if 1 <= int(m) <= months:
+                pre[0, int(m) - 1] += float(amount)
+        for m, new_rate in (rate_resets or {}).items():
+            if 1 <= int(m) <= months:
+                resets[0, int(m) - 1] = float(new_rate)
+        res = simulate([principal], [annual_rate_percent], [months], pre, resets, keep=keep)
+        instalments, prepaid = res["emi"][0], res["prepayment"][0]
+    else:
+        res = amortize([principal], [annual_rate_percent], [months])
+        instalments, prepaid = np.full(months, res["emi"][0]), np.zeros(months)
+
+    interest, principal_part, balance = res["interest"][0], res["principal"][0], res["balance"][0]
+    paid_months = int(np.count_nonzero(instalments > 0.005))
+    rows = [
+        {
+            "month": m + 1,
+            "emi": round(float(instalments[m]), 2),
+            "principal": round(float(principal_part[m]), 2),
+            "interest": round(float(interest[m]), 2),
+            "prepayment": round(float(prepaid[m]), 2),
+            "balance": round(float(balance[m]), 2),
+        }
+        for m in range(paid_months)
+    ]
+    return {
+        "emi": round(float(instalments[0]), 2) if months else 0.0,
+        "months": paid_months,
+        "total_interest": round(float(interest.sum()), 2),
+        "total_paid": round(float(instalments.sum() + prepaid.sum()), 2),
+        "schedule": rows,
+    }
@@ -0,0 +1,285 @@
+# backend/services/audit_log.py
+"""
+Append-only audit trail of loan decisions.
+
+    python -m backend.services.audit_log timeline CUST001
+    python -m backend.services.audit_log timeline <session-id> --json
+"""
+
+import argparse
+import json
+import mmap
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+AUDIT_DIR = Path(os.getenv("AUDIT_LOG_DIR") or BACKEND_DIR / "logs" / "audit")
+CURRENT = "audit.ndjson"
+
+_STOP = object()
+
+
+class AuditLog:
+    """
+    Structured event log written by one background thread.
+
+    `record()` only enqueues, so callers on the request path never touch the disk.
+    The writer drains the queue in batches (AUDIT_BATCH_SIZE lines per write),
+    fsyncs at most every AUDIT_FSYNC_INTERVAL seconds, and rotates `audit.ndjson`
+    to `audit-<ns>.ndjson` past AUDIT_MAX_BYTES, keeping the newest AUDIT_KEEP files.
+    Each line is one compact JSON object: {"ts", "event", ...fields}. If the queue is
+    full (AUDIT_QUEUE_MAX) events are dropped and counted rather than blocking a turn.
+    A failed write (disk full, directory gone) is counted in `write_errors` with the
+    error in `last_error`, and retried until it succeeds; new events wait in the queue
+    meanwhile. A writer thread that dies anyway is restarted by the next record().
+    """
+
+    def __init__(self, directory: Path = AUDIT_DIR):
+        self.directory = Path(directory)
+        self.batch_size = int(os.getenv("AUDIT_BATCH_SIZE", 512))
+        self.fsync_interval = float(os.getenv("AUDIT_FSYNC_INTERVAL", 1.0))
+        self.max_bytes = int(os.getenv("AUDIT_MAX_BYTES", 64 * 1024 * 1024))
+        self.keep = int(os.getenv("AUDIT_KEEP", 20))
+
+        self._queue: queue.Queue = queue.Queue(maxsize=int(os.getenv("AUDIT_QUEUE_MAX", 100000)))
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self.written = 0
+        self.dropped = 0
+        self.rotations = 0
+        self.write_errors = 0
+        self.last_error: str | None = None
+
+    def record(self, event: str, **fields):
+        """Queue one event; fields must be JSON-serializable and not mutated afterwards."""
+        self._ensure_writer()
+        try:
+            self._queue.put_nowait((time.time(), event, fields))
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until everything queued so far is written and fsynced."""
+        if self._thread is None:
+            return True
+        self._ensure_writer()
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def stats(self) -> dict:
+        return {
+            "written": self.written,
+            "dropped": self.dropped,
+            "rotations": self.rotations,
+            "write_errors": self.write_errors,
+            "last_error": self.last_error,
+            "queue_depth": self.queue_depth(),
+        }
+
+    def shutdown(self):
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout=5)
+        self._thread = None
+
+    # ------------------------------------
+    # Writer
+    # ------------------------------------
+    def _ensure_writer(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self.directory.mkdir(parents=True, exist_ok=True)
+                self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        f, lines, waiters = None, [], []
+        dirty, last_sync = False, time.monotonic()
+        try:
+            while True:
+                stop = False
+                if not lines:  # a batch that failed to write is retried before anything newer
+                    lines, more, stop = self._drain()
+                    waiters += more
+                try:
+                    if f is None:
+                        self.directory.mkdir(parents=True, exist_ok=True)
+                        f = open(self.directory / CURRENT, "ab")
+                    if lines:
+                        f.write(b"".join(lines))
+                        f.flush()
+                        self.written += len(lines)
+                        lines, dirty = [], True
+                    if dirty and (stop or waiters or time.monotonic() - last_sync >= self.fsync_interval):
+                        os.fsync(f.fileno())
+                        dirty, last_sync = False, time.monotonic()
+                    if f.tell() >= self.max_bytes:
+                        f = self._rotate(f)
+                except OSError as e:
+                    self.write_errors += 1
+                    self.last_error = str(e)
+                    f = _close_quietly(f)
+                    if stop:
+                        return
+                    time.sleep(self.fsync_interval)
+                    continue
+                for done in waiters:
+                    done.set()
+                waiters = []
+                if stop:
+                    return
+        finally:
+            _close_quietly(f)
+
+    def _drain(self):
+        """The next batch off the queue: (encoded lines, flush waiters, stop requested)."""
+        try:
+            item = self._queue.get(timeout=self.fsync_interval)
+        except queue.Empty:
+            return [], [], False
+        lines, waiters = [], []
+        while True:
+            if item is _STOP:
+                return lines, waiters, True
+            if isinstance(item, threading.Event):
+                waiters.append(item)
+            else:
+                lines.append(_encode(*item))
+                if len(lines) >= self.batch_size:
+                    break
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+        return lines, waiters, False
+
+    def _rotate(self, f):
+        os.fsync(f.fileno())
+        f.close()
+        os.replace(self.directory / CURRENT, self.directory / f"audit-{time.time_ns()}.ndjson")
+        self.rotations += 1
+        rotated = sorted(self.directory.glob("audit-*.ndjson"))
+        for old in rotated[: max(len(rotated) - self.keep, 0)]:
+            old.unlink(missing_ok=True)
+        return open(self.directory / CURRENT, "ab")
+
+
+def _close_quietly(f):
+    if f is not None:
+        try:
+            f.close()
+        except OSError:
+            pass  # already failing; the write is retried on a fresh handle
+    return None
+
+
+def _encode(ts, event, fields) -> bytes:
+    row = {"ts": round(ts, 3), "event": event, **fields}
+    return json.dumps(row, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8") + b"\n"
+
+
+# ==============================
+# QUERY
+# ==============================
+def log_files(directory: Path = AUDIT_DIR) -> list:
+    """Rotated files oldest first, then the live file."""
+    directory = Path(directory)
+    rotated = sorted(directory.glob("audit-*.ndjson"))
+    current = directory / CURRENT
+    return rotated + ([current] if current.exists() else [])
+
+
+def _grep(path: Path, needles) -> dict:
+    """Lines of `path` containing any needle, keyed by offset; memchr-speed search via mmap."""
+    hits = {}
+    with open(path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            return hits
+        with mm:
+            for needle in needles:
+                pos = mm.find(needle)
+                while pos != -1:
+                    start = mm.rfind(b"\n", 0, pos) + 1
+                    end = mm.find(b"\n", pos)
+                    end = len(mm) if end == -1 else end
+                    hits[start] = mm[start:end]
+                    pos = mm.find(needle, end)
+    return hits
+
+
+def _scan(directory: Path, ids: set) -> dict:
+    needles = [json.dumps(i, ensure_ascii=False).encode("utf-8") for i in ids]
+    events = {}
+    for path in log_files(directory):
+        for offset, line in _grep(path, needles).items():
+            try:
+                row = json.loads(line)
+            except ValueError:  # torn final line after a crash
+                continue
+            if row.get("customer_id") in ids or row.get("session") in ids:
+                events[(path.name, offset)] = row
+    return events
+
+
+def timeline(applicant: str, directory: Path = AUDIT_DIR) -> list:
+    """
+    Every event for a customer id or a chat session id, in time order. A session
+    is linked to its customer by the KYC event, so querying a session also returns
+    that customer's underwriting and letter events.
+    """
+    events = _scan(directory, {applicant})
+    linked = {e["customer_id"] for e in events.values() if e.get("session") == applicant and e.get("customer_id")}
+    if linked:
+        events.update(_scan(directory, linked))
+    return sorted(events.values(), key=lambda e: e["ts"])
+
+
+_audit: AuditLog | None = None
+_audit_lock = threading.Lock()
+
+
+def get_audit_log() -> AuditLog:
+    """Process-wide audit log, created on first use."""
+    global _audit
+    if _audit is None:
+        with _audit_lock:
+            if _audit is None:
+                _audit = AuditLog()
+    return _audit
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    tl = sub.add_parser("timeline", help="reconstruct one applicant's events")
+    tl.add_argument("applicant", help="customer id or chat session id")
+    tl.add_argument("--dir", type=Path, default=AUDIT_DIR, help="audit log directory")
+    tl.add_argument("--json", action="store_true", help="print raw NDJSON lines")
+    args = parser.parse_args()
+
+    events = timeline(args.applicant, args.dir)
+    for e in events:
+        if args.json:
+            print(json.dumps(e, ensure_ascii=False))
+            continue
+        stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(e["ts"]))
+        rest = {k: v for k, v in e.items() if k not in ("ts", "event")}
+        print(f"{stamp}  {e['event']:<12} {json.dumps(rest, ensure_ascii=False)}")
+    if not events:
+        print(f"No audit events for {args.applicant}.")
+
+
+if __name__ == "__main__":
+    main()
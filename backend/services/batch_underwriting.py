@@ -0,0 +1,247 @@
+# backend/services/batch_underwriting.py
+
+import numpy as np
+
+from backend.data.customer_store import get_customer_store
+from backend.services.amortization import emi_array
+from backend.services.audit_log import get_audit_log
+from backend.services.credit_bureau import BureauUnavailable, get_credit_bureau
+from backend.services.underwriting_policy import AFFORDABILITY_CAP, LIMIT_MULTIPLE, MAX_TENURE, MIN_SCORE, NO_HIT_SCORE
+from backend.services.underwriting_policy import REASONS as POLICY_REASONS
+from backend.services.underwriting_policy import TENURES as POLICY_TENURES
+
+TENURES = np.array(POLICY_TENURES)
+
+# Rejection codes, in the order UnderwritingAgent.evaluate_loan checks them
+APPROVED, LOW_SCORE, OVER_LIMIT, NO_INCOME, UNAFFORDABLE, UNKNOWN = range(6)
+REASONS = {
+    LOW_SCORE: POLICY_REASONS["low_score"],
+    OVER_LIMIT: POLICY_REASONS["over_limit"],
+    NO_INCOME: POLICY_REASONS["no_income"],
+    UNAFFORDABLE: POLICY_REASONS["unaffordable"],
+    UNKNOWN: "Customer not found.",
+}
+BUREAU_DOWN = "Credit bureau unavailable — please retry."
+BAD_TERMS = "Need a customer_id string and a numeric amount and tenure."
+BAD_AMOUNT = "Amount must be positive."
+BAD_TENURE = f"Tenure must be 1–{MAX_TENURE} months."
+
+
+def adjust_rates(base_rate, tenures, scores):
+    """Vectorized UnderwritingAgent._adjust_rate; broadcasts tenures against scores."""
+    tenures = np.asarray(tenures)
+    scores = np.asarray(scores)
+    adj = np.select(
+        [tenures <= 12, tenures <= 24, tenures <= 36, tenures <= 48],
+        [-0.5, -0.25, 0.0, 0.25],
+        default=0.5,
+    )
+    adj = adj + np.where(scores >= 800, -0.25, np.where(scores < 700, 0.25, 0.0))
+    return base_rate + adj
+
+
+class BatchResult:
+    """
+    Column-oriented underwriting outcome for N applications over the 5 standard tenures,
+    plus a sixth column for a preferred tenure off that list (masked out when it is on it).
+    """
+
+    __slots__ = ("amounts", "preferred", "status", "tenures", "rates", "emis", "total_interest",
+                 "processing_fee", "affordability", "feasible", "best", "chosen")
+
+    def __len__(self):
+        return len(self.status)
+
+
+def evaluate_arrays(scores, pre_limits, incomes, amounts, preferred_tenures, base_rate=10.95) -> BatchResult:
+    """
+    Underwrite N applications at once. Inputs are length-N arrays; option matrices are N×6.
+    Rounding mirrors the scalar path so feasibility and plan choice agree with it.
+    """
+    scores = np.asarray(scores, dtype=np.int64)
+    pre_limits = np.asarray(pre_limits, dtype=np.int64)
+    incomes = np.asarray(incomes, dtype=np.int64)
+    amounts = np.asarray(amounts, dtype=np.int64)
+    preferred = np.asarray(preferred_tenures, dtype=np.int64)
+
+    # Like evaluate_loan, a preferred tenure off the standard list is evaluated as well
+    off_list = ~np.isin(preferred, TENURES)
+    tenures = np.empty((len(amounts), len(TENURES) + 1), dtype=np.int64)
+    tenures[:, :-1] = TENURES
+    tenures[:, -1] = np.where(off_list, preferred, TENURES[-1])
+
+    rates = adjust_rates(base_rate, tenures, scores[:, None])
+    emis = emi_array(amounts[:, None].astype(float), rates, tenures)
+    total_interest = emis * tenures - amounts[:, None]
+    processing_fee = np.maximum(999, np.round(amounts * 0.008)).astype(np.int64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        affordability = np.round(emis / incomes[:, None] * 100, 2)
+    feasible = affordability <= AFFORDABILITY_CAP
+    feasible[:, -1] &= off_list
+
+    status = np.full(len(amounts), APPROVED, dtype=np.int8)
+    status[~feasible.any(axis=1)] = UNAFFORDABLE
+    status[incomes <= 0] = NO_INCOME
+    status[amounts > LIMIT_MULTIPLE * pre_limits] = OVER_LIMIT
+    status[scores < MIN_SCORE] = LOW_SCORE
+
+    # Best = lowest (total_interest, emi) among feasible plans; rounded like the scalar path
+    ti = np.where(feasible, np.round(total_interest, 2), np.inf)
+    em = np.where(feasible, np.round(emis, 2), np.inf)
+    best = np.lexsort((em, ti), axis=-1)[:, 0]
+
+    match = (tenures == preferred[:, None]) & feasible
+    chosen = np.where(match.any(axis=1), match.argmax(axis=1), best)
+
+    res = BatchResult()
+    res.amounts, res.preferred, res.status, res.tenures = amounts, preferred, status, tenures
+    res.rates, res.emis, res.total_interest = rates, emis, total_interest
+    res.processing_fee, res.affordability, res.feasible = processing_fee, affordability, feasible
+    res.best, res.chosen = best, chosen
+    return res
+
+
+def decisions(res: BatchResult, start: int = 0, stop: int | None = None):
+    """Yield evaluate_loan-shaped decision dicts for rows [start, stop)."""
+    rows = slice(start, len(res) if stop is None else stop)
+    # Convert once to Python lists; per-element numpy indexing would dominate the cost
+    status = res.status[rows].tolist()
+    amounts, preferred = res.amounts[rows].tolist(), res.preferred[rows].tolist()
+    tenures = res.tenures[rows].tolist()
+    rates, emis = np.round(res.rates[rows], 2).tolist(), np.round(res.emis[rows], 2).tolist()
+    interest, fees = np.round(res.total_interest[rows], 2).tolist(), res.processing_fee[rows].tolist()
+    afford, feasible = res.affordability[rows].tolist(), res.feasible[rows].tolist()
+    best, chosen = res.best[rows].tolist(), res.chosen[rows].tolist()
+
+    for i, code in enumerate(status):
+        if code != APPROVED:
+            yield {"status": "rejected", "reason": REASONS[code]}
+            continue
+        options = {
+            j: {
+                "tenure": tenures[i][j],
+                "rate": rates[i][j],
+                "emi": emis[i][j],
+                "total_interest": interest[i][j],
+                "processing_fee": fees[i],
+                "affordability": afford[i][j],
+            }
+            for j, ok in enumerate(feasible[i]) if ok
+        }
+        all_options = list(options.values())
+        if len(all_options) > 1 and all_options[-1]["tenure"] < all_options[-2]["tenure"]:
+            # An off-list preferred tenure goes in tenure order, as evaluate_loan lists it
+            all_options.sort(key=lambda opt: opt["tenure"])
+        yield {
+            "status": "approved",
+            "approved_amount": amounts[i],
+            "preferred_tenure": preferred[i],
+            "chosen_plan": options[chosen[i]],
+            "best_plan": options[best[i]],
+            "all_options": all_options,
+        }
+
+
+class BatchUnderwriter:
+    """
+    Portfolio-scale counterpart of UnderwritingAgent.evaluate_loan.
+    Resolves customers through the shared CustomerStore and evaluates applications
+    in fixed-size vectorized chunks, so results can be streamed as they are produced.
+    Each chunk's credit scores are prefetched from the bureau in bulk; if the bureau
+    fails, that chunk's applications come back as errors and the run carries on.
+    Items that cannot be underwritten at all (a non-numeric amount, a zero or overlong tenure) come
+    back as "invalid" rows in their place.
+    """
+
+    def __init__(self, chunk_size: int = 10000):
+        self.chunk_size = chunk_size
+
+    @property
+    def store(self):
+        return get_customer_store()  # resolved per use so constructing this never loads data
+
+    @property
+    def bureau(self):
+        return get_credit_bureau()
+
+    @property
+    def audit(self):
+        return get_audit_log()
+
+    def evaluate(self, items, base_rate: float = 10.95):
+        """
+        `items` is an iterable of {"customer_id", "amount", "tenure"} dicts.
+        Yields one decision per item, in input order, tagged with its customer_id.
+        """
+        chunk = []
+        for item in items:
+            chunk.append(item)
+            if len(chunk) >= self.chunk_size:
+                yield from self._evaluate_chunk(chunk, base_rate)
+                chunk = []
+        if chunk:
+            yield from self._evaluate_chunk(chunk, base_rate)
+
+    def _evaluate_chunk(self, items, base_rate):
+        # Unusable items get an "invalid" row in place; the rest are underwritten together
+        apps, problems = [], {}
+        for i, item in enumerate(items):
+            try:
+                apps.append(_application(item))
+            except ValueError as exc:
+                problems[i] = str(exc)
+        decided = self._decide([item for i, item in enumerate(items) if i not in problems], apps, base_rate)
+        for i, item in enumerate(items):
+            if i in problems:
+                yield {"customer_id": item.get("customer_id"), "status": "invalid", "reason": problems[i]}
+            else:
+                yield next(decided)
+
+    def _decide(self, items, apps, base_rate):
+        if not items:
+            return
+        n = len(items)
+        scores = np.zeros(n, dtype=np.int64)
+        pre_limits = np.zeros(n, dtype=np.int64)
+        incomes = np.zeros(n, dtype=np.int64)
+        known = np.zeros(n, dtype=bool)
+        customers = [self.store.by_id(item.get("customer_id")) for item in items]
+        try:
+            bureau = self.bureau.scores(cust["customer_id"] for cust in customers if cust is not None)
+        except BureauUnavailable:
+            for item in items:
+                yield {"customer_id": item.get("customer_id"), "status": "error", "reason": BUREAU_DOWN}
+            return
+        for i, cust in enumerate(customers):
+            if cust is None:
+                continue
+            known[i] = True
+            score = bureau[cust["customer_id"]]
+            if score is None:
+                self.audit.record("bureau_no_hit", customer_id=cust["customer_id"], assumed_score=NO_HIT_SCORE)
+                score = NO_HIT_SCORE
+            scores[i] = score
+            pre_limits[i] = int(cust["pre_approved_limit"])
+            incomes[i] = int(cust.get("monthly_income", 0))
+
+        amounts, tenures = zip(*apps)
+        res = evaluate_arrays(scores, pre_limits, incomes, amounts, tenures, base_rate)
+        res.status[~known] = UNKNOWN
+
+        for item, decision in zip(items, decisions(res)):
+            yield {"customer_id": item.get("customer_id"), **decision}
+
+
+def _application(item) -> tuple[int, int]:
+    """(amount, tenure) from a batch item, or ValueError saying why it cannot be underwritten."""
+    try:
+        amount, tenure = int(item.get("amount", 0)), int(item.get("tenure", 36))
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError(BAD_TERMS) from None
+    if not isinstance(item.get("customer_id"), str):
+        raise ValueError(BAD_TERMS)
+    if amount <= 0:
+        raise ValueError(BAD_AMOUNT)
+    if not 1 <= tenure <= MAX_TENURE:
+        raise ValueError(BAD_TENURE)
+    return amount, tenure
@@ -0,0 +1,256 @@
+# backend/services/credit_bureau.py
+
+import importlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from backend.data.customer_store import get_customer_store
+from backend.services.metrics import DEPENDENCY_LATENCY
+
+
+class BureauUnavailable(Exception):
+    """The credit bureau could not be reached or failed to answer."""
+
+
+# ==============================
+# CLIENTS
+# ==============================
+class BureauClient:
+    """
+    What CreditBureau needs from a bureau: a credit score per customer id (None when the
+    bureau holds no file on them), one at a time or in bulk. Real clients make a remote,
+    per-hit billed request for every call; caching and coalescing live in CreditBureau.
+    """
+
+    name = "bureau"
+
+    def fetch(self, customer_id: str) -> int | None:
+        raise NotImplementedError
+
+    def fetch_many(self, customer_ids: list) -> dict:
+        """Scores for many customers in one round trip; override when the bureau has a bulk API."""
+        return {cid: self.fetch(cid) for cid in customer_ids}
+
+
+class FileBureau(BureauClient):
+    """
+    Local stand-in backed by the customer data files (credit_scores.json or the compiled
+    snapshot). `latency` seconds per round trip (BUREAU_STUB_LATENCY_MS) mimics a remote bureau.
+    """
+
+    name = "file"
+
+    def __init__(self, latency: float | None = None):
+        self.latency = latency if latency is not None else float(os.getenv("BUREAU_STUB_LATENCY_MS", 0)) / 1000
+
+    @property
+    def store(self):
+        return get_customer_store()
+
+    def fetch(self, customer_id: str) -> int | None:
+        if self.latency:
+            time.sleep(self.latency)
+        return self.store.credit_score(customer_id)
+
+    def fetch_many(self, customer_ids: list) -> dict:
+        if self.latency:
+            time.sleep(self.latency)
+        return {cid: self.store.credit_score(cid) for cid in customer_ids}
+
+
+CLIENTS = {"file": FileBureau}
+
+
+def load_client(spec: str) -> BureauClient:
+    """`file`, or `package.module:ClassName` for a bureau client defined elsewhere."""
+    if spec in CLIENTS:
+        return CLIENTS[spec]()
+    module, _, attr = spec.partition(":")
+    if not attr:
+        raise ValueError(f"Unknown bureau client {spec!r}; use one of {sorted(CLIENTS)} or 'module:Class'")
+    return getattr(importlib.import_module(module), attr)()
+
+
+# ==============================
+# CACHING FRONT
+# ==============================
+class _Flight:
+    """One bureau request in progress; lookups for the same customer wait on it."""
+
+    __slots__ = ("done", "score", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.score = None
+        self.error = None
+
+
+class CreditBureau:
+    """
+    Credit scores through a BureauClient, fetched as rarely as possible.
+
+    Scores are cached per customer for `ttl` seconds (no-hits for `no_hit_ttl`) in an LRU
+    of `max_entries`. Concurrent lookups of a customer that isn't cached share one bureau
+    request (single flight), and `prefetch` warms many customers in bulk round trips of
+    `batch_size`, so a batch run pays per chunk rather than per applicant.
+    """
+
+    def __init__(self, client: BureauClient | None = None, ttl: float | None = None, no_hit_ttl: float | None = None,
+                 max_entries: int | None = None, batch_size: int | None = None):
+        self.client = client or load_client(os.getenv("BUREAU_CLIENT", "file"))
+        self.ttl = ttl if ttl is not None else float(os.getenv("BUREAU_CACHE_TTL_SECONDS", 86400))
+        self.no_hit_ttl = no_hit_ttl if no_hit_ttl is not None else float(os.getenv("BUREAU_NO_HIT_TTL_SECONDS", 3600))
+        self.max_entries = max_entries or int(os.getenv("BUREAU_CACHE_MAX", 100000))
+        self.batch_size = batch_size or int(os.getenv("BUREAU_BATCH_SIZE", 500))
+        self._cache: OrderedDict = OrderedDict()  # customer_id -> (score, expires_at)
+        self._inflight: dict = {}  # customer_id -> _Flight
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.coalesced = 0
+        self.fetches = self.no_hits = self.errors = 0
+
+    def score(self, customer_id: str) -> int | None:
+        """The customer's score, or None when the bureau has no file on them."""
+        with self._lock:
+            cached = self._cached(customer_id, time.monotonic())
+            if cached is not None:
+                self.hits += 1
+                return cached[0]
+            flight = self._inflight.get(customer_id)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[customer_id] = _Flight()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise BureauUnavailable(str(flight.error)) from flight.error
+            return flight.score
+
+        try:
+            with DEPENDENCY_LATENCY.time(dependency="bureau", operation="fetch"):
+                scores = {customer_id: self.client.fetch(customer_id)}
+        except Exception as e:
+            self._abort({customer_id: flight}, e)
+            raise BureauUnavailable(str(e)) from e
+        self._land(scores, {customer_id: flight})
+        return scores[customer_id]
+
+    def scores(self, customer_ids) -> dict:
+        """Scores for many customers: anything not cached is prefetched in bulk first."""
+        ids = list(dict.fromkeys(customer_ids))
+        fetched = self.prefetch(ids)  # counted as misses there
+        out, missing = {}, []
+        now = time.monotonic()
+        with self._lock:
+            for cid in ids:
+                cached = self._cached(cid, now)
+                if cached is None:
+                    missing.append(cid)  # evicted already, or still in another caller's flight
+                else:
+                    out[cid] = cached[0]
+            self.hits += max(0, len(out) - fetched)
+        for cid in missing:
+            out[cid] = self.score(cid)
+        return out
+
+    def prefetch(self, customer_ids) -> int:
+        """Warm the cache for `customer_ids` in bulk round trips; returns how many were fetched."""
+        now = time.monotonic()
+        flights = {}
+        with self._lock:
+            for cid in dict.fromkeys(customer_ids):
+                if cid in self._inflight or self._cached(cid, now) is not None:
+                    continue
+                flights[cid] = self._inflight[cid] = _Flight()
+            self.misses += len(flights)
+        todo = list(flights)
+        for i in range(0, len(todo), self.batch_size):
+            chunk = todo[i:i + self.batch_size]
+            try:
+                with DEPENDENCY_LATENCY.time(dependency="bureau", operation="fetch_many"):
+                    scores = self.client.fetch_many(chunk)
+            except Exception as e:
+                self._abort({cid: flights[cid] for cid in todo[i:]}, e)
+                raise BureauUnavailable(str(e)) from e
+            self._land({cid: scores.get(cid) for cid in chunk}, {cid: flights[cid] for cid in chunk})
+        return len(todo)
+
+    def invalidate(self, customer_id: str | None = None):
+        """Forget one customer's cached score, or every score."""
+        with self._lock:
+            if customer_id is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(customer_id, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "client": self.client.name,
+                "entries": len(self._cache),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "coalesced": self.coalesced,
+                "fetches": self.fetches,
+                "no_hits": self.no_hits,
+                "errors": self.errors,
+            }
+
+    # ------------------------------------
+    # Helpers (caller holds the lock where noted)
+    # ------------------------------------
+    def _cached(self, customer_id, now):
+        # Lock held. Returns (score,) for a fresh entry so a cached None is distinguishable
+        entry = self._cache.get(customer_id)
+        if entry is None:
+            return None
+        if entry[1] <= now:
+            del self._cache[customer_id]
+            return None
+        self._cache.move_to_end(customer_id)
+        return (entry[0],)
+
+    def _land(self, scores: dict, flights: dict):
+        now = time.monotonic()
+        with self._lock:
+            self.fetches += 1
+            for cid, score in scores.items():
+                if score is None:
+                    self.no_hits += 1
+                self._cache[cid] = (score, now + (self.ttl if score is not None else self.no_hit_ttl))
+                self._cache.move_to_end(cid)
+                self._inflight.pop(cid, None)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        for cid, flight in flights.items():
+            flight.score = scores[cid]
+            flight.done.set()
+
+    def _abort(self, flights: dict, error: Exception):
+        with self._lock:
+            self.errors += 1
+            for cid in flights:
+                self._inflight.pop(cid, None)
+        for flight in flights.values():
+            flight.error = error
+            flight.done.set()
+
+
+_bureau: CreditBureau | None = None
+_bureau_lock = threading.Lock()
+
+
+def get_credit_bureau() -> CreditBureau:
+    """Process-wide shared bureau front (client from BUREAU_CLIENT), built on first use."""
+    global _bureau
+    if _bureau is None:
+        with _bureau_lock:
+            if _bureau is None:
+                _bureau = CreditBureau()
+    return _bureau
@@ -0,0 +1,202 @@
+# backend/services/customer_feed.py
+
+import base64
+import bisect
+import gzip
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from backend.data.customer_store import CustomerStore, get_customer_store
+
+# Fields that can be used as equality filters (?city=Mumbai&employment_type=Salaried)
+FILTER_FIELDS = ("city", "employment_type", "company")
+
+
+def _dumps(value) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def encode_cursor(customer_id) -> str:
+    return base64.urlsafe_b64encode(_dumps(customer_id)).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> str:
+    try:
+        value = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError:
+        raise ValueError("Malformed cursor.")
+    if not isinstance(value, str):
+        raise ValueError("Malformed cursor.")  # customer ids are strings; anything else was forged
+    return value
+
+
+class FeedPage:
+    """One ready-to-send page: identity and gzip bodies share a single ETag."""
+
+    __slots__ = ("etag", "body", "gzipped")
+
+    def __init__(self, etag: str, body: bytes):
+        self.etag = etag
+        self.body = body
+        self.gzipped = gzip.compress(body, compresslevel=6)
+
+
+class CustomerFeed:
+    """
+    Pre-serialized customer listing behind `GET /offer/`.
+
+    Each customer is serialized once per data version as `"field":value` fragments, so
+    a page (with or without a `fields` projection) is assembled by joining bytes. The
+    version is a hash of the source records and changes only when the CustomerStore
+    reloads customers.json. Finished pages, raw and gzipped, are kept in a small LRU
+    keyed by (version, query), and ETags are derived from that key — a conditional
+    request is answered without touching the page at all.
+
+    Cursors are opaque encodings of the last customer_id returned, so they stay valid
+    across reloads.
+    """
+
+    def __init__(self, store: CustomerStore | None = None, page_cache: int | None = None):
+        self.store = store or get_customer_store()
+        self.page_cache = page_cache or int(os.getenv("OFFER_FEED_PAGES", 256))
+        self.default_limit = int(os.getenv("OFFER_FEED_LIMIT", 100))
+        self.max_limit = int(os.getenv("OFFER_FEED_MAX_LIMIT", 1000))
+        self._lock = threading.Lock()
+        self._pages: "OrderedDict[tuple, FeedPage]" = OrderedDict()
+        self._records = None  # customer list the fragments were built from
+        self.hits = 0
+        self.misses = 0
+        self.rebuilds = 0
+        self._build()
+
+    def etag(self, limit=None, cursor=None, fields=None, filters=None) -> str:
+        """ETag the matching page would carry, without building it."""
+        self._build()
+        return self._etag(self._query(limit, cursor, fields, filters))
+
+    def page(self, limit=None, cursor=None, fields=None, filters=None) -> FeedPage:
+        self._build()
+        query = self._query(limit, cursor, fields, filters)
+        key = (self.version, query)
+        with self._lock:
+            page = self._pages.get(key)
+            if page is not None:
+                self._pages.move_to_end(key)
+                self.hits += 1
+                return page
+            self.misses += 1
+
+        page = FeedPage(self._etag(query), self._render(*query))
+        with self._lock:
+            self._pages[key] = page
+            while len(self._pages) > self.page_cache:
+                self._pages.popitem(last=False)
+        return page
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "version": self.version,
+            "customers": len(self._ids),
+            "cached_pages": len(self._pages),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "rebuilds": self.rebuilds,
+        }
+
+    # ------------------------------------
+    # Helpers
+    # ------------------------------------
+    def _query(self, limit, cursor, fields, filters) -> tuple:
+        limit = max(1, min(int(limit or self.default_limit), self.max_limit))
+        fields = tuple(sorted(set(fields))) if fields else None
+        unknown = [f for f in fields or () if f not in self._fields]
+        if unknown:
+            raise ValueError(f"Unknown field {', '.join(unknown)}; use {', '.join(sorted(self._fields))}.")
+        filters = tuple(sorted((k, v) for k, v in (filters or {}).items() if v is not None))
+        unknown = [k for k, _ in filters if k not in FILTER_FIELDS]
+        if unknown:
+            raise ValueError(f"Cannot filter on {', '.join(unknown)}; use {', '.join(FILTER_FIELDS)}.")
+        return limit, cursor or None, fields, filters
+
+    def _etag(self, query) -> str:
+        digest = hashlib.sha1(repr(query).encode("utf-8")).hexdigest()[:16]
+        return f'"{self.version}-{digest}"'
+
+    def _render(self, limit, cursor, fields, filters) -> bytes:
+        # Candidate positions: everything, or the intersection of the filter indexes
+        positions = None
+        for field, value in filters:
+            hits = self._by_field[field].get(value, [])
+            positions = hits if positions is None else sorted(set(positions) & set(hits))
+        total = len(self._ids) if positions is None else len(positions)
+
+        start = 0
+        if cursor is not None:
+            after = self._position.get(decode_cursor(cursor))
+            if after is None:
+                raise ValueError("Cursor no longer matches any customer.")
+            start = after + 1 if positions is None else bisect.bisect_right(positions, after)
+        window = range(start, min(start + limit, total))
+        rows = [positions[i] for i in window] if positions is not None else list(window)
+
+        parts = []
+        for pos in rows:
+            frags = self._fragments[pos]
+            chosen = frags.values() if fields is None else (frags[f] for f in fields if f in frags)
+            parts.append(b"{" + b",".join(chosen) + b"}")
+        more = window.stop < total
+        next_cursor = encode_cursor(self._ids[rows[-1]]) if rows and more else None
+        return (
+            b'{"items":[' + b",".join(parts) + b'],"count":' + _dumps(len(parts))
+            + b',"total":' + _dumps(total) + b',"next_cursor":' + _dumps(next_cursor) + b"}"
+        )
+
+    def _build(self):
+        records = self.store.customers()
+        if records is self._records:
+            return
+        with self._lock:
+            if records is self._records:
+                return
+            fragments, ids, position, known = [], [], {}, set()
+            by_field = {field: {} for field in FILTER_FIELDS}
+            digest = hashlib.sha256()
+            for pos, rec in enumerate(records):
+                frags = {k: _dumps(k) + b":" + _dumps(v) for k, v in rec.items()}
+                fragments.append(frags)
+                known.update(frags)
+                for frag in frags.values():
+                    digest.update(frag)
+                digest.update(b"\n")
+                cid = rec.get("customer_id")
+                ids.append(cid)
+                position[cid] = pos
+                for field in FILTER_FIELDS:
+                    if rec.get(field) is not None:
+                        by_field[field].setdefault(rec[field], []).append(pos)
+
+            self._fragments, self._ids, self._position, self._by_field = fragments, ids, position, by_field
+            self._fields = frozenset(known)  # projectable with ?fields=
+            self.version = digest.hexdigest()[:16]
+            self._pages.clear()
+            self._records = records
+            self.rebuilds += 1
+
+
+_feed: CustomerFeed | None = None
+_feed_lock = threading.Lock()
+
+
+def get_customer_feed() -> CustomerFeed:
+    """Process-wide shared feed, built on first use."""
+    global _feed
+    if _feed is None:
+        with _feed_lock:
+            if _feed is None:
+                _feed = CustomerFeed()
+    return _feed
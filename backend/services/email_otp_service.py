@@ -1,19 +1,31 @@
 import os
 import smtplib
+import threading
 from email.mime.text import MIMEText
 import random
 
+from backend.services.metrics import DEPENDENCY_LATENCY
+
 def generate_otp(length=6):
     return str(random.randint(10**(length-1), 10**length-1))
 
 class EmailOTPService:
+    """
+    Sends OTP emails over a long-lived SMTP session.
+    Each sending thread keeps its own authenticated connection and transparently
+    reconnects once if the server has dropped it since the last message.
+    """
+
     def __init__(self):
         self.smtp_server = os.getenv("SMTP_SERVER", "smtp.gmail.com")
         self.smtp_port = int(os.getenv("SMTP_PORT", 587))
         self.smtp_user = os.getenv("SMTP_USER")
         self.smtp_password = os.getenv("SMTP_PASSWORD")
+        self.use_tls = os.getenv("SMTP_STARTTLS", "true").lower() not in ("0", "false", "no")
+        self.timeout = float(os.getenv("SMTP_TIMEOUT", 10))
         if not self.smtp_user or not self.smtp_password:
             raise ValueError("SMTP_USER and SMTP_PASSWORD must be set in .env")
+        self._local = threading.local()
 
     def send_otp(self, email: str, otp: str):
         subject = "Your CapitalMitra OTP Verification Code"
@@ -23,8 +35,40 @@ class EmailOTPService:
         msg["From"] = self.smtp_user
         msg["To"] = email
 
-        with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-            server.starttls()
-            server.login(self.smtp_user, self.smtp_password)
-            server.sendmail(self.smtp_user, [email], msg.as_string())
-        return True
+        with DEPENDENCY_LATENCY.time(dependency="smtp", operation="send"):
+            for attempt in (1, 2):
+                try:
+                    self._connection().sendmail(self.smtp_user, [email], msg.as_string())
+                    return True
+                except smtplib.SMTPServerDisconnected:
+                    # Idle connection was closed server-side; reconnect once and resend
+                    self.close()
+                    if attempt == 2:
+                        raise
+                except (smtplib.SMTPException, OSError):
+                    self.close()
+                    raise
+
+    def close(self):
+        """Drop this thread's SMTP connection (a new one is opened on next send)."""
+        server = getattr(self._local, "server", None)
+        self._local.server = None
+        if server is not None:
+            try:
+                server.quit()
+            except (smtplib.SMTPException, OSError):
+                server.close()
+
+    def _connection(self) -> smtplib.SMTP:
+        server = getattr(self._local, "server", None)
+        if server is None:
+            server = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=self.timeout)
+            try:
+                if self.use_tls:
+                    server.starttls()
+                server.login(self.smtp_user, self.smtp_password)
+            except Exception:
+                server.close()
+                raise
+            self._local.server = server
+        return server
@@ -0,0 +1,101 @@
+# backend/services/event_bus.py
+
+import asyncio
+import os
+import threading
+
+
+class Subscription:
+    """
+    One listener's bounded inbox, owned by the event loop that subscribed. When the
+    listener falls behind, the oldest undelivered events are dropped (and counted)
+    so a slow or stalled client can never grow server memory.
+    """
+
+    __slots__ = ("topic", "loop", "queue", "dropped")
+
+    def __init__(self, topic: str, loop: asyncio.AbstractEventLoop, maxsize: int):
+        self.topic = topic
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.dropped = 0
+
+    async def get(self) -> dict:
+        return await self.queue.get()
+
+    def _offer(self, event: dict) -> int:
+        # Runs on the subscriber's loop
+        dropped = 0
+        while self.queue.full():
+            self.queue.get_nowait()
+            dropped += 1
+        self.queue.put_nowait(event)
+        self.dropped += dropped
+        return dropped
+
+
+class EventBus:
+    """
+    In-process publish/subscribe for server-push events (OTP delivered, letter ready),
+    keyed by conversation session id.
+
+    `publish()` may be called from any thread — OTP workers and letter pool callbacks
+    run off the event loop — and hands the event to each subscriber's loop without
+    blocking. Publishing to a topic nobody listens to is a dict lookup.
+    """
+
+    def __init__(self, queue_size: int | None = None):
+        self.queue_size = queue_size or int(os.getenv("EVENT_QUEUE_SIZE", 32))
+        self._topics: dict = {}  # topic -> set of Subscription
+        self._lock = threading.Lock()
+        self.published = 0
+        self.dropped = 0
+
+    def subscribe(self, topic: str) -> Subscription:
+        """Register a listener; call from the event loop that will consume it."""
+        sub = Subscription(topic, asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            self._topics.setdefault(topic, set()).add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        with self._lock:
+            subs = self._topics.get(sub.topic)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._topics[sub.topic]
+
+    def publish(self, topic: str, event: dict):
+        with self._lock:
+            subs = tuple(self._topics.get(topic, ()))
+            self.published += 1
+        for sub in subs:
+            try:
+                sub.loop.call_soon_threadsafe(self._deliver, sub, event)
+            except RuntimeError:
+                self.unsubscribe(sub)  # its loop is gone
+
+    def subscribers(self) -> int:
+        with self._lock:
+            return sum(len(subs) for subs in self._topics.values())
+
+    def _deliver(self, sub: Subscription, event: dict):
+        dropped = sub._offer(event)
+        if dropped:
+            with self._lock:
+                self.dropped += dropped
+
+
+_bus: EventBus | None = None
+_bus_lock = threading.Lock()
+
+
+def get_event_bus() -> EventBus:
+    """Process-wide shared bus, built on first use."""
+    global _bus
+    if _bus is None:
+        with _bus_lock:
+            if _bus is None:
+                _bus = EventBus()
+    return _bus
@@ -0,0 +1,304 @@
+# backend/services/letter_jobs.py
+
+import asyncio
+import hashlib
+import hmac
+import multiprocessing
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from backend.services.amortization import schedule
+from backend.services.metrics import DEPENDENCY_LATENCY
+from backend.services.letter_store import LetterStore, letter_key
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+FONTS_DIR = BACKEND_DIR / "static" / "fonts"
+
+# ==============================
+# WORKER SIDE
+# ==============================
+# Resolved once per process by init_worker(), not per letter
+_font = None
+
+
+def init_worker():
+    """One-time per-process setup: Unicode font discovery."""
+    global _font
+    dejavu = FONTS_DIR / "DejaVuSans.ttf"
+    # (family, path, rupee symbol) — fall back to core font + 'Rs.' without DejaVu
+    _font = ("DejaVu", str(dejavu), "₹") if dejavu.exists() else ("Arial", None, "Rs.")
+
+
+def render_letter(name, amount, rate, tenure) -> bytes:
+    """Render a sanction letter and return the PDF bytes."""
+    from fpdf import FPDF  # rendering happens in pool workers; the web process never needs fpdf at import
+
+    if _font is None:
+        init_worker()
+    family, font_path, rupee = _font
+
+    pdf = FPDF()
+    pdf.add_page()
+    if font_path:
+        # fpdf keeps a parsed .pkl beside the TTF, so this is cheap after the first letter
+        pdf.add_font(family, "", font_path, uni=True)
+    pdf.set_font(family, size=12)
+
+    pdf.cell(200, 10, txt="CapitalMitra - Loan Sanction Letter", ln=True, align="C")
+    pdf.ln(4)
+    pdf.cell(200, 10, txt=f"Dear {name},", ln=True)
+    pdf.cell(200, 10, txt=f"Your personal loan of {rupee}{amount:,} has been approved.", ln=True)
+    pdf.cell(200, 10, txt=f"Interest Rate: {rate}% | Tenure: {tenure} months", ln=True)
+
+    # Repayment schedule, from the shared amortization engine
+    plan = schedule(amount, rate, tenure)
+    pdf.cell(200, 10, txt=f"Monthly EMI: {rupee}{plan['emi']:,.2f} | Total Interest: {rupee}{plan['total_interest']:,.2f}", ln=True)
+    pdf.ln(2)
+    widths = (20, 40, 40, 40, 45)
+    pdf.set_font(family, size=9)
+    for label, w in zip(("Month", "EMI", "Principal", "Interest", "Balance"), widths):
+        pdf.cell(w, 6, txt=label, border=1, align="C")
+    pdf.ln()
+    for row in plan["schedule"]:
+        cells = (str(row["month"]), f"{row['emi']:,.2f}", f"{row['principal']:,.2f}",
+                 f"{row['interest']:,.2f}", f"{row['balance']:,.2f}")
+        for text, w in zip(cells, widths):
+            pdf.cell(w, 5, txt=text, border=1, align="R")
+        pdf.ln()
+    pdf.set_font(family, size=12)
+
+    pdf.ln(6)
+    pdf.multi_cell(0, 8, txt="Thank you for choosing CapitalMitra. This is a system-generated letter.")
+    return pdf.output(dest="S").encode("latin-1")
+
+
+def render_letter_timed(name, amount, rate, tenure) -> tuple[bytes, float]:
+    """Pool entry point: the PDF plus its render time, measured inside the worker."""
+    t0 = time.perf_counter()
+    data = render_letter(name, amount, rate, tenure)
+    return data, time.perf_counter() - t0
+
+
+# ==============================
+# JOB MANAGER
+# ==============================
+class LetterJobs:
+    """
+    Renders sanction letters on a process pool so PDF generation never runs on
+    the request path. `submit()` returns a job id immediately; callers poll
+    `status()` or `await wait()` for the finished letter.
+
+    Letters are content-addressed through LetterStore: a request whose inputs were
+    rendered before completes instantly, and identical requests already in flight
+    share one render. Job ids carry the letter key plus an HMAC over it, so a worker
+    that did not accept the job (uvicorn --workers N) still resolves it through the
+    shared store, while ids the server never issued resolve to nothing.
+    An optional `notify(job_id, status)` callback runs once the job is done or failed
+    (immediately, for a letter that was already rendered).
+    """
+
+    def __init__(self, max_workers: int | None = None, store: LetterStore | None = None):
+        self.max_workers = max_workers or int(os.getenv("LETTER_WORKERS", 2))
+        self.max_jobs = int(os.getenv("LETTER_JOB_HISTORY", 10000))
+        self.store = store or LetterStore()
+        self._secret = _signing_key(self.store.directory)
+        self._pool: ProcessPoolExecutor | None = None
+        self._jobs: "OrderedDict[str, dict]" = OrderedDict()
+        self._inflight: dict = {}  # letter key -> Future
+        self._waiters: dict = {}  # letter key -> job ids finished by that render
+        self._notify: dict = {}  # job id -> callback
+        self._lock = threading.Lock()
+        self.renders = 0
+        self.reused = 0  # submissions answered by a cached or in-flight render
+
+    def submit(self, name, amount, rate, tenure, notify=None) -> str:
+        key = letter_key(name=name, amount=amount, rate=rate, tenure=tenure)
+        job_id = self._sign(f"{secrets.token_hex(6)}-{key}")
+        job = {"status": "pending", "key": key, "error": None, "submitted_at": time.time()}
+        with self._lock:
+            self._jobs[job_id] = job
+            if notify is not None:
+                self._notify[job_id] = notify
+            while len(self._jobs) > self.max_jobs:
+                self._notify.pop(self._jobs.popitem(last=False)[0], None)
+            inflight = key in self._inflight
+            if inflight:
+                self._waiters[key].append(job_id)
+                self.reused += 1
+        if inflight:
+            return job_id
+
+        if key in self.store:
+            job.update(status="done", finished_at=time.time())
+            self.reused += 1
+            self._notify_done([job_id])
+            return job_id
+
+        pool = self._executor()
+        with self._lock:
+            if key in self._inflight:
+                self._waiters[key].append(job_id)
+                self.reused += 1
+                return job_id
+            future = pool.submit(render_letter_timed, name, amount, rate, tenure)
+            self._inflight[key] = future
+            self._waiters[key] = [job_id]
+            self.renders += 1
+        # Registered outside the lock: a render that already finished runs the callback right here
+        future.add_done_callback(lambda f, key=key: self._complete(key, f))
+        return job_id
+
+    def render_now(self, name, amount, rate, tenure) -> str:
+        """Synchronous, cache-aware render in this process; returns the letter key."""
+        key = letter_key(name=name, amount=amount, rate=rate, tenure=tenure)
+        if key not in self.store:
+            with DEPENDENCY_LATENCY.time(dependency="pdf", operation="render"):
+                data = render_letter(name, amount, rate, tenure)
+            self.store.put(key, data)
+            with self._lock:
+                self.renders += 1
+        return key
+
+    def status(self, job_id: str) -> dict | None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job:
+                return dict(job)
+        key = self._job_key(job_id)
+        if key is None:
+            return None
+        # Accepted by another worker: done once its render reaches the shared store
+        return {"status": "done" if key in self.store else "pending", "key": key, "error": None, "remote": True}
+
+    async def wait(self, job_id: str, timeout: float) -> dict | None:
+        """Wait (without blocking the event loop) until the job finishes or `timeout` elapses."""
+        job = self.status(job_id)
+        if job is None or job["status"] != "pending":
+            return job
+        future = self._inflight.get(job["key"])
+        if future is not None and not future.done():
+            try:
+                await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout)
+            except Exception:
+                pass  # timeouts and render errors are both reported through status()
+        elif job.get("remote"):
+            deadline = time.monotonic() + timeout
+            while job["key"] not in self.store and time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+        return self.status(job_id)
+
+    def stats(self) -> dict:
+        submitted = self.renders + self.reused
+        return {
+            "renders": self.renders,
+            "reused": self.reused,
+            "reuse_rate": round(self.reused / submitted, 4) if submitted else 0.0,
+            "pending": self.pending(),
+            **self.store.stats(),
+        }
+
+    def pending(self) -> int:
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if job["status"] == "pending")
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    # ------------------------------------
+    # Helpers
+    # ------------------------------------
+    def _sign(self, job: str) -> str:
+        return f"{job}-{hmac.new(self._secret, job.encode(), hashlib.sha256).hexdigest()[:32]}"
+
+    def _job_key(self, job_id: str) -> str | None:
+        """The letter key of a job id this server (or a sibling worker) issued, else None."""
+        job, _, _ = job_id.rpartition("-")
+        if not hmac.compare_digest(self._sign(job), job_id):
+            return None
+        _, _, key = job.partition("-")
+        return key if len(key) == 64 and all(c in "0123456789abcdef" for c in key) else None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    # 'spawn' keeps workers clear of the server's threads and sockets
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                        initializer=init_worker,
+                    )
+        return self._pool
+
+    def _complete(self, key, future):
+        # Store the bytes first, so every job marked done below can be served
+        error = None
+        if future.cancelled():
+            error = "cancelled"
+        elif future.exception() is not None:
+            error = str(future.exception())
+            DEPENDENCY_LATENCY.observe(0.0, dependency="pdf", operation="render", outcome="error")
+        else:
+            data, seconds = future.result()
+            DEPENDENCY_LATENCY.observe(seconds, dependency="pdf", operation="render", outcome="ok")
+            self.store.put(key, data)
+
+        with self._lock:
+            self._inflight.pop(key, None)
+            now = time.time()
+            finished = self._waiters.pop(key, ())
+            for job_id in finished:
+                job = self._jobs.get(job_id)
+                if job is not None:
+                    job.update(status="failed" if error else "done", error=error, finished_at=now)
+        self._notify_done(finished)
+
+    def _notify_done(self, job_ids):
+        with self._lock:
+            callbacks = [(job_id, self._notify.pop(job_id)) for job_id in job_ids if job_id in self._notify]
+        for job_id, notify in callbacks:
+            try:
+                notify(job_id, self.status(job_id))
+            except Exception:
+                pass  # a listener must never break rendering
+
+
+def _signing_key(directory: Path) -> bytes:
+    """LETTER_SIGNING_KEY, else a random key every worker shares through the letter directory."""
+    configured = os.getenv("LETTER_SIGNING_KEY")
+    if configured:
+        return configured.encode()
+    path = Path(directory) / ".signing_key"
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(secrets.token_hex(32))
+        tmp.chmod(0o600)
+        try:
+            os.link(tmp, path)  # atomic: the first worker's key wins
+        except FileExistsError:
+            pass
+        finally:
+            tmp.unlink()
+    return path.read_text().strip().encode()
+
+
+_jobs: LetterJobs | None = None
+_jobs_lock = threading.Lock()
+
+
+def get_letter_jobs() -> LetterJobs:
+    """Process-wide shared job manager, built on first use."""
+    global _jobs
+    if _jobs is None:
+        with _jobs_lock:
+            if _jobs is None:
+                _jobs = LetterJobs()
+    return _jobs
@@ -0,0 +1,174 @@
+# backend/services/letter_store.py
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+# Outside backend/static: letters are only served through job ids the server issued
+CACHE_DIR = BACKEND_DIR / "state" / "letters"
+
+# Bump whenever the letter layout changes so old renders stop matching
+TEMPLATE_VERSION = 2
+
+
+def letter_key(**fields) -> str:
+    """
+    Content address of a letter: SHA-256 over its canonical rendered inputs.
+    Guessable from a name and a few grid values, so it is only used internally for dedupe.
+    """
+    canonical = json.dumps({"v": TEMPLATE_VERSION, **fields}, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class LetterStore:
+    """
+    Content-addressed sanction letter cache.
+
+    Letters are stored once per distinct input set as `<key>.pdf`. Recently used
+    letters are also kept in memory (bounded by LETTER_MEMORY_BYTES) so they can be
+    served without touching disk. The on-disk store is bounded by total size
+    (LETTER_DISK_MAX_BYTES) and age (LETTER_MAX_AGE_DAYS); oldest letters go first.
+    """
+
+    def __init__(self, directory: Path = CACHE_DIR):
+        self.directory = Path(directory)
+        self.memory_limit = int(os.getenv("LETTER_MEMORY_BYTES", 32 * 1024 * 1024))
+        self.disk_limit = int(os.getenv("LETTER_DISK_MAX_BYTES", 512 * 1024 * 1024))
+        self.max_age = float(os.getenv("LETTER_MAX_AGE_DAYS", 30)) * 86400
+
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk: "OrderedDict[str, tuple[int, float]]" = OrderedDict()  # key -> (size, mtime), oldest first
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._scan()
+
+    def path(self, key: str) -> Path:
+        return self.directory / f"{key}.pdf"
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            if key in self._memory or key in self._disk:
+                return True
+        return self._adopt(key)
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return data
+            on_disk = key in self._disk
+        if not on_disk:
+            on_disk = self._adopt(key)
+        if on_disk:
+            try:
+                data = self.path(key).read_bytes()
+            except FileNotFoundError:
+                data = None
+            with self._lock:
+                if data is None:
+                    self._forget_disk(key)
+                else:
+                    self.disk_hits += 1
+                    self._remember(key, data)
+                    return data
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, data: bytes) -> Path:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.path(key)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        with self._lock:
+            self._forget_disk(key)
+            self._disk[key] = (len(data), time.time())
+            self._disk_bytes += len(data)
+            self._remember(key, data)
+            self._evict_disk()
+        return path
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+                "memory_letters": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_letters": len(self._disk),
+                "disk_bytes": self._disk_bytes,
+                "disk_limit_bytes": self.disk_limit,
+                "evictions": self.evictions,
+            }
+
+    # ------------------------------------
+    # Helpers (caller holds self._lock, except _scan)
+    # ------------------------------------
+    def _scan(self):
+        if not self.directory.exists():
+            return
+        entries = []
+        for p in self.directory.glob("*.pdf"):
+            st = p.stat()
+            entries.append((st.st_mtime, p.stem, st.st_size))
+        for mtime, key, size in sorted(entries):
+            self._disk[key] = (size, mtime)
+            self._disk_bytes += size
+        with self._lock:
+            self._evict_disk()
+
+    def _adopt(self, key) -> bool:
+        """Index a letter another worker process rendered into the shared directory since our scan."""
+        try:
+            st = self.path(key).stat()
+        except OSError:
+            return False
+        with self._lock:
+            if key not in self._disk:
+                self._disk[key] = (st.st_size, st.st_mtime)
+                self._disk_bytes += st.st_size
+        return True
+
+    def _remember(self, key, data):
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return
+        self._memory[key] = data
+        self._memory_bytes += len(data)
+        while self._memory_bytes > self.memory_limit and self._memory:
+            _, old = self._memory.popitem(last=False)
+            self._memory_bytes -= len(old)
+
+    def _forget_disk(self, key):
+        entry = self._disk.pop(key, None)
+        if entry:
+            self._disk_bytes -= entry[0]
+
+    def _evict_disk(self):
+        cutoff = time.time() - self.max_age
+        while self._disk:
+            key, (size, mtime) = next(iter(self._disk.items()))
+            if self._disk_bytes <= self.disk_limit and mtime >= cutoff:
+                break
+            self._forget_disk(key)
+            data = self._memory.pop(key, None)
+            if data is not None:
+                self._memory_bytes -= len(data)
+            self.path(key).unlink(missing_ok=True)
+            self.evictions += 1
@@ -0,0 +1,287 @@
+# backend/services/llm_guard.py
+
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+STATE_CODES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}  # as exported on /metrics
+
+
+class LLMUnavailable(Exception):
+    """No model answered within the latency budget, or the circuit is open."""
+
+
+class LatencyWindow:
+    """The most recent latencies of one kind of call, for percentile-based hedge thresholds."""
+
+    __slots__ = ("samples", "_lock")
+
+    def __init__(self, size: int = 200):
+        self.samples = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float):
+        with self._lock:
+            self.samples.append(seconds)
+
+    def percentile(self, p: float, min_samples: int) -> float | None:
+        with self._lock:
+            data = sorted(self.samples)
+        if len(data) < min_samples:
+            return None
+        return data[min(len(data) - 1, int(len(data) * p / 100))]
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure breaker. After `threshold` failed calls in a row it opens and
+    rejects calls for `cooldown` seconds; then a single probe is let through (half-open)
+    and its outcome closes or re-opens the circuit. A probe that never reports back
+    (its client went away) is replaced after another cooldown.
+    """
+
+    def __init__(self, threshold: int, cooldown: float, clock=time.monotonic):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.clock = clock
+        self.failures = 0
+        self.trips = 0
+        self.rejected = 0
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probe_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and self.clock() - self._opened_at >= self.cooldown:
+                return HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            now = self.clock()
+            if self._state == OPEN and now - self._opened_at >= self.cooldown:
+                self._state, self._probe_at = HALF_OPEN, None
+            if self._state == HALF_OPEN and (self._probe_at is None or now - self._probe_at >= self.cooldown):
+                self._probe_at = now
+                return True
+            self.rejected += 1
+            return False
+
+    def success(self):
+        with self._lock:
+            self.failures = 0
+            self._state, self._probe_at = CLOSED, None
+
+    def failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._state == HALF_OPEN or (self._state == CLOSED and self.failures >= self.threshold):
+                self._state, self._probe_at = OPEN, None
+                self._opened_at = self.clock()
+                self.trips += 1
+
+
+class LLMGuard:
+    """
+    Latency budget, hedging and circuit breaking around an OpenRouterClient.
+
+    Each call gets `budget` seconds end to end. If the primary model hasn't answered
+    (complete) or sent its first token (stream) by the hedge delay — a percentile of its
+    recent latencies — the same request goes to `hedge_model` as well and the first
+    answer wins; a primary that fails outright fails over the same way. Calls that fail
+    or run out of budget count toward the breaker, and while it is open every call
+    raises LLMUnavailable immediately, so callers can answer from a template.
+    """
+
+    def __init__(self, client, model: str, hedge_model: str | None = None):
+        self.client = client
+        self.models = (model, hedge_model or model)
+        self.budget = float(os.getenv("LLM_BUDGET_SECONDS", 8))
+        self.hedge_percentile = float(os.getenv("LLM_HEDGE_PERCENTILE", 95))
+        self.hedge_floor = float(os.getenv("LLM_HEDGE_MIN_SECONDS", 0.3))
+        self.hedge_default = float(os.getenv("LLM_HEDGE_DEFAULT_SECONDS", 2))  # until enough samples
+        self.min_samples = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", 20))
+        self.breaker = CircuitBreaker(
+            int(os.getenv("LLM_BREAKER_FAILURES", 5)), float(os.getenv("LLM_BREAKER_COOLDOWN_SECONDS", 30))
+        )
+        self.latency = {"complete": LatencyWindow(), "first_token": LatencyWindow()}
+        self.calls = self.hedged = self.hedge_wins = self.timeouts = self.errors = 0
+        self._pool: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def hedge_delay(self, kind: str) -> float:
+        p = self.latency[kind].percentile(self.hedge_percentile, self.min_samples)
+        return self.hedge_default if p is None else max(self.hedge_floor, p)
+
+    # ------------------------------------
+    # Blocking (threadpool) mode
+    # ------------------------------------
+    def complete(self, payload: dict) -> dict:
+        """The first successful chat completion within the budget, or LLMUnavailable."""
+        self._admit()
+        t0 = time.monotonic()
+        deadline, hedge_at = t0 + self.budget, t0 + self.hedge_delay("complete")
+        # Attempts run on the guard's pool so this thread can stop waiting at the deadline;
+        # each carries the remaining budget as its HTTP timeout, so a loser doesn't linger.
+        attempts = {self._executor().submit(self._attempt, payload, 0, self.budget): 0}
+        launched, error = 1, None
+        while True:
+            now = time.monotonic()
+            if now >= deadline or not (attempts or launched < 2):
+                break
+            if launched < 2 and (not attempts or now >= hedge_at):
+                attempts[self._executor().submit(self._attempt, payload, 1, deadline - now)] = 1
+                launched += 1
+                self._bump("hedged")
+                continue
+            timeout = deadline - now if launched == 2 else min(deadline, hedge_at) - now
+            done, _ = wait(attempts, timeout=timeout, return_when=FIRST_COMPLETED)
+            for fut in done:
+                idx = attempts.pop(fut)
+                try:
+                    data = fut.result()
+                except Exception as e:
+                    error = e
+                    continue
+                self._won(idx)
+                return data
+        raise self._failed(error) from error
+
+    def _attempt(self, payload: dict, idx: int, timeout: float) -> dict:
+        t0 = time.monotonic()
+        data = self.client.complete({**payload, "model": self.models[idx]}, timeout=timeout)
+        if idx == 0:
+            self.latency["complete"].add(time.monotonic() - t0)
+        return data
+
+    # ------------------------------------
+    # Async mode
+    # ------------------------------------
+    async def stream(self, payload: dict):
+        """
+        Content deltas from the first model to start streaming within the budget.
+        Raises LLMUnavailable before the first token if none does, or mid-stream when
+        the winner fails or stalls for longer than the budget.
+        """
+        self._admit()
+        loop = asyncio.get_running_loop()
+        t0 = loop.time()
+        deadline, hedge_at = t0 + self.budget, t0 + self.hedge_delay("first_token")
+        streams, pending = [], {}
+
+        def launch(idx):
+            gen = self.client.astream({**payload, "model": self.models[idx]})
+            streams.append(gen)
+            pending[asyncio.ensure_future(gen.__anext__())] = (idx, gen)
+
+        launch(0)
+        winner, error = None, None
+        try:
+            while winner is None:
+                now = loop.time()
+                if now >= deadline or not (pending or len(streams) < 2):
+                    break
+                if len(streams) < 2 and (not pending or now >= hedge_at):
+                    launch(1)
+                    self._bump("hedged")
+                    continue
+                timeout = deadline - now if len(streams) == 2 else min(deadline, hedge_at) - now
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    idx, gen = pending.pop(task)
+                    try:
+                        first = task.result()
+                    except StopAsyncIteration:
+                        first = None  # an empty answer is still an answer
+                    except Exception as e:
+                        error = e
+                        continue
+                    winner = (idx, gen, first)
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            for gen in streams:
+                if winner is None or gen is not winner[1]:
+                    await gen.aclose()
+        if winner is None:
+            raise self._failed(error) from error
+
+        idx, gen, first = winner
+        # A primary that lost is at least this slow; keeping that lower bound stops the
+        # threshold from drifting down to only the fast answers that won
+        self.latency["first_token"].add(loop.time() - t0)
+        if idx == 1:
+            self._bump("hedge_wins")
+        try:
+            if first is not None:
+                yield first
+                while True:
+                    yield await asyncio.wait_for(gen.__anext__(), timeout=self.budget)
+        except StopAsyncIteration:
+            self.breaker.success()
+        except Exception as e:
+            raise self._failed(e) from e
+        finally:
+            await gen.aclose()
+        if first is None:
+            self.breaker.success()
+
+    # ------------------------------------
+    # Helpers
+    # ------------------------------------
+    def stats(self) -> dict:
+        return {
+            "state": self.breaker.state,
+            "calls": self.calls,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "rejected": self.breaker.rejected,
+            "trips": self.breaker.trips,
+        }
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _admit(self):
+        if not self.breaker.allow():
+            raise LLMUnavailable("circuit open")
+        self._bump("calls")
+
+    def _won(self, idx: int):
+        self.breaker.success()
+        if idx == 1:
+            self._bump("hedge_wins")
+
+    def _failed(self, error: Exception | None) -> LLMUnavailable:
+        self.breaker.failure()
+        if error is None or isinstance(error, asyncio.TimeoutError):
+            self._bump("timeouts")
+            return LLMUnavailable(f"no answer within {self.budget:g}s")
+        self._bump("errors")
+        return LLMUnavailable(str(error) or type(error).__name__)
+
+    def _bump(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(int(os.getenv("LLM_WORKERS", 16)), thread_name_prefix="llm")
+        return self._pool
@@ -0,0 +1,190 @@
+# backend/services/metrics.py
+
+import bisect
+import threading
+import time
+
+# Latency buckets (seconds) wide enough for in-process handlers and remote LLM calls alike
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(v) -> str:
+    if v == float("inf"):
+        return "+Inf"
+    return repr(float(v)) if isinstance(v, float) else str(v)
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labels=()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+        self._series: dict = {}
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(n, "")) for n in self.label_names)
+
+    def header(self) -> list:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def header(self) -> list:
+        return [f"# HELP {self.name}_total {self.help}", f"# TYPE {self.name}_total counter"]
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+
+    def render(self) -> list:
+        with self._lock:
+            items = list(self._series.items())
+        return [f"{self.name}_total{_labels(self.label_names, k)} {_number(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, seconds: float, **labels):
+        key = self._key(labels)
+        i = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            row = self._series.get(key)
+            if row is None:
+                row = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            row[0][i] += 1
+            row[1] += seconds
+            row[2] += 1
+
+    def time(self, **labels):
+        """Context manager observing the elapsed time of its block."""
+        return _Timer(self, labels)
+
+    def render(self) -> list:
+        with self._lock:
+            items = [(k, list(counts), total, n) for k, (counts, total, n) in self._series.items()]
+        lines = []
+        for key, counts, total, n in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="' + _number(bound) + '"'
+                lines.append(f"{self.name}_bucket{_labels(self.label_names, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, key)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, key)} {n}")
+        return lines
+
+
+class Callback(_Metric):
+    """Gauge (or counter) read from a function at scrape time, e.g. a queue depth."""
+
+    def __init__(self, name: str, help: str, fn, kind: str = "gauge"):
+        super().__init__(name, help)
+        self.fn = fn
+        self.kind = kind
+        if kind == "counter":
+            self.header = lambda: [f"# HELP {name}_total {help}", f"# TYPE {name}_total counter"]
+
+    def render(self) -> list:
+        try:
+            value = self.fn()
+        except Exception:
+            return []  # a failing probe must not break the whole scrape
+        suffix = "_total" if self.kind == "counter" else ""
+        return [f"{self.name}{suffix} {_number(value)}"]
+
+
+class _Timer:
+    __slots__ = ("histogram", "labels", "t0")
+
+    def __init__(self, histogram, labels):
+        self.histogram, self.labels = histogram, labels
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, *_):
+        labels = self.labels
+        if "outcome" in self.histogram.label_names and "outcome" not in labels:
+            labels = {**labels, "outcome": "error" if exc_type else "ok"}
+        self.histogram.observe(time.perf_counter() - self.t0, **labels)
+
+
+class Registry:
+    """
+    Minimal Prometheus registry rendering the text exposition format (0.0.4).
+    Metrics are get-or-create by name, so modules can declare what they record at import.
+    """
+
+    def __init__(self):
+        self._metrics: dict = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name, help, labels=()) -> Counter:
+        return self._get(name, lambda: Counter(name, help, labels))
+
+    def histogram(self, name, help, labels=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._get(name, lambda: Histogram(name, help, labels, buckets))
+
+    def callback(self, name, help, fn, kind: str = "gauge") -> Callback:
+        with self._lock:
+            self._metrics[name] = Callback(name, help, fn, kind)  # re-registering replaces the probe
+            return self._metrics[name]
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines += metric.header() + metric.render()
+        return "\n".join(lines) + "\n"
+
+    def _get(self, name, factory):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = factory()
+            return metric
+
+
+REGISTRY = Registry()
+
+# ==============================
+# SHARED METRICS
+# ==============================
+HTTP_REQUESTS = REGISTRY.counter(
+    "capitalmitra_http_requests", "HTTP requests by route template and status.", ("method", "route", "status")
+)
+HTTP_LATENCY = REGISTRY.histogram(
+    "capitalmitra_http_request_duration_seconds", "Time to response headers, by route template.", ("method", "route")
+)
+TURN_LATENCY = REGISTRY.histogram(
+    "capitalmitra_conversation_turn_seconds", "MasterAgent handler time per conversation state.", ("state",)
+)
+DEPENDENCY_LATENCY = REGISTRY.histogram(
+    "capitalmitra_dependency_seconds",
+    "External dependency call time (llm, smtp, pdf, data_load, bureau).",
+    ("dependency", "operation", "outcome"),
+)
@@ -0,0 +1,221 @@
+# backend/services/offer_engine.py
+
+import bisect
+import re
+import threading
+
+from backend.data.customer_store import CustomerStore, get_customer_store
+from backend.services.amortization import emi
+
+# ==============================
+# ELIGIBILITY PARSING
+# ==============================
+_UNITS = {"lakh": 100000, "lakhs": 100000, "lac": 100000, "crore": 10000000, "crores": 10000000}
+_MONEY = r"(?:₹|rs\.?|inr)\s*([\d,]+(?:\.\d+)?)\s*(lakhs?|lac|crores?)?"
+
+_SCORE_RE = re.compile(r"(?:minimum\s+credit\s+score|credit\s+score\s+(above|over|of\s+at\s+least|at\s+least|minimum))\s*(\d{3})")
+_INCOME_RE = re.compile(r"income\s+(above|over|of\s+at\s+least|at\s+least|minimum)\s*" + _MONEY)
+_UP_TO_RE = re.compile(r"up\s+to\s+" + _MONEY)
+_SELF_EMPLOYED_RE = re.compile(r"self[-\s]employed|business\s+owners?")
+_SALARIED_RE = re.compile(r"salaried")
+# Whole words only, and not negated: "unverified" or "not verified" must not set the flag
+_VERIFIED_RE = re.compile(r"(?<!\bnot\s)(?<!non-)\bverified\b")
+_EXISTING_RE = re.compile(r"(?<!\bnot\s)(?<!non-)\bexisting\b")
+
+
+def _money(number: str, unit: str | None) -> int:
+    return int(float(number.replace(",", "")) * _UNITS.get((unit or "").lower(), 1))
+
+
+class OfferRule:
+    """An offer with its free-text eligibility compiled into structured predicates."""
+
+    __slots__ = ("offer", "offer_id", "rate", "tenure", "min_score", "min_income",
+                 "max_amount", "employment", "verified_only", "existing_only")
+
+    def __init__(self, offer: dict):
+        self.offer = offer
+        self.offer_id = offer.get("offer_id")
+        self.rate = float(offer.get("interest_rate", 0))
+        self.tenure = int(offer.get("tenure_months", 0))
+
+        rules = (offer.get("eligibility") or "").lower()
+        blurb = f"{offer.get('title', '')} {offer.get('description', '')}".lower()
+
+        # Scores and incomes are whole numbers, so "above X" means at least X + 1
+        m = _SCORE_RE.search(rules)
+        self.min_score = 0 if m is None else int(m.group(2)) + (m.group(1) in ("above", "over"))
+        m = _INCOME_RE.search(rules)
+        self.min_income = 0 if m is None else _money(m.group(2), m.group(3)) + (m.group(1) in ("above", "over"))
+        m = _UP_TO_RE.search(blurb)
+        self.max_amount = None if m is None else _money(m.group(1), m.group(2))
+
+        text = f"{rules} {blurb}"
+        self.employment = frozenset(
+            kind for kind, pattern in (("Self-Employed", _SELF_EMPLOYED_RE), ("Salaried", _SALARIED_RE))
+            if pattern.search(text)
+        ) or None
+        self.verified_only = _VERIFIED_RE.search(rules) is not None
+        self.existing_only = _EXISTING_RE.search(rules) is not None
+
+    def describe(self) -> dict:
+        return {
+            "offer_id": self.offer_id,
+            "title": self.offer.get("title"),
+            "interest_rate": self.rate,
+            "tenure_months": self.tenure,
+            "min_score": self.min_score,
+            "min_income": self.min_income,
+            "max_amount": self.max_amount,
+            "employment": sorted(self.employment) if self.employment else None,
+            "verified_only": self.verified_only,
+            "existing_only": self.existing_only,
+        }
+
+
+# ==============================
+# INDEXED MATCHER
+# ==============================
+class OfferEngine:
+    """
+    Ranked offer matching over the offers.json catalogue.
+
+    Eligibility text is parsed once into OfferRule predicates. Each predicate is then
+    indexed as bitmasks over the catalogue (bit i = offer i): sorted score and income
+    thresholds and amount ceilings are bisected to a precomputed mask, employment type
+    and verification map straight to masks, and the customer's eligible set is their
+    intersection. Offers are numbered in rank order (lowest rate first), so ranking is
+    just walking the set bits. The index is rebuilt when the store reloads offers.json.
+    """
+
+    def __init__(self, store: CustomerStore | None = None):
+        self.store = store or get_customer_store()
+        self._lock = threading.Lock()
+        self._catalogue = None  # offers list the index was built from
+        self.matches = 0
+        self._build()
+
+    def rules(self) -> list:
+        self._build()
+        return self._rules
+
+    def match(self, customer: dict, amount: int | None = None, limit: int | None = None) -> list:
+        """Eligible offers for a customer record, best first, with an indicative EMI."""
+        self._build()
+        mask = self._eligible_mask(customer, amount)
+        self.matches += 1
+
+        out = []
+        while mask and (limit is None or len(out) < limit):
+            low = mask & -mask
+            rule = self._rules[low.bit_length() - 1]
+            mask ^= low
+            principal = amount or min(int(customer.get("pre_approved_limit", 0)), rule.max_amount or 1 << 62)
+            out.append({
+                "offer_id": rule.offer_id,
+                "title": rule.offer.get("title"),
+                "interest_rate": rule.rate,
+                "tenure_months": rule.tenure,
+                "max_amount": rule.max_amount,
+                "amount": principal,
+                "emi": round(emi(principal, rule.rate, rule.tenure), 2) if principal and rule.tenure else None,
+            })
+        return out
+
+    def match_customer(self, customer_id: str, amount: int | None = None, limit: int | None = None) -> list | None:
+        cust = self.store.by_id(customer_id)
+        return None if cust is None else self.match(cust, amount, limit)
+
+    def match_all(self, customer_ids=None, amount: int | None = None, limit: int | None = None):
+        """
+        Campaign matching: yield {"customer_id", "offers": [...]} for each customer
+        (the whole base when `customer_ids` is None). Unknown ids yield offers=None.
+        """
+        if customer_ids is None:
+            pairs = ((c.get("customer_id"), c) for c in self.store.customers())
+        else:
+            pairs = ((cid, self.store.by_id(cid)) for cid in customer_ids)
+        for cid, cust in pairs:
+            yield {"customer_id": cid, "offers": None if cust is None else self.match(cust, amount, limit)}
+
+    def audience(self, customer_ids=None, amount: int | None = None) -> dict:
+        """How many customers each offer reaches — campaign sizing without building the lists."""
+        counts = {rule.offer_id: 0 for rule in self.rules()}
+        for row in self.match_all(customer_ids, amount):
+            for offer in row["offers"] or ():
+                counts[offer["offer_id"]] += 1
+        return counts
+
+    # ------------------------------------
+    # Helpers
+    # ------------------------------------
+    def _eligible_mask(self, customer: dict, amount: int | None) -> int:
+        cid = customer.get("customer_id")
+        score = self.store.credit_score(cid)
+        if score is None:
+            score = int(customer.get("credit_score") or 0)
+        income = int(customer.get("monthly_income") or 0)
+
+        mask = self._score_masks[bisect.bisect_right(self._score_cuts, score)]
+        mask &= self._income_masks[bisect.bisect_right(self._income_cuts, income)]
+        mask &= self._employment_masks.get(customer.get("employment_type"), self._open_employment)
+        if amount:
+            mask &= self._amount_masks[bisect.bisect_left(self._amount_cuts, int(amount))]
+        if self.store.crm_record(cid) is None:
+            mask &= ~self._existing_only
+        if not self.store.is_verified(cid):
+            mask &= ~self._verified_only
+        return mask
+
+    def _build(self):
+        offers = self.store.offers()
+        if offers is self._catalogue:
+            return
+        with self._lock:
+            if offers is self._catalogue:
+                return
+            rules = sorted((OfferRule(o) for o in offers), key=lambda r: (r.rate, -(r.max_amount or 0), r.offer_id))
+            bits = [1 << i for i in range(len(rules))]
+
+            def threshold_index(values):
+                # cuts[k] = k-th distinct threshold; masks[k] = offers whose threshold <= cuts[k-1]
+                cuts = sorted(set(values))
+                masks = [sum(b for b, v in zip(bits, values) if v <= (cuts[k - 1] if k else -1))
+                         for k in range(len(cuts) + 1)]
+                return cuts, masks
+
+            self._score_cuts, self._score_masks = threshold_index([r.min_score for r in rules])
+            self._income_cuts, self._income_masks = threshold_index([r.min_income for r in rules])
+
+            # amount_masks[k] = offers whose ceiling is >= amount_cuts[k] (uncapped offers always)
+            self._amount_cuts = sorted({r.max_amount for r in rules if r.max_amount is not None})
+            uncapped = sum(b for b, r in zip(bits, rules) if r.max_amount is None)
+            self._amount_masks = [
+                uncapped | sum(b for b, r in zip(bits, rules) if r.max_amount is not None and r.max_amount >= cut)
+                for cut in self._amount_cuts
+            ] + [uncapped]
+
+            self._open_employment = sum(b for b, r in zip(bits, rules) if r.employment is None)
+            kinds = {kind for r in rules for kind in (r.employment or ())}
+            self._employment_masks = {
+                kind: self._open_employment | sum(b for b, r in zip(bits, rules) if r.employment and kind in r.employment)
+                for kind in kinds
+            }
+            self._verified_only = sum(b for b, r in zip(bits, rules) if r.verified_only)
+            self._existing_only = sum(b for b, r in zip(bits, rules) if r.existing_only)
+            self._rules = rules
+            self._catalogue = offers
+
+
+_engine: OfferEngine | None = None
+_engine_lock = threading.Lock()
+
+
+def get_offer_engine() -> OfferEngine:
+    """Process-wide shared offer engine, built on first use."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = OfferEngine()
+    return _engine
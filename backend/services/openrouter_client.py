@@ -0,0 +1,113 @@
+# backend/services/openrouter_client.py
+
+import json
+import os
+import threading
+import time
+
+import httpx
+
+from backend.services.metrics import DEPENDENCY_LATENCY
+
+DEFAULT_API_URL = "https://openrouter.ai/api/v1/chat/completions"
+
+
+class OpenRouterClient:
+    """
+    Pooled OpenRouter chat-completions client.
+    Keeps one keep-alive connection pool per mode (sync for the threaded /chat/ path,
+    async for streaming) so TLS handshakes are paid once per connection, not per message.
+    """
+
+    def __init__(self, api_key: str, api_url: str | None = None, headers: dict | None = None):
+        self.api_url = api_url or os.getenv("OPENROUTER_API_URL", DEFAULT_API_URL)
+        self.headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+            **(headers or {}),
+        }
+        self.timeout = httpx.Timeout(
+            float(os.getenv("OPENROUTER_READ_TIMEOUT", 20)),
+            connect=float(os.getenv("OPENROUTER_CONNECT_TIMEOUT", 3)),
+        )
+        self.limits = httpx.Limits(
+            max_connections=int(os.getenv("OPENROUTER_MAX_CONNECTIONS", 20)),
+            max_keepalive_connections=int(os.getenv("OPENROUTER_MAX_KEEPALIVE", 10)),
+        )
+        self._client: httpx.Client | None = None
+        self._aclient: httpx.AsyncClient | None = None
+        self._lock = threading.Lock()
+
+    # ------------------------------------
+    # Blocking (threadpool) mode
+    # ------------------------------------
+    def complete(self, payload: dict, timeout: float | None = None) -> dict:
+        """`timeout` (seconds) overrides the client's default for this request, e.g. a remaining budget."""
+        timeout = httpx.USE_CLIENT_DEFAULT if timeout is None else timeout
+        with DEPENDENCY_LATENCY.time(dependency="llm", operation="complete"):
+            res = self._sync_client().post(self.api_url, json=payload, timeout=timeout)
+            res.raise_for_status()
+            return res.json()
+
+    # ------------------------------------
+    # Async mode
+    # ------------------------------------
+    async def acomplete(self, payload: dict) -> dict:
+        with DEPENDENCY_LATENCY.time(dependency="llm", operation="complete"):
+            res = await self._async_client().post(self.api_url, json=payload)
+            res.raise_for_status()
+            return res.json()
+
+    async def astream(self, payload: dict):
+        """Yield content deltas as the server emits them (OpenAI-style SSE chunks)."""
+        payload = {**payload, "stream": True}
+        with DEPENDENCY_LATENCY.time(dependency="llm", operation="stream"):
+            t0, first = time.perf_counter(), True
+            async with self._async_client().stream("POST", self.api_url, json=payload) as res:
+                res.raise_for_status()
+                async for line in res.aiter_lines():
+                    # Blank lines separate events; ':' lines are keep-alive comments
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        break
+                    chunk = json.loads(data)
+                    delta = (chunk.get("choices") or [{}])[0].get("delta", {}).get("content")
+                    if delta:
+                        if first:
+                            first = False
+                            DEPENDENCY_LATENCY.observe(
+                                time.perf_counter() - t0, dependency="llm", operation="first_token", outcome="ok"
+                            )
+                        yield delta
+
+    def close(self):
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    async def aclose(self):
+        self.close()
+        if self._aclient is not None:
+            await self._aclient.aclose()
+            self._aclient = None
+
+    # ------------------------------------
+    # Helpers
+    # ------------------------------------
+    def _sync_client(self) -> httpx.Client:
+        # Concurrent first requests must share one pool, not each build (and leak) their own
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = httpx.Client(headers=self.headers, timeout=self.timeout, limits=self.limits)
+        return self._client
+
+    def _async_client(self) -> httpx.AsyncClient:
+        # Created lazily so it binds to the running event loop
+        if self._aclient is None:
+            with self._lock:
+                if self._aclient is None:
+                    self._aclient = httpx.AsyncClient(headers=self.headers, timeout=self.timeout, limits=self.limits)
+        return self._aclient
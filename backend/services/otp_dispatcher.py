@@ -0,0 +1,132 @@
+# backend/services/otp_dispatcher.py
+
+import os
+import queue
+import secrets
+import smtplib
+import threading
+import time
+from collections import OrderedDict
+
+# Failures that retrying cannot fix
+PERMANENT_ERRORS = (smtplib.SMTPRecipientsRefused, smtplib.SMTPAuthenticationError, smtplib.SMTPSenderRefused)
+
+_STOP = object()
+
+
+class OTPDispatcher:
+    """
+    Background OTP delivery queue.
+
+    `submit()` returns a job id immediately; a bounded pool of worker threads
+    delivers through `transport.send_otp(destination, otp)` — EmailOTPService or
+    the Fast2SMS OTPService — retrying transient failures with exponential backoff.
+    Each worker reuses its transport connection across messages. An optional
+    `notify(job_id, status)` callback runs on the worker once the job is sent or failed.
+    """
+
+    def __init__(self, transport, workers: int | None = None, max_retries: int | None = None,
+                 backoff: float | None = None, name: str = "otp"):
+        self.transport = transport
+        self.name = name
+        self.workers = workers or int(os.getenv("OTP_WORKERS", 2))
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("OTP_MAX_RETRIES", 3))
+        self.backoff = backoff if backoff is not None else float(os.getenv("OTP_RETRY_BACKOFF", 0.5))
+        self.max_jobs = int(os.getenv("OTP_JOB_HISTORY", 10000))
+
+        self._queue: queue.Queue = queue.Queue()
+        self._jobs: "OrderedDict[str, dict]" = OrderedDict()
+        self._notify: dict = {}  # job id -> callback
+        self._lock = threading.Lock()
+        self._threads: list[threading.Thread] = []
+        self.sent = 0
+        self.failed = 0
+
+    def submit(self, destination: str, otp: str, notify=None) -> str:
+        self._ensure_workers()
+        job_id = secrets.token_hex(8)
+        with self._lock:
+            self._jobs[job_id] = {"status": "queued", "attempts": 0, "error": None, "queued_at": time.time()}
+            if notify is not None:
+                self._notify[job_id] = notify
+            while len(self._jobs) > self.max_jobs:
+                self._notify.pop(self._jobs.popitem(last=False)[0], None)
+        self._queue.put((job_id, destination, otp))
+        return job_id
+
+    def status(self, job_id: str | None) -> dict | None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def shutdown(self, wait: bool = True):
+        for _ in self._threads:
+            self._queue.put(_STOP)
+        if wait:
+            for t in self._threads:
+                t.join(timeout=5)
+        self._threads = []
+
+    # ------------------------------------
+    # Workers
+    # ------------------------------------
+    def _ensure_workers(self):
+        if self._threads:
+            return
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                t = threading.Thread(target=self._work, name=f"{self.name}-dispatch-{i}", daemon=True)
+                t.start()
+                self._threads.append(t)
+
+    def _work(self):
+        try:
+            while True:
+                item = self._queue.get()
+                if item is _STOP:
+                    return
+                self._deliver(*item)
+        finally:
+            close = getattr(self.transport, "close", None)
+            if close:
+                close()
+
+    def _deliver(self, job_id, destination, otp):
+        for attempt in range(1, self.max_retries + 2):
+            self._update(job_id, status="sending", attempts=attempt)
+            try:
+                self.transport.send_otp(destination, otp)
+            except PERMANENT_ERRORS as e:
+                return self._finish(job_id, "failed", str(e))
+            except Exception as e:
+                if attempt > self.max_retries:
+                    return self._finish(job_id, "failed", str(e))
+                self._update(job_id, status="retrying", error=str(e))
+                time.sleep(self.backoff * 2 ** (attempt - 1))
+            else:
+                return self._finish(job_id, "sent", None)
+
+    def _finish(self, job_id, status, error):
+        self._update(job_id, status=status, error=error, finished_at=time.time())
+        with self._lock:
+            if status == "sent":
+                self.sent += 1
+            else:
+                self.failed += 1
+            notify = self._notify.pop(job_id, None)
+        if notify is not None:
+            try:
+                notify(job_id, self.status(job_id))
+            except Exception:
+                pass  # a listener must never break delivery
+
+    def _update(self, job_id, **fields):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.update(fields)
@@ -2,6 +2,8 @@ import os
 import requests
 import random
 
+from backend.services.metrics import DEPENDENCY_LATENCY
+
 def generate_otp(length=6):
     return str(random.randint(10**(length-1), 10**length-1))
 
@@ -11,6 +13,10 @@ class OTPService:
         self.api_url = "https://www.fast2sms.com/dev/bulkV2"
         if not self.api_key:
             raise ValueError("FAST2SMS_API_KEY not set in environment variables.")
+        # Keep-alive session shared by OTPDispatcher workers
+        self.session = requests.Session()
+        self.session.headers["authorization"] = self.api_key
+        self.timeout = (float(os.getenv("FAST2SMS_CONNECT_TIMEOUT", 3)), float(os.getenv("FAST2SMS_READ_TIMEOUT", 10)))
 
     def send_otp(self, phone: str, otp: str):
         numbers = phone.replace("+91-", "").replace("+91", "")
@@ -19,9 +25,10 @@ class OTPService:
             "route": "otp",
             "numbers": numbers
         }
-        headers = {
-            "authorization": self.api_key
-        }
-        response = requests.post(self.api_url, data=data, headers=headers)
-        response.raise_for_status()
-        return response.json()
+        with DEPENDENCY_LATENCY.time(dependency="sms", operation="send"):
+            response = self.session.post(self.api_url, data=data, timeout=self.timeout)
+            response.raise_for_status()
+            return response.json()
+
+    def close(self):
+        self.session.close()
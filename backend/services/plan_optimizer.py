@@ -0,0 +1,153 @@
+# backend/services/plan_optimizer.py
+
+import numpy as np
+
+from backend.services.amortization import emi_array
+from backend.services.batch_underwriting import adjust_rates
+from backend.services.underwriting_policy import AFFORDABILITY_CAP, MAX_TENURE
+
+TENURE_GRID = np.arange(6, MAX_TENURE + 1)  # every month from 6 to 84
+AMOUNT_STEPS = np.linspace(1.0, 0.5, 6)  # requested amount down to half, in 10% steps
+COMFORT = 30  # EMI % of income SmartAdvisor calls "well within a safe affordability range"
+
+
+class PlanGrid:
+    """
+    Every (amount, tenure) plan for one applicant: A amounts × T tenures, evaluated in
+    one vectorized pass and rounded the way UnderwritingAgent.evaluate_loan rounds.
+    """
+
+    __slots__ = ("amounts", "tenures", "rates", "emis", "total_interest", "processing_fee",
+                 "affordability", "feasible")
+
+    def frontier(self, rows=slice(None)):
+        """Pareto mask of the given amount rows over (EMI, total interest, affordability)."""
+        feasible = self.feasible[rows]
+        objectives = (self.emis[rows], self.total_interest[rows], self.affordability[rows])
+        if feasible.ndim == 1:
+            return pareto_rows(tuple(obj[None, :] for obj in objectives), feasible[None, :])[0]
+        return pareto_rows(objectives, feasible)
+
+    def plan(self, row: int, col: int) -> dict:
+        """One plan as an evaluate_loan option dict (plain Python numbers)."""
+        return {
+            "tenure": int(self.tenures[col]),
+            "rate": float(self.rates[col]),
+            "emi": float(self.emis[row, col]),
+            "total_interest": float(self.total_interest[row, col]),
+            "processing_fee": int(self.processing_fee[row]),
+            "affordability": float(self.affordability[row, col]),
+            "amount": int(self.amounts[row]),
+        }
+
+
+def plan_grid(amounts, income, credit_score, base_rate=10.95, tenures=TENURE_GRID, cap=AFFORDABILITY_CAP) -> PlanGrid:
+    amounts = np.atleast_1d(np.asarray(amounts, dtype=np.int64))
+    tenures = np.asarray(tenures, dtype=np.int64)
+    rates = adjust_rates(base_rate, tenures, credit_score)
+    emis = emi_array(amounts[:, None].astype(float), rates[None, :], tenures[None, :])
+
+    grid = PlanGrid()
+    grid.amounts, grid.tenures, grid.rates = amounts, tenures, np.round(rates, 2)
+    grid.emis = np.round(emis, 2)
+    grid.total_interest = np.round(emis * tenures[None, :] - amounts[:, None], 2)
+    grid.processing_fee = np.maximum(999, np.round(amounts * 0.008)).astype(np.int64)
+    grid.affordability = np.round(emis / income * 100, 2) if income > 0 else np.full(emis.shape, np.inf)
+    grid.feasible = grid.affordability <= cap
+    return grid
+
+
+def pareto_rows(objectives, feasible):
+    """
+    Per-row Pareto mask, all objectives minimized: a feasible plan is on its row's frontier
+    unless another feasible plan in the same row is no worse on every objective and better
+    on at least one. All rows are compared at once (an A×T×T broadcast over the tenures
+    feasible in some row).
+    """
+    out = np.zeros_like(feasible)
+    cols = np.flatnonzero(feasible.any(axis=0))
+    n = len(cols)
+    # [row, dominator, candidate]; the dominator side is materialized so every comparison
+    # runs over a contiguous last axis
+    no_worse = np.repeat(feasible[:, cols, None], n, axis=2)
+    better = np.zeros_like(no_worse)
+    for obj in objectives:
+        obj = obj[:, cols]
+        a, b = np.repeat(obj[:, :, None], n, axis=2), obj[:, None, :]
+        no_worse &= a <= b
+        better |= a < b
+    out[:, cols] = feasible[:, cols] & ~(no_worse & better).any(axis=1)
+    return out
+
+
+def supported(emis, interest):
+    """
+    Indices (into the given frontier points) on the lower convex hull of EMI vs. total
+    interest: the plans that are the cheapest for *some* trade-off between the two. Points
+    inside the hull — e.g. the first month past a rate step — buy EMI relief at a worse
+    interest price than a neighbour and are left out.
+    """
+    xs, ys = np.asarray(emis).tolist(), np.asarray(interest).tolist()
+    hull = []
+    for i in np.argsort(emis, kind="stable").tolist():
+        while len(hull) >= 2:
+            o, a = hull[-2], hull[-1]
+            if (xs[a] - xs[o]) * (ys[i] - ys[o]) - (ys[a] - ys[o]) * (xs[i] - xs[o]) > 0:
+                break
+            hull.pop()
+        hull.append(i)
+    return hull
+
+
+def recommend(grid: PlanGrid, preferred_tenure: int | None = None, row: int = 0) -> list:
+    """
+    The few frontier plans worth presenting for amount row `row`: lowest total interest,
+    lowest EMI, the best balance between them (the hull point furthest below the straight
+    line joining the two, in normalized units) and the preferred tenure if it is feasible.
+    Each plan carries its `labels`; sorted by tenure.
+    """
+    cols = np.flatnonzero(grid.frontier(row))
+    if not len(cols):
+        return []
+    emis, interest = grid.emis[row, cols], grid.total_interest[row, cols]
+    picks = {}
+
+    def pick(col, label):
+        picks.setdefault(int(col), []).append(label)
+
+    lo_interest, lo_emi = int(np.argmin(interest)), int(np.argmin(emis))
+    pick(cols[lo_interest], "lowest interest")
+    pick(cols[lo_emi], "lowest EMI")
+
+    hull = supported(emis, interest)
+    span_e, span_i = emis[lo_interest] - emis[lo_emi], interest[lo_emi] - interest[lo_interest]
+    if len(hull) > 2 and span_e > 0 and span_i > 0:
+        # Normalized, the chord runs from (0, 1) at lowest EMI to (1, 0) at lowest interest
+        x = (emis[hull] - emis[lo_emi]) / span_e
+        y = (interest[hull] - interest[lo_interest]) / span_i
+        knee = hull[int(np.argmax(1 - x - y))]
+        if knee not in (lo_interest, lo_emi):
+            pick(cols[knee], "best balance")
+
+    if preferred_tenure is not None:
+        match = np.flatnonzero((grid.tenures == preferred_tenure) & grid.feasible[row])
+        if len(match):
+            pick(match[0], "your choice")
+
+    return [{**grid.plan(row, col), "labels": labels} for col, labels in sorted(picks.items())]
+
+
+def comfortable_amount(grid: PlanGrid, tenure: int, comfort: float = COMFORT) -> dict | None:
+    """
+    When the first row's plan at `tenure` takes more than `comfort`% of income, the largest
+    grid amount whose plan at that tenure stays within it; otherwise None.
+    """
+    col = np.flatnonzero(grid.tenures == tenure)
+    if not len(col):
+        return None
+    col = int(col[0])
+    afford = grid.affordability[:, col]
+    if afford[0] <= comfort:
+        return None
+    rows = np.flatnonzero(afford <= comfort)
+    return grid.plan(int(rows[0]), col) if len(rows) else None
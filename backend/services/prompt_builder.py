@@ -0,0 +1,142 @@
+# backend/services/prompt_builder.py
+
+import os
+import re
+
+from backend.services.metrics import REGISTRY
+
+# Per-message framing the chat APIs add on top of the content
+MESSAGE_OVERHEAD = 4
+
+PROMPT_TOKENS = REGISTRY.histogram(
+    "capitalmitra_llm_prompt_tokens",
+    "Estimated prompt tokens per LLM call.",
+    ("history",),
+    buckets=(64, 128, 256, 512, 1024, 2048, 4096, 8192),
+)
+PROMPT_TOKENS_SAVED = REGISTRY.counter(
+    "capitalmitra_llm_prompt_tokens_saved",
+    "Estimated tokens not sent thanks to summarizing older turns, versus the full transcript.",
+)
+
+_SENTENCE = re.compile(r"(?<=[.!?])\s")
+
+
+def estimate_tokens(text: str) -> int:
+    """~4 characters per token: close enough for budgeting without shipping a tokenizer."""
+    return (len(text or "") + 3) // 4
+
+
+def _clip(text: str, words: int) -> str:
+    parts = (text or "").split()
+    return " ".join(parts[:words]) + ("…" if len(parts) > words else "")
+
+
+def summarize_turn(question: str, answer: str) -> str:
+    """One summary line per folded exchange: the question and the answer's first sentence."""
+    first = _SENTENCE.split((answer or "").strip(), 1)[0]
+    return f"- Customer asked: {_clip(question, 20)} | You answered: {_clip(first, 25)}"
+
+
+class Transcript:
+    """
+    The AI exchanges of one conversation. Only advisor Q&A is kept: KYC answers
+    (email, phone, PAN) never enter it, and what the flow learned reaches the
+    model through the structured context instead. Recent turns stay verbatim;
+    older ones are folded into summary lines once, when they leave the window,
+    so the rolling summary is never recomputed per call.
+    """
+
+    __slots__ = ("turns", "summary", "folded", "tokens")
+
+    def __init__(self, turns=None, summary=None, folded: int = 0, tokens: int = 0):
+        self.turns = turns or []  # [question, answer] pairs, oldest first
+        self.summary = summary or []  # one line per folded turn, oldest first
+        self.folded = folded
+        self.tokens = tokens  # every exchange ever recorded, i.e. what the full transcript would cost
+
+    def __bool__(self):
+        return bool(self.turns or self.summary)
+
+    def to_dict(self) -> dict:
+        return {"turns": self.turns, "summary": self.summary, "folded": self.folded, "tokens": self.tokens}
+
+    @classmethod
+    def from_dict(cls, data: dict | None) -> "Transcript":
+        return cls(**data) if data else cls()
+
+
+class Prompt:
+    __slots__ = ("messages", "tokens", "full_tokens", "turns", "summary_lines")
+
+    def __init__(self, messages, tokens, full_tokens, turns, summary_lines):
+        self.messages = messages
+        self.tokens = tokens
+        self.full_tokens = full_tokens
+        self.turns = turns
+        self.summary_lines = summary_lines
+
+    def report(self) -> dict:
+        return {
+            "prompt_tokens": self.tokens,
+            "full_transcript_tokens": self.full_tokens,
+            "turns_verbatim": self.turns,
+            "summary_lines": self.summary_lines,
+        }
+
+
+class PromptBuilder:
+    """
+    Token-budgeted chat prompt: system prompt (plus the rolling summary), the most
+    recent turns verbatim, then the question with its advisor context. When the
+    total would exceed LLM_PROMPT_BUDGET, the oldest verbatim turns are left out
+    first, then the oldest summary lines; the question is always sent.
+    """
+
+    def __init__(self, budget: int | None = None, recent_turns: int | None = None, summary_tokens: int | None = None):
+        self.budget = budget or int(os.getenv("LLM_PROMPT_BUDGET", 1200))
+        self.recent_turns = recent_turns or int(os.getenv("LLM_HISTORY_TURNS", 4))
+        self.summary_tokens = summary_tokens or int(os.getenv("LLM_SUMMARY_TOKENS", 240))
+
+    def record(self, transcript: Transcript, question: str, answer: str):
+        """Append one exchange and fold whatever has left the verbatim window."""
+        transcript.turns.append([question, answer])
+        transcript.tokens += estimate_tokens(question) + estimate_tokens(answer) + 2 * MESSAGE_OVERHEAD
+        while len(transcript.turns) > self.recent_turns:
+            transcript.summary.append(summarize_turn(*transcript.turns.pop(0)))
+            transcript.folded += 1
+        while len(transcript.summary) > 1 and sum(map(estimate_tokens, transcript.summary)) > self.summary_tokens:
+            transcript.summary.pop(0)
+
+    def build(self, system: str, question: str, context: str = "", transcript: Transcript | None = None) -> Prompt:
+        user = f"{context}\nUser: {question}" if context else question
+        fixed = estimate_tokens(system) + estimate_tokens(user) + 2 * MESSAGE_OVERHEAD
+        transcript = transcript or Transcript()
+
+        # Newest turns first, as many as fit
+        turns, used = [], fixed
+        for q, a in reversed(transcript.turns):
+            cost = estimate_tokens(q) + estimate_tokens(a) + 2 * MESSAGE_OVERHEAD
+            if used + cost > self.budget:
+                break
+            turns.insert(0, (q, a))
+            used += cost
+
+        summary = list(transcript.summary)
+        header = "\n\nEarlier in this conversation:\n"
+        while summary and used + estimate_tokens(header + "\n".join(summary)) > self.budget:
+            summary.pop(0)
+        if summary:
+            system = system + header + "\n".join(summary)
+            used += estimate_tokens(header + "\n".join(summary))
+
+        messages = [{"role": "system", "content": system}]
+        for q, a in turns:
+            messages += [{"role": "user", "content": q}, {"role": "assistant", "content": a}]
+        messages.append({"role": "user", "content": user})
+
+        full = fixed + transcript.tokens
+        PROMPT_TOKENS.observe(used, history="yes" if transcript else "no")
+        if full > used:
+            PROMPT_TOKENS_SAVED.inc(full - used)
+        return Prompt(messages, used, full, len(turns), len(summary))
@@ -0,0 +1,104 @@
+# backend/services/readiness.py
+
+import os
+import threading
+import time
+
+
+class Readiness:
+    """
+    Startup warm-up steps and their outcome, reported by GET /ready.
+
+    Steps run in order on a background thread so the server accepts
+    connections (and answers liveness on `/`) while data indexes are still
+    being built. A failing step is recorded with its error instead of
+    stopping the process, then retried with exponential backoff until it
+    succeeds, so a dependency that was briefly unreachable at boot does not
+    keep /ready at 503 until a restart.
+
+    Only critical steps gate readiness. Non-critical ones (e.g. clients that
+    need OPENROUTER_API_KEY or SMTP credentials) are warmed and reported the
+    same way, but a failure there does not take the worker out of rotation.
+    """
+
+    def __init__(self, retry_base: float | None = None, retry_max: float | None = None):
+        self.retry_base = retry_base if retry_base is not None else float(os.getenv("READY_RETRY_SECONDS", 1))
+        self.retry_max = retry_max if retry_max is not None else float(os.getenv("READY_RETRY_MAX_SECONDS", 60))
+        self._steps: list = []  # (name, fn, critical)
+        self._status: dict = {}
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._started_at: float | None = None
+        self._first_pass = threading.Event()
+        self._stop = threading.Event()
+
+    def add(self, name: str, fn, critical: bool = True):
+        self._steps.append((name, fn, critical))
+        self._status[name] = {"status": "pending"} if critical else {"status": "pending", "critical": False}
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._started_at = time.perf_counter()
+            self._thread = threading.Thread(target=self._run, name="warm-up", daemon=True)
+            self._thread.start()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Wait until every step has been tried once (retries carry on in the background)."""
+        if self._thread is not None:
+            self._first_pass.wait(timeout)
+        return self.ready
+
+    def stop(self, timeout: float | None = None):
+        """Cancel pending retries and wait for a step in progress, so shutdown never races a warm-up."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    @property
+    def ready(self) -> bool:
+        with self._lock:
+            return self._ready()
+
+    def report(self) -> dict:
+        with self._lock:
+            return {"ready": self._ready(), "steps": {name: dict(s) for name, s in self._status.items()}}
+
+    def _ready(self) -> bool:
+        return all(s["status"] == "ready" for s in self._status.values() if s.get("critical", True))
+
+    def _run(self):
+        pending, delay = list(self._steps), self.retry_base
+        try:
+            while True:
+                failed = []
+                for step in pending:
+                    if self._stop.is_set():
+                        return
+                    if not self._attempt(*step):
+                        failed.append(step)
+                self._first_pass.set()
+                pending = failed
+                if not pending or self._stop.wait(delay):
+                    return
+                delay = min(delay * 2, self.retry_max)
+        finally:
+            self._first_pass.set()
+
+    def _attempt(self, name, fn, critical) -> bool:
+        t0 = time.perf_counter()
+        try:
+            fn()
+        except Exception as e:
+            row = {"status": "failed", "error": str(e)}
+        else:
+            row = {"status": "ready"}
+        row["ms"] = round((time.perf_counter() - t0) * 1000, 2)
+        row["at_ms"] = round((time.perf_counter() - self._started_at) * 1000, 2)
+        if not critical:
+            row["critical"] = False
+        with self._lock:
+            row["attempts"] = self._status[name].get("attempts", 0) + 1
+            self._status[name] = row
+        return row["status"] == "ready"
@@ -0,0 +1,124 @@
+# backend/services/response_cache.py
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import suppress
+from pathlib import Path
+
+_PUNCT = re.compile(r"[^\w\s₹%]")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_prompt(text: str) -> str:
+    """Fold case, punctuation and whitespace so trivially different phrasings share a key."""
+    text = _PUNCT.sub(" ", (text or "").lower())
+    return _SPACES.sub(" ", text).strip()
+
+
+def cache_key(question: str, context: str = "") -> str:
+    """Key on the normalized question plus a digest of the (generic) context it was asked in."""
+    ctx_digest = hashlib.sha1(normalize_prompt(context).encode("utf-8")).hexdigest()[:12]
+    return f"{ctx_digest}:{normalize_prompt(question)}"
+
+
+class ResponseCache:
+    """
+    LRU + TTL cache for AI answers to generic (non-personalized) questions.
+    Entries expire on wall-clock time so they stay valid across restarts when
+    persisted to AI_CACHE_PATH.
+    """
+
+    def __init__(self, max_entries: int | None = None, ttl_seconds: float | None = None, path: str | None = None):
+        self.max_entries = max_entries or int(os.getenv("AI_CACHE_MAX", 1024))
+        self.ttl_seconds = ttl_seconds or float(os.getenv("AI_CACHE_TTL_SECONDS", 24 * 3600))
+        self.path = Path(path or os.getenv("AI_CACHE_PATH", "")) if (path or os.getenv("AI_CACHE_PATH")) else None
+        self.persist_every = int(os.getenv("AI_CACHE_PERSIST_EVERY", 20))
+
+        self._entries: "OrderedDict[str, tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()  # one flush at a time, so an older snapshot never lands last
+        self._unsaved = 0
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self._load()
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= time.time():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: str, value: str):
+        with self._lock:
+            self._entries[key] = (value, time.time() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._unsaved += 1
+            flush = self.path is not None and self._unsaved >= self.persist_every
+        if flush:
+            self.save()
+
+    def record_bypass(self):
+        """Count a personalized prompt that was deliberately not cached."""
+        with self._lock:
+            self.bypassed += 1
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    # ------------------------------------
+    # Persistence
+    # ------------------------------------
+    def save(self):
+        if self.path is None:
+            return
+        with self._save_lock:
+            with self._lock:
+                now = time.time()
+                rows = [[k, v, exp] for k, (v, exp) in self._entries.items() if exp > now]
+                self._unsaved = 0
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # A temp file of its own, so flushes from other workers sharing the path can't interleave
+            fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=self.path.name + ".", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(rows, f, ensure_ascii=False)
+                os.replace(tmp, self.path)
+            except BaseException:
+                with suppress(FileNotFoundError):
+                    os.unlink(tmp)
+                raise
+
+    def _load(self):
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                rows = json.load(f)
+        except (OSError, ValueError):
+            return  # a corrupt cache file is just a cold cache
+        now = time.time()
+        for key, value, expires_at in rows[-self.max_entries:]:
+            if expires_at > now:
+                self._entries[key] = (value, expires_at)
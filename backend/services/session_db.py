@@ -0,0 +1,199 @@
+# backend/services/session_db.py
+
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_PATH = BACKEND_DIR / "state" / "sessions.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id         TEXT PRIMARY KEY,
+    version    INTEGER NOT NULL,
+    updated_at REAL NOT NULL,
+    data       BLOB NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS sessions_updated_at ON sessions (updated_at);
+"""
+
+_UPSERT = """
+INSERT INTO sessions (id, version, updated_at, data) VALUES (?, 1, ?, ?)
+ON CONFLICT (id) DO UPDATE SET version = version + 1, updated_at = excluded.updated_at, data = excluded.data
+RETURNING version
+"""
+
+_STOP = object()
+
+
+class _Write:
+    __slots__ = ("session_id", "data", "done", "version", "error")
+
+    def __init__(self, session_id: str, data: bytes):
+        self.session_id = session_id
+        self.data = data
+        self.done = threading.Event()
+        self.version = None
+        self.error = None
+
+
+class SessionDB:
+    """
+    SQLite (WAL) persistence for conversation sessions, shared by every uvicorn worker.
+
+    Reads use one connection per thread and never block the writer. Writes go through
+    a single writer thread that group-commits whatever is queued (up to
+    SESSION_DB_BATCH rows) in one transaction; `put()` returns once its row is
+    committed, so the next turn may land on any worker. The database assigns each
+    row a new version on every write, which lets cached copies be revalidated with
+    one indexed lookup. WAL with synchronous=NORMAL survives process restarts;
+    rows idle past the TTL are purged by the writer.
+    """
+
+    def __init__(self, path: Path | str = DEFAULT_PATH, ttl_seconds: float = 1800.0):
+        self.path = str(path)
+        self.ttl_seconds = ttl_seconds
+        self.batch_size = int(os.getenv("SESSION_DB_BATCH", 256))
+        self.purge_interval = float(os.getenv("SESSION_DB_PURGE_INTERVAL", 60))
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+
+        with closing(self._connect()) as conn:
+            conn.executescript(_SCHEMA)
+        self._local = threading.local()
+        self._queue: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self.writes = 0
+        self.commits = 0
+        self.purged = 0
+
+    # ------------------------------------
+    # Reads (any thread)
+    # ------------------------------------
+    def version(self, session_id: str) -> int | None:
+        """Current version of a live session, or None if it is unknown or idle past the TTL."""
+        row = self._reader().execute(
+            "SELECT version FROM sessions WHERE id = ? AND updated_at > ?", (session_id, self._cutoff())
+        ).fetchone()
+        return row[0] if row else None
+
+    def get(self, session_id: str) -> tuple[int, bytes] | None:
+        row = self._reader().execute(
+            "SELECT version, data FROM sessions WHERE id = ? AND updated_at > ?", (session_id, self._cutoff())
+        ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def count(self) -> int:
+        return self._reader().execute(
+            "SELECT COUNT(*) FROM sessions WHERE updated_at > ?", (self._cutoff(),)
+        ).fetchone()[0]
+
+    # ------------------------------------
+    # Writes (group-committed)
+    # ------------------------------------
+    def put(self, session_id: str, data: bytes, timeout: float = 10.0) -> int:
+        """Persist one session and return its new version once the row is committed."""
+        self._ensure_writer()
+        write = _Write(session_id, data)
+        self._queue.put(write)
+        if not write.done.wait(timeout):
+            raise TimeoutError("Session write was not committed in time.")
+        if write.error is not None:
+            raise write.error
+        return write.version
+
+    def delete(self, session_id: str):
+        # A sqlite3 connection's context manager only commits; closing() releases the handle
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+
+    def stats(self) -> dict:
+        return {
+            "path": self.path,
+            "writes": self.writes,
+            "commits": self.commits,
+            "rows_per_commit": round(self.writes / self.commits, 2) if self.commits else 0.0,
+            "purged": self.purged,
+        }
+
+    def close(self):
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    # ------------------------------------
+    # Helpers
+    # ------------------------------------
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=10.0, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _reader(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    def _cutoff(self) -> float:
+        return time.time() - self.ttl_seconds
+
+    def _ensure_writer(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="session-db-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        conn = self._connect()
+        purged_at = 0.0
+        try:
+            while True:
+                batch = [self._queue.get()]
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                stop = _STOP in batch
+                writes = [w for w in batch if w is not _STOP]
+                if writes:
+                    self._commit(conn, writes)
+                now = time.monotonic()
+                if now - purged_at >= self.purge_interval:
+                    self._purge(conn)
+                    purged_at = now
+                if stop:
+                    return
+        finally:
+            conn.close()
+
+    def _commit(self, conn, writes):
+        now = time.time()
+        try:
+            with conn:  # one transaction, one commit for the whole batch
+                for w in writes:
+                    w.version = conn.execute(_UPSERT, (w.session_id, now, w.data)).fetchone()[0]
+            self.writes += len(writes)
+            self.commits += 1
+        except sqlite3.Error as e:
+            for w in writes:
+                w.error = e
+        for w in writes:
+            w.done.set()
+
+    def _purge(self, conn):
+        try:
+            with conn:
+                self.purged += conn.execute("DELETE FROM sessions WHERE updated_at <= ?", (self._cutoff(),)).rowcount
+        except sqlite3.Error:
+            pass  # another worker holds the write lock; purge again next interval
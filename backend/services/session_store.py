@@ -0,0 +1,196 @@
+# backend/services/session_store.py
+
+import json
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+from backend.services.prompt_builder import Transcript
+from backend.services.session_db import DEFAULT_PATH, SessionDB
+
+
+def _new_ctx():
+    return {
+        "name": None,
+        "email": None,
+        "phone": None,
+        "pan": None,
+        "customer": None,
+        "envelope": None,  # UnderwritingAgent.eligibility_envelope, set at KYC
+        "otp": None,
+        "loan_type": None,
+        "requested_amount": None,
+        "preferred_tenure": None,
+        "approved": None,
+        "plans": None,  # SmartAdvisor.compare_tenures picks presented at underwriting
+    }
+
+
+class ConversationSession:
+    """
+    Compact per-applicant conversation record.
+    Holds only what the MasterAgent flow mutates — agents themselves are shared.
+    """
+
+    __slots__ = (
+        "session_id", "state", "ctx", "pending_otp", "otp_job", "otp_verified", "last_seen", "lock", "version",
+        "transcript",
+    )
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.state = "GREETING"
+        self.ctx = _new_ctx()
+        self.pending_otp = None
+        self.otp_job = None  # OTPDispatcher job id of the latest OTP delivery
+        self.otp_verified = False
+        self.transcript = Transcript()  # advisor Q&A for history-aware LLM prompts
+        self.last_seen = time.monotonic()
+        # Serializes concurrent requests for the same conversation
+        self.lock = threading.Lock()
+        self.version = 0  # SessionDB row version this copy reflects (0 = never persisted)
+
+    def dump(self) -> bytes:
+        """Compact persisted form: flow state plus the non-empty ctx fields."""
+        ctx = {k: v for k, v in self.ctx.items() if v is not None}
+        row = {"state": self.state, "ctx": ctx, "otp": self.pending_otp, "otp_job": self.otp_job,
+               "verified": self.otp_verified}
+        if self.transcript:
+            row["transcript"] = self.transcript.to_dict()
+        return json.dumps(row, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    def restore(self, version: int, data: bytes):
+        row = json.loads(data)
+        self.state = row["state"]
+        self.ctx = {**_new_ctx(), **row["ctx"]}
+        self.pending_otp = row.get("otp")
+        self.otp_job = row.get("otp_job")
+        self.otp_verified = row.get("verified", False)
+        self.transcript = Transcript.from_dict(row.get("transcript"))
+        self.version = version
+
+
+class SessionStore:
+    """
+    Session-keyed conversation store with bounded LRU capacity and idle-TTL eviction.
+    Most recently used sessions live at the end of the ordered dict, so both
+    expired and least-recently-used entries are always popped from the front.
+
+    With a SessionDB (SESSION_DB_PATH, on by default; set it empty to keep sessions
+    in memory only) the dict is a read-through cache over SQLite: unknown ids are
+    loaded from the database, `sync()` revalidates a cached copy by row version
+    before each turn and `save()` persists it after, so any worker can continue any
+    conversation and in-flight applications survive restarts.
+    """
+
+    def __init__(self, max_sessions: int | None = None, ttl_seconds: float | None = None,
+                 db_path: str | None = None):
+        self.max_sessions = max_sessions or int(os.getenv("SESSION_MAX", 10000))
+        self.ttl_seconds = ttl_seconds or float(os.getenv("SESSION_TTL_SECONDS", 1800))
+        self.db_path = db_path if db_path is not None else os.getenv("SESSION_DB_PATH", str(DEFAULT_PATH))
+        self._db: SessionDB | None = None
+        self._sessions: "OrderedDict[str, ConversationSession]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evicted = 0
+        self.expired = 0
+        self.loads = 0  # sessions (re)read from the database
+
+    @property
+    def db(self) -> SessionDB | None:
+        """Opened on first use, so importing the router never touches the disk."""
+        if self._db is None and self.db_path:
+            with self._lock:
+                if self._db is None:
+                    self._db = SessionDB(self.db_path, self.ttl_seconds)
+        return self._db
+
+    def get_or_create(self, session_id: str | None = None) -> ConversationSession:
+        """Return the live session for `session_id`, or start a fresh one under a new id."""
+        session = self.get(session_id) if session_id else None
+        if session is not None:
+            return session
+        with self._lock:
+            session = ConversationSession(secrets.token_urlsafe(16))
+            self._sessions[session.session_id] = session
+            self._enforce_capacity()
+            return session
+
+    def get(self, session_id: str) -> ConversationSession | None:
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            session = self._sessions.get(session_id)
+            if session is not None:
+                self._sessions.move_to_end(session_id)
+                session.last_seen = now
+                return session
+        row = self.db.get(session_id) if self.db else None
+        if row is None:
+            return None
+        loaded = ConversationSession(session_id)
+        loaded.restore(*row)
+        with self._lock:
+            self.loads += 1
+            session = self._sessions.setdefault(session_id, loaded)  # another thread may have loaded it too
+            self._enforce_capacity()
+            return session
+
+    def sync(self, session: ConversationSession):
+        """Bring a cached session up to date if another worker advanced it (caller holds session.lock)."""
+        if self.db is None:
+            return
+        version = self.db.version(session.session_id)
+        if version is not None and version != session.version:
+            row = self.db.get(session.session_id)
+            if row is not None:
+                session.restore(*row)
+                with self._lock:
+                    self.loads += 1
+
+    def save(self, session: ConversationSession):
+        """Persist the session after a turn (caller holds session.lock); returns once committed."""
+        if self.db is not None:
+            session.version = self.db.put(session.session_id, session.dump())
+
+    def drop(self, session_id: str):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+        if self.db is not None:
+            self.db.delete(session_id)
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def stats(self) -> dict:
+        return {
+            "active": len(self._sessions),
+            "capacity": self.max_sessions,
+            "ttl_seconds": self.ttl_seconds,
+            "evicted": self.evicted,
+            "expired": self.expired,
+            "loads": self.loads,
+            **({"persisted": self._db.count(), **self._db.stats()} if self._db is not None else {}),
+        }
+
+    # ------------------------------------
+    # Helpers (caller holds self._lock)
+    # ------------------------------------
+    def _expire(self, now: float):
+        cutoff = now - self.ttl_seconds
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if oldest.last_seen > cutoff:
+                break
+            self._sessions.popitem(last=False)
+            self.expired += 1
+
+    def _enforce_capacity(self):
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+            self.evicted += 1
@@ -2,6 +2,8 @@
 
 import math
 
+from backend.services.plan_optimizer import AMOUNT_STEPS, comfortable_amount, plan_grid, recommend
+
 def rupees(n):
     """Formats a number into Indian currency format."""
     if n is None:
@@ -19,6 +21,15 @@ class SmartAdvisor:
     def summarize(self, requested_amount, feasible_options, chosen, best):
         summary_lines = []
 
+        # 📋 One line per plan worth presenting (compare_tenures labels them)
+        plan_lines = []
+        for opt in feasible_options:
+            label = ", ".join(opt.get("labels") or ["option"])
+            plan_lines.append(
+                f"• {label[:1].upper() + label[1:]}: {opt['tenure']} months @ {opt['rate']}% → "
+                f"EMI {rupees(opt['emi'])}/month, Total Interest {rupees(opt['total_interest'])}"
+            )
+
         chosen_emi = chosen["emi"]
         best_emi = best["emi"]
         diff_emi = abs(chosen_emi - best_emi)
@@ -61,10 +72,82 @@ class SmartAdvisor:
 
         return {
             "summary_lines": summary_lines,
+            "plan_lines": plan_lines,
             "chosen_tenure": chosen["tenure"],
             "best_tenure": best["tenure"],
             "chosen_rate": chosen["rate"],
             "best_rate": best["rate"],
             "emi_difference": diff_emi,
             "interest_saving": interest_saving,
-        }
\ No newline at end of file
+        }
+
+    # ==============================
+    # PLAN COMPARISON
+    # ==============================
+    def compare_tenures(self, amount, income, credit_score, base_rate=10.95, preferred_tenure=None):
+        """
+        Search every tenure from 6 to 84 months for the requested amount (and smaller ones)
+        in one vectorized pass, and keep the few non-dominated plans worth presenting.
+        Returns {"plans": [...], "comfortable": the preferred tenure at the largest smaller
+        amount whose EMI stays within 30% of income, when the requested one doesn't}.
+        """
+        amounts = [int(amount)] + [int(amount * step) // 1000 * 1000 for step in AMOUNT_STEPS[1:]]
+        grid = plan_grid(amounts, income, credit_score, base_rate)
+        return {
+            "plans": recommend(grid, preferred_tenure),
+            "comfortable": comfortable_amount(grid, preferred_tenure) if preferred_tenure else None,
+        }
+
+    # ==============================
+    # TEMPLATED ANSWERS
+    # ==============================
+    def fallback_answer(self, question, ctx):
+        """
+        Deterministic reply built from what the conversation already knows (customer,
+        eligibility envelope, approved plan), served while the AI model is unavailable.
+        """
+        q = (question or "").lower()
+        cust, envelope, approved = ctx.get("customer"), ctx.get("envelope"), ctx.get("approved")
+        lines = []
+
+        if approved:
+            plan, best = approved["chosen_plan"], approved.get("best_plan")
+            lines.append(
+                f"Your {rupees(approved['approved_amount'])} loan is approved at {plan['rate']}% for "
+                f"{plan['tenure']} months, with an EMI of {rupees(plan['emi'])}."
+            )
+            if any(w in q for w in ("interest", "total", "cost", "fee", "pay")):
+                lines.append(
+                    f"Total interest comes to {rupees(plan['total_interest'])}, plus a processing fee of "
+                    f"{rupees(plan['processing_fee'])}."
+                )
+            if best and best["tenure"] != plan["tenure"]:
+                lines.append(
+                    f"The {best['tenure']}-month plan at {best['rate']}% (EMI {rupees(best['emi'])}) would save about "
+                    f"{rupees(plan['total_interest'] - best['total_interest'])} in interest."
+                )
+        elif envelope and envelope.get("eligible"):
+            rows = [r for r in envelope["tenures"] if r["max_amount"] > 0]
+            lines.append(
+                f"With your credit score of {envelope['credit_score']}, you can borrow up to "
+                f"{rupees(envelope['max_amount'])}."
+            )
+            if rows:
+                lo, hi = min(rows, key=lambda r: r["rate"]), max(rows, key=lambda r: r["rate"])
+                lines.append(
+                    f"Rates for your profile run from {lo['rate']}% ({lo['tenure']} months) to "
+                    f"{hi['rate']}% ({hi['tenure']} months); longer tenures lower the EMI but add interest."
+                )
+        elif cust:
+            lines.append(
+                f"Your pre-approved limit is {rupees(cust['pre_approved_limit'])} with a credit score of "
+                f"{cust['credit_score']}."
+            )
+        else:
+            lines.append(
+                "CapitalMitra personal loans come with flexible tenures, and we keep your EMI within half "
+                "of your monthly income."
+            )
+            lines.append("Share your details and I’ll work out exactly how much you can borrow.")
+
+        return " ".join(lines)
@@ -0,0 +1,18 @@
+# backend/services/underwriting_policy.py
+
+# Lending policy shared by UnderwritingAgent.evaluate_loan, the KYC-time eligibility
+# envelope and the batch engine, so the three paths cannot drift apart
+MIN_SCORE = 650
+LIMIT_MULTIPLE = 2  # × pre-approved limit
+AFFORDABILITY_CAP = 50  # max EMI as % of monthly income
+TENURES = (12, 24, 36, 48, 60)
+MAX_TENURE = 84  # longest tenure any path will quote, off the standard list or not
+NO_HIT_SCORE = 700  # assumed when the bureau holds no file on the customer
+
+# Rejection reasons, in the order evaluate_loan checks them
+REASONS = {
+    "low_score": f"Credit score below {MIN_SCORE} — not eligible for a loan.",
+    "over_limit": f"Requested amount exceeds {LIMIT_MULTIPLE}× pre-approved limit.",
+    "no_income": "Monthly income details missing.",
+    "unaffordable": f"EMI exceeds {AFFORDABILITY_CAP}% of income for all plans.",
+}
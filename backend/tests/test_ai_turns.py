@@ -0,0 +1,122 @@
+import asyncio
+
+import pytest
+
+from backend.agents import master_agent, sales_agent
+from backend.routers import chat
+from backend.services.llm_guard import LLMUnavailable
+from backend.services.prompt_builder import PromptBuilder
+from backend.services.session_store import ConversationSession
+
+
+class _Sales:
+    def __init__(self, reply):
+        self.reply, self.prompts = reply, PromptBuilder()
+
+    def provide_offer(self, user_message, **kwargs):
+        return dict(self.reply)
+
+
+class _DownLLM:
+    def complete(self, payload):
+        raise LLMUnavailable("circuit open")
+
+    async def stream(self, payload):
+        raise LLMUnavailable("circuit open")
+        yield
+
+
+class _Sessions:
+    def sync(self, session):
+        pass
+
+    def save(self, session):
+        pass
+
+
+@pytest.fixture
+def agent():
+    return master_agent.MasterAgent()
+
+
+@pytest.fixture
+def down_sales(monkeypatch):
+    monkeypatch.setenv("OPENROUTER_API_KEY", "test")
+    agent = sales_agent.SalesAgent()
+    agent.llm = _DownLLM()
+    return agent
+
+
+@pytest.mark.parametrize("reply, recorded", [
+    ({"message": "Your EMI is fixed for the tenure."}, 1),
+    ({"message": "Templated answer from the session.", "fallback": True}, 0),
+])
+def test_only_model_answers_enter_the_transcript(agent, reply, recorded):
+    agent.sales_agent = _Sales(reply)
+    session = ConversationSession("test")
+    agent._ai_context_response(session, "is my EMI fixed?")
+
+    assert len(session.transcript.turns) == recorded
+
+
+def test_streamed_fallback_is_marked_and_not_remembered(agent, down_sales, monkeypatch):
+    agent.sales_agent = down_sales
+    monkeypatch.setattr(chat, "get_master_agent", lambda: agent)
+    monkeypatch.setattr(chat, "sessions", _Sessions())
+    monkeypatch.setattr(agent, "routes_to_ai", lambda session, message: True)
+    session = ConversationSession("test")
+
+    async def turn():
+        return [event async for event in chat._turn_events(session, "is my EMI fixed?")]
+
+    events = asyncio.run(turn())
+
+    assert events[-1][0] == "done" and events[-1][1]["fallback"] is True
+    assert events[-1][1]["message"] == agent.ai_fallback(session, "is my EMI fixed?")
+    assert session.transcript.turns == []
+
+
+def test_streamed_ai_turn_holds_the_session_lock_and_is_timed(agent, down_sales, monkeypatch):
+    agent.sales_agent = down_sales
+    monkeypatch.setattr(chat, "get_master_agent", lambda: agent)
+    monkeypatch.setattr(chat, "sessions", _Sessions())
+    monkeypatch.setattr(agent, "routes_to_ai", lambda session, message: True)
+    session = ConversationSession("test")
+    before = agent.flow.stats.snapshot().get("AI", {}).get("turns", 0)
+
+    async def turn():
+        session.lock.acquire()  # a /chat/ turn in progress on another thread
+        events = []
+
+        async def consume():
+            async for event in chat._turn_events(session, "is my EMI fixed?"):
+                events.append(event)
+
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0.05)
+        assert events == []
+        session.lock.release()
+        await asyncio.wait_for(task, 5)
+        return events
+
+    events = asyncio.run(turn())
+
+    assert events[-1][0] == "done"
+    assert not session.lock.locked()
+    assert agent.flow.stats.snapshot()["AI"]["turns"] == before + 1
+
+
+def test_cancelled_wait_does_not_leak_the_session_lock():
+    session = ConversationSession("test")
+
+    async def abandon():
+        session.lock.acquire()
+        waiter = asyncio.create_task(chat._turn_lock(session).__aenter__())
+        await asyncio.sleep(0.05)
+        waiter.cancel()
+        session.lock.release()
+        await asyncio.sleep(0.2)  # the worker thread takes the lock, then hands it back
+
+    asyncio.run(abandon())
+
+    assert not session.lock.locked()
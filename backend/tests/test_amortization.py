@@ -0,0 +1,75 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.routers import amortization as amortization_router
+from backend.services.amortization import amortize, schedule
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(amortization_router.router)
+    return TestClient(app)
+
+
+def test_rate_cut_with_keep_emi_holds_the_instalment():
+    base = schedule(500000, 12.0, 120)
+    held = schedule(500000, 12.0, 120, rate_resets={13: 9.0}, keep="emi")
+    spread = schedule(500000, 12.0, 120, rate_resets={13: 9.0}, keep="tenure")
+
+    assert held["schedule"][13]["emi"] == base["emi"]
+    assert held["months"] < 120
+    assert spread["schedule"][13]["emi"] < base["emi"] and spread["months"] == 120
+
+
+def test_rate_rise_with_keep_emi_still_clears_the_loan_on_time():
+    risen = schedule(500000, 10.0, 36, rate_resets={13: 14.0}, keep="emi")
+
+    assert risen["months"] == 36
+    assert risen["schedule"][-1]["balance"] == 0.0
+
+
+def test_batch_total_interest_matches_full_schedules(client):
+    loans = [{"principal": 500000, "rate": 10.95, "tenure": 36}, {"principal": 120000, "rate": 0, "tenure": 12}]
+    body = client.post("/amortization/batch", json={"loans": loans}).json()["loans"]
+    full = amortize([500000, 120000], [10.95, 0], [36, 12])
+
+    assert [row["emi"] for row in body] == [round(e, 2) for e in full["emi"].tolist()]
+    assert [row["total_interest"] for row in body] == [round(t, 2) for t in full["interest"].sum(axis=1).tolist()]
+
+
+@pytest.mark.parametrize("loan", [{"principal": 500000, "rate": 10.95}, {"principal": "lots", "rate": 1, "tenure": 12},
+                                  {"principal": 500000, "rate": 10.95, "tenure": 0}, None])
+def test_batch_rejects_bad_loans_with_422(client, loan):
+    r = client.post("/amortization/batch", json={"loans": [{"principal": 1000, "rate": 10, "tenure": 12}, loan]})
+
+    assert r.status_code == 422
+    assert r.json()["detail"].startswith("loans[1]: ")
+
+
+def test_empty_batch(client):
+    assert client.post("/amortization/batch", json={"loans": []}).json() == {"loans": []}
+
+
+@pytest.mark.parametrize("extra", [
+    {"prepayments": {"x": 5}},
+    {"prepayments": [[3, 10000]]},
+    {"prepayments": {"1": -50000}},
+    {"prepayments": {"37": 10000}},
+    {"rate_resets": {"3": "abc"}},
+    {"rate_resets": {"0": 9.0}},
+    {"rate_resets": {"13": -1}},
+])
+def test_schedule_rejects_bad_prepayments_and_resets_with_422(client, extra):
+    r = client.post("/amortization/schedule", json={"principal": 100000, "rate": 10, "tenure": 36, **extra})
+
+    assert r.status_code == 422
+
+
+def test_schedule_applies_valid_prepayments_and_resets(client):
+    body = {"principal": 100000, "rate": 10, "tenure": 36, "prepayments": {"6": 20000}, "rate_resets": {"13": 0}}
+    r = client.post("/amortization/schedule", json=body)
+
+    assert r.status_code == 200
+    assert r.json() == schedule(100000, 10, 36, {6: 20000.0}, {13: 0.0})
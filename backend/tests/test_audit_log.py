@@ -0,0 +1,90 @@
+import json
+import os
+
+import pytest
+
+from backend.services import audit_log
+from backend.services.audit_log import CURRENT, AuditLog, log_files, timeline
+
+
+@pytest.fixture
+def log(tmp_path):
+    log = AuditLog(tmp_path)
+    log.fsync_interval = 0.01
+    yield log
+    log.shutdown()
+
+
+def _lines(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_flush_returns_once_queued_events_are_on_disk(log, tmp_path):
+    assert AuditLog(tmp_path / "unused").flush() is True  # nothing recorded, no writer started
+
+    for i in range(3):
+        log.record("decision", customer_id="CUST001", n=i)
+
+    assert log.flush() is True
+    assert [row["n"] for row in _lines(tmp_path / CURRENT)] == [0, 1, 2]
+    assert log.stats()["written"] == 3
+
+
+def test_rotation_keeps_the_newest_files(log, tmp_path):
+    log.max_bytes, log.keep = 200, 2
+    for i in range(12):
+        log.record("decision", customer_id="CUST001", n=i, pad="x" * 200)  # every line fills a file
+        log.flush()
+
+    rotated = sorted(tmp_path.glob("audit-*.ndjson"))
+    assert log.rotations == 12 and len(rotated) == 2
+    assert log_files(tmp_path) == rotated + [tmp_path / CURRENT]
+    assert [row["n"] for row in timeline("CUST001", tmp_path)] == [10, 11]
+
+
+def test_session_timeline_includes_its_customers_events(log, tmp_path):
+    log.record("kyc", session="sess-1", customer_id="CUST001")
+    log.record("underwriting", customer_id="CUST001", status="approved")
+    log.record("underwriting", customer_id="CUST002", status="rejected")
+    log.record("otp", session="sess-2")
+    log.flush()
+
+    assert [(e["event"], e["customer_id"]) for e in timeline("sess-1", tmp_path)] == [
+        ("kyc", "CUST001"), ("underwriting", "CUST001"),
+    ]
+    assert [e["event"] for e in timeline("CUST002", tmp_path)] == ["underwriting"]
+
+
+def test_failed_writes_are_counted_and_retried(log, tmp_path, monkeypatch):
+    real_fsync, failures = os.fsync, [3]
+
+    def fsync(fd):
+        if failures[0]:
+            failures[0] -= 1
+            raise OSError(28, "No space left on device")
+        real_fsync(fd)
+
+    monkeypatch.setattr(audit_log.os, "fsync", fsync)
+    log.record("decision", customer_id="CUST001")
+
+    assert log.flush(timeout=0.015) is False  # not durable yet
+    assert log.flush(timeout=5) is True
+    assert log.write_errors == 3 and "No space left" in log.stats()["last_error"]
+    assert len(_lines(tmp_path / CURRENT)) == 1  # written once, not once per retry
+
+
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_dead_writer_is_restarted_by_the_next_record(log, tmp_path, monkeypatch):
+    def broken(*row):
+        raise RuntimeError("writer bug")
+
+    monkeypatch.setattr(audit_log, "_encode", broken)
+    log.record("decision", customer_id="CUST001")
+    log._thread.join(5)
+    assert not log._thread.is_alive()
+
+    monkeypatch.undo()
+    log.record("decision", customer_id="CUST002")
+
+    assert log.flush() is True
+    assert [row["customer_id"] for row in _lines(tmp_path / CURRENT)] == ["CUST002"]
@@ -0,0 +1,84 @@
+import pytest
+
+from backend.services import batch_underwriting
+from backend.services.batch_underwriting import BAD_TENURE, BUREAU_DOWN, BatchUnderwriter
+from backend.services.credit_bureau import BureauClient, CreditBureau
+from backend.services.underwriting_policy import MAX_TENURE, NO_HIT_SCORE
+
+CUSTOMERS = {
+    "CUST001": {"customer_id": "CUST001", "pre_approved_limit": 800000, "monthly_income": 150000},
+    "CUST002": {"customer_id": "CUST002", "pre_approved_limit": 300000, "monthly_income": 60000},
+}
+
+
+class _Store:
+    def by_id(self, customer_id):
+        return CUSTOMERS.get(customer_id)
+
+
+class _Audit:
+    def __init__(self):
+        self.events = []
+
+    def record(self, event, **fields):
+        self.events.append((event, fields))
+
+
+class _Bureau(BureauClient):
+    def __init__(self, scores=None, fail=False):
+        self.scores, self.fail = scores or {}, fail
+
+    def fetch(self, customer_id):
+        if self.fail:
+            raise ConnectionError("bureau down")
+        return self.scores.get(customer_id)
+
+
+@pytest.fixture
+def run(monkeypatch):
+    audit = _Audit()
+
+    def run(client, items, chunk_size=10000):
+        monkeypatch.setattr(batch_underwriting, "get_customer_store", lambda: _Store())
+        monkeypatch.setattr(batch_underwriting, "get_credit_bureau", lambda: CreditBureau(client))
+        monkeypatch.setattr(batch_underwriting, "get_audit_log", lambda: audit)
+        return list(BatchUnderwriter(chunk_size).evaluate(items)), audit.events
+
+    return run
+
+
+def test_no_hit_assumes_policy_score_and_is_audited(run):
+    rows, events = run(_Bureau({"CUST001": 780}), [
+        {"customer_id": "CUST001", "amount": 500000, "tenure": 36},
+        {"customer_id": "CUST002", "amount": 200000, "tenure": 36},
+    ])
+
+    assert [row["status"] for row in rows] == ["approved", "approved"]
+    assert events == [("bureau_no_hit", {"customer_id": "CUST002", "assumed_score": NO_HIT_SCORE})]
+
+
+def test_bureau_outage_yields_error_rows_instead_of_ending_the_stream(run):
+    items = [{"customer_id": cid, "amount": 200000, "tenure": 36} for cid in ("CUST001", "CUST002", "CUST404")]
+    rows, _ = run(_Bureau(fail=True), items, chunk_size=2)
+
+    assert [(row["customer_id"], row["status"]) for row in rows] == [
+        ("CUST001", "error"), ("CUST002", "error"), ("CUST404", "rejected"),
+    ]
+    assert rows[0]["reason"] == BUREAU_DOWN
+
+
+@pytest.mark.parametrize("tenure", [-12, 0, MAX_TENURE + 1])
+def test_out_of_range_tenure_is_invalid_in_place(run, tenure):
+    rows, _ = run(_Bureau({"CUST001": 780}), [
+        {"customer_id": "CUST001", "amount": 500000, "tenure": tenure},
+        {"customer_id": "CUST001", "amount": 500000, "tenure": 36},
+    ])
+
+    assert rows[0] == {"customer_id": "CUST001", "status": "invalid", "reason": BAD_TENURE}
+    assert rows[1]["status"] == "approved" and rows[1]["chosen_plan"]["tenure"] == 36
+
+
+def test_chunk_of_only_invalid_items(run):
+    rows, _ = run(_Bureau(fail=True), [{"customer_id": "CUST001", "amount": 500000, "tenure": 0}])
+
+    assert [row["status"] for row in rows] == ["invalid"]
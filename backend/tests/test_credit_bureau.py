@@ -0,0 +1,115 @@
+import threading
+import time
+
+import pytest
+
+from backend.services import credit_bureau
+from backend.services.credit_bureau import BureauClient, BureauUnavailable, CreditBureau
+
+
+class _Client(BureauClient):
+    """Records every round trip; `gate` holds fetches until the test releases it."""
+
+    def __init__(self, scores=None, fail_on=(), gate=None):
+        self.table = scores or {}
+        self.fail_on, self.gate = set(fail_on), gate
+        self.calls = []
+
+    def fetch(self, customer_id):
+        self.calls.append([customer_id])
+        if self.gate is not None:
+            self.gate.wait(5)
+        if customer_id in self.fail_on:
+            raise ConnectionError("bureau timed out")
+        return self.table.get(customer_id)
+
+    def fetch_many(self, customer_ids):
+        self.calls.append(list(customer_ids))
+        if self.fail_on & set(customer_ids):
+            raise ConnectionError("bureau timed out")
+        return {cid: self.table.get(cid) for cid in customer_ids}
+
+
+def _until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    assert condition()
+
+
+def _lookups(bureau, n):
+    results, threads = [None] * n, []
+
+    def lookup(i):
+        try:
+            results[i] = bureau.score("CUST001")
+        except BureauUnavailable as e:
+            results[i] = e
+
+    for i in range(n):
+        threads.append(threading.Thread(target=lookup, args=(i,)))
+        threads[-1].start()
+    return results, threads
+
+
+def test_concurrent_lookups_share_one_fetch():
+    gate = threading.Event()
+    client = _Client({"CUST001": 780}, gate=gate)
+    bureau = CreditBureau(client)
+
+    results, threads = _lookups(bureau, 8)
+    _until(lambda: bureau.stats()["coalesced"] == 7)
+    gate.set()
+    for t in threads:
+        t.join(5)
+
+    assert results == [780] * 8
+    assert client.calls == [["CUST001"]]
+    assert bureau.score("CUST001") == 780 and len(client.calls) == 1  # now cached
+
+
+def test_waiters_get_bureau_unavailable_when_the_leader_fails():
+    gate = threading.Event()
+    client = _Client({"CUST001": 780}, fail_on={"CUST001"}, gate=gate)
+    bureau = CreditBureau(client)
+
+    results, threads = _lookups(bureau, 4)
+    _until(lambda: bureau.stats()["coalesced"] == 3)
+    gate.set()
+    for t in threads:
+        t.join(5)
+
+    assert all(isinstance(r, BureauUnavailable) for r in results)
+    assert len(client.calls) == 1 and bureau.stats()["errors"] == 1
+    client.fail_on.clear()
+    assert bureau.score("CUST001") == 780  # nothing left in flight; the next lookup fetches again
+
+
+def test_prefetch_chunk_failure_releases_the_remaining_chunks():
+    ids = [f"CUST00{i}" for i in range(1, 7)]
+    client = _Client({cid: 700 + i for i, cid in enumerate(ids)}, fail_on={"CUST003"})
+    bureau = CreditBureau(client, batch_size=2)
+
+    with pytest.raises(BureauUnavailable):
+        bureau.prefetch(ids)
+
+    assert client.calls == [ids[0:2], ids[2:4]]  # the third chunk is never sent
+    assert bureau._inflight == {}
+    assert bureau.scores(ids[:2]) == {"CUST001": 700, "CUST002": 701}  # the landed chunk is cached
+    client.fail_on.clear()
+    assert bureau.score("CUST006") == 705  # would hang on a leaked flight
+
+
+def test_scores_and_no_hits_expire_on_their_own_ttls(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(credit_bureau.time, "monotonic", lambda: now[0])
+    client = _Client({"CUST001": 780})
+    bureau = CreditBureau(client, ttl=100, no_hit_ttl=10)
+
+    assert bureau.score("CUST001") == 780 and bureau.score("CUST404") is None
+    now[0] += 11
+    bureau.score("CUST001"), bureau.score("CUST404")
+    assert client.calls == [["CUST001"], ["CUST404"], ["CUST404"]]  # only the no-hit was refetched
+    now[0] += 90
+    bureau.score("CUST001")
+    assert client.calls[-1] == ["CUST001"] and bureau.stats()["no_hits"] == 2
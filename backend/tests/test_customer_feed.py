@@ -0,0 +1,50 @@
+import base64
+import json
+
+import pytest
+
+from backend.services.customer_feed import CustomerFeed, decode_cursor, encode_cursor
+
+CUSTOMERS = [
+    {"customer_id": f"CUST{i:03d}", "name": f"Customer {i}", "city": "Mumbai" if i % 2 else "Pune"}
+    for i in range(1, 7)
+]
+
+
+class _Store:
+    def customers(self):
+        return CUSTOMERS
+
+
+def _forged(value) -> str:
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).decode().rstrip("=")
+
+
+@pytest.fixture
+def feed():
+    return CustomerFeed(store=_Store())
+
+
+def test_projection_and_paging(feed):
+    first = json.loads(feed.page(limit=4, fields=["name"]).body)
+    rest = json.loads(feed.page(limit=4, fields=["name"], cursor=first["next_cursor"]).body)
+
+    assert first["items"][0] == {"name": "Customer 1"} and first["count"] == 4
+    assert [row["name"] for row in rest["items"]] == ["Customer 5", "Customer 6"] and rest["next_cursor"] is None
+
+
+def test_unknown_fields_are_rejected(feed):
+    with pytest.raises(ValueError, match="Unknown field bogus"):
+        feed.page(fields=["name", "bogus"])
+    with pytest.raises(ValueError, match="Unknown field bogus"):
+        feed.etag(fields=["bogus"])
+
+
+@pytest.mark.parametrize("cursor", [_forged(["CUST001"]), _forged({"id": 1}), _forged(7), "%%%"])
+def test_forged_cursors_are_malformed(feed, cursor):
+    with pytest.raises(ValueError, match="Malformed cursor"):
+        feed.page(cursor=cursor)
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor("CUST042")) == "CUST042"
@@ -0,0 +1,52 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.routers import sanction
+from backend.services import letter_jobs as letter_jobs_module
+from backend.services.letter_jobs import LetterJobs, render_letter
+from backend.services.letter_store import LetterStore, letter_key
+
+LETTER = {"name": "Rajesh Kumar", "amount": 500000, "rate": 10.95, "tenure": 36}
+
+
+def test_render_letter_returns_pdf_bytes():
+    assert render_letter(**LETTER).startswith(b"%PDF")
+
+
+@pytest.fixture
+def jobs(tmp_path, monkeypatch):
+    monkeypatch.delenv("LETTER_SIGNING_KEY", raising=False)
+    store = LetterStore(tmp_path)
+    store.put(letter_key(**LETTER), b"%PDF-1.4 letter")  # already rendered, so no pool is needed
+    return LetterJobs(store=store)
+
+
+def test_sibling_worker_resolves_an_issued_job_through_the_shared_store(jobs, tmp_path):
+    job_id = jobs.submit(**LETTER)
+    sibling = LetterJobs(store=LetterStore(tmp_path))
+
+    assert jobs.status(job_id)["status"] == "done"
+    assert sibling.status(job_id) == {"status": "done", "key": letter_key(**LETTER), "error": None, "remote": True}
+
+
+def test_job_ids_the_server_did_not_issue_resolve_to_nothing(jobs):
+    job_id = jobs.submit(**LETTER)
+    key = letter_key(**LETTER)
+
+    assert jobs.status(f"anything-{key}") is None
+    assert jobs.status(f"{job_id[:-1]}{'0' if job_id[-1] != '0' else '1'}") is None
+    assert jobs.status(key) is None
+
+
+def test_letters_are_served_only_by_job_id(jobs, monkeypatch):
+    monkeypatch.setattr(letter_jobs_module, "_jobs", jobs)
+    app = FastAPI()
+    app.include_router(sanction.router)
+    client = TestClient(app)
+    job_id = jobs.submit(**LETTER)
+
+    assert client.get(f"/sanction/jobs/{job_id}").json()["link"] == f"/sanction/jobs/{job_id}/download"
+    assert client.get(f"/sanction/jobs/{job_id}/download").content == b"%PDF-1.4 letter"
+    assert client.get(f"/sanction/jobs/forged-{letter_key(**LETTER)}/download").status_code == 404
+    assert client.get(f"/sanction/letters/{letter_key(**LETTER)}").status_code == 404
@@ -0,0 +1,26 @@
+import pytest
+
+from backend.services.offer_engine import OfferRule
+
+
+def _rule(eligibility: str) -> OfferRule:
+    return OfferRule({"offer_id": "X", "interest_rate": 11.5, "tenure_months": 36, "eligibility": eligibility})
+
+
+@pytest.mark.parametrize("text, verified, existing", [
+    ("Existing verified customers only.", True, True),
+    ("For verified customers with income above ₹50,000/month.", True, False),
+    ("Open to unverified applicants.", False, False),
+    ("Not verified required; non-existing customers welcome.", False, False),
+    ("Credit score above 700, stable employment.", False, False),
+])
+def test_verification_and_existing_flags(text, verified, existing):
+    rule = _rule(text)
+
+    assert (rule.verified_only, rule.existing_only) == (verified, existing)
+
+
+def test_thresholds():
+    rule = _rule("For verified customers with income above ₹50,000/month and credit score above 700.")
+
+    assert rule.min_income == 50001 and rule.min_score == 701
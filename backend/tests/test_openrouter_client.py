@@ -0,0 +1,32 @@
+import threading
+
+from backend.services import openrouter_client
+from backend.services.openrouter_client import OpenRouterClient
+
+
+def test_concurrent_first_requests_share_one_pool(monkeypatch):
+    built = []
+    real = openrouter_client.httpx.Client
+
+    def slow_client(**kwargs):
+        built.append(kwargs)
+        threading.Event().wait(0.01)  # widen the window between check and assignment
+        return real(**kwargs)
+
+    monkeypatch.setattr(openrouter_client.httpx, "Client", slow_client)
+    client = OpenRouterClient("key", api_url="http://127.0.0.1:9/")
+    start = threading.Barrier(8)
+    pools = []
+
+    def first_request():
+        start.wait()
+        pools.append(client._sync_client())
+
+    threads = [threading.Thread(target=first_request) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    client.close()
+
+    assert len(built) == 1 and len({id(pool) for pool in pools}) == 1
@@ -0,0 +1,59 @@
+import time
+
+from backend.services.readiness import Readiness
+
+
+def _flaky(failures):
+    calls = []
+
+    def step():
+        calls.append(time.perf_counter())
+        if len(calls) <= failures:
+            raise OSError("database is locked")
+
+    return step, calls
+
+
+def test_transient_failure_is_retried_until_ready():
+    step, calls = _flaky(2)
+    readiness = Readiness(retry_base=0.01, retry_max=0.02)
+    readiness.add("session_db", step)
+    readiness.start()
+
+    assert readiness.wait(5) is False  # first pass failed
+    deadline = time.monotonic() + 5
+    while not readiness.ready and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert readiness.ready
+    assert readiness.report()["steps"]["session_db"]["attempts"] == 3 == len(calls)
+    readiness.stop(5)
+
+
+def test_non_critical_failure_does_not_gate_readiness():
+    def no_secret():
+        raise ValueError("OPENROUTER_API_KEY not found")
+
+    readiness = Readiness(retry_base=60)
+    readiness.add("customer_data", lambda: None)
+    readiness.add("llm_client", no_secret, critical=False)
+    readiness.start()
+
+    assert readiness.wait(5) is True
+    step = readiness.report()["steps"]["llm_client"]
+    assert step["status"] == "failed" and step["critical"] is False
+    readiness.stop(5)
+
+
+def test_stop_cancels_pending_retries():
+    step, calls = _flaky(10 ** 6)
+    readiness = Readiness(retry_base=60)
+    readiness.add("offer_index", step)
+    readiness.start()
+    readiness.wait(5)
+
+    t0 = time.perf_counter()
+    readiness.stop(5)
+
+    assert time.perf_counter() - t0 < 1 and len(calls) == 1
+    assert not readiness._thread.is_alive()
@@ -0,0 +1,31 @@
+import json
+import threading
+
+from backend.services.response_cache import ResponseCache
+
+
+def test_concurrent_flushes_leave_one_complete_file(tmp_path):
+    path = tmp_path / "ai_cache.json"
+    cache = ResponseCache(max_entries=500, ttl_seconds=60, path=str(path))
+    for i in range(200):
+        cache.put(f"k{i}", "answer " * 50)
+
+    errors = []
+
+    def flush():
+        try:
+            for _ in range(20):
+                cache.save()
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=flush) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert len(json.loads(path.read_text(encoding="utf-8"))) == 200
+    assert [p.name for p in tmp_path.iterdir()] == ["ai_cache.json"]
+    assert ResponseCache(path=str(path)).get("k7") == "answer " * 50
@@ -0,0 +1,69 @@
+import pytest
+
+from backend.agents import master_agent, underwriting_agent
+from backend.services.audit_log import AuditLog
+from backend.services.credit_bureau import BureauClient, CreditBureau
+from backend.services.session_store import ConversationSession
+
+
+class _Bureau(BureauClient):
+    def fetch(self, customer_id):
+        return 780
+
+
+class _Letters:
+    def __init__(self):
+        self.submitted = []
+
+    def submit_letter(self, **kwargs):
+        self.submitted.append(kwargs)
+        return "job-1"
+
+
+@pytest.fixture
+def agent(tmp_path, monkeypatch):
+    monkeypatch.setattr(underwriting_agent, "get_audit_log", lambda: AuditLog(tmp_path))
+    monkeypatch.setattr(underwriting_agent, "get_credit_bureau", lambda: CreditBureau(_Bureau()))
+    agent = master_agent.MasterAgent()
+    agent.sanction_agent = _Letters()
+    return agent
+
+
+@pytest.fixture
+def session(agent):
+    session = ConversationSession("test")
+    customer = agent.customer_store.customers()[0]
+    session.ctx.update(customer=customer, requested_amount=1200000, preferred_tenure=36,
+                       envelope={"eligible": True, "credit_score": 780})
+    session.state = "UNDERWRITING"
+    offer = agent._underwrite_and_decide(session)
+    assert session.state == "SANCTION" and offer["plans"]
+    return session
+
+
+@pytest.mark.parametrize("reply", ["no", "wait", "not now", "hmm, yes later? no"])
+def test_anything_but_yes_keeps_the_offer_open(agent, session, reply):
+    r = agent.process_message(reply, session)
+
+    assert "sanction_letter" not in r and session.state == "SANCTION"
+    assert agent.sanction_agent.submitted == []
+
+
+def test_unknown_tenure_is_reprompted(agent, session):
+    offered = {p["tenure"] for p in session.ctx["plans"]}
+    unknown = next(t for t in (12, 24, 48, 60) if t not in offered)
+
+    r = agent.process_message(str(unknown), session)
+
+    assert r["message"].startswith(f"{unknown} months isn’t one of the plans above")
+    assert agent.sanction_agent.submitted == [] and session.state == "SANCTION"
+
+
+def test_switch_then_yes_sanctions_the_new_plan(agent, session):
+    alt = next(p["tenure"] for p in session.ctx["plans"] if p["tenure"] != 36)
+
+    agent.process_message(f"{alt} months", session)
+    r = agent.process_message("yes please", session)
+
+    assert r["sanction_letter"] == "/sanction/jobs/job-1/download"
+    assert agent.sanction_agent.submitted[0]["tenure"] == alt
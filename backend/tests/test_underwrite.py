@@ -0,0 +1,64 @@
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.routers import underwrite
+from backend.services import batch_underwriting
+from backend.services.batch_underwriting import BAD_AMOUNT, BAD_TERMS
+from backend.services.credit_bureau import BureauClient, CreditBureau
+
+
+class _Store:
+    def by_id(self, customer_id):
+        if customer_id == "CUST001":
+            return {"customer_id": "CUST001", "pre_approved_limit": 800000, "monthly_income": 150000}
+
+
+class _Bureau(BureauClient):
+    def fetch(self, customer_id):
+        return 780
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(batch_underwriting, "get_customer_store", lambda: _Store())
+    monkeypatch.setattr(batch_underwriting, "get_credit_bureau", lambda: CreditBureau(_Bureau()))
+    app = FastAPI()
+    app.include_router(underwrite.router)
+    return TestClient(app)
+
+
+def _rows(response):
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_unusable_items_come_back_invalid_without_ending_the_stream(client):
+    r = client.post("/underwrite/batch", json={"items": [
+        {"customer_id": "CUST001", "amount": "abc", "tenure": 36},
+        {"customer_id": "CUST001", "amount": -5, "tenure": 36},
+        {"customer_id": ["CUST001"], "amount": 500000, "tenure": 36},
+        {"customer_id": "CUST001", "amount": 500000, "tenure": 36},
+    ]})
+
+    assert r.status_code == 200
+    rows = _rows(r)
+    assert [(row["status"], row.get("reason")) for row in rows[:3]] == [
+        ("invalid", BAD_TERMS), ("invalid", BAD_AMOUNT), ("invalid", BAD_TERMS),
+    ]
+    assert rows[3]["status"] == "approved"
+
+
+@pytest.mark.parametrize("body", [
+    {"items": [], "base_rate": "abc"},
+    {"items": [], "base_rate": None},
+    {"items": {"customer_id": "CUST001"}},
+    {"items": ["CUST001"]},
+    {"grid": ["CUST001"]},
+    {"grid": {"customer_ids": "CUST001", "amounts": [500000]}},
+    {"grid": {"customer_ids": ["CUST001"], "amounts": 500000}},
+    {},
+])
+def test_malformed_body_is_rejected_before_streaming(client, body):
+    assert client.post("/underwrite/batch", json=body).status_code == 422
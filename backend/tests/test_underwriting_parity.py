@@ -0,0 +1,37 @@
+import pytest
+
+from backend.agents import underwriting_agent
+from backend.services.audit_log import AuditLog
+from backend.services.batch_underwriting import decisions, evaluate_arrays
+from backend.services.credit_bureau import BureauClient, CreditBureau
+
+CUSTOMER = {"customer_id": "CUST001", "pre_approved_limit": 800000, "monthly_income": 150000}
+
+
+class _Bureau(BureauClient):
+    def fetch(self, customer_id):
+        return 780
+
+
+@pytest.fixture
+def agent(tmp_path, monkeypatch):
+    monkeypatch.setattr(underwriting_agent, "get_audit_log", lambda: AuditLog(tmp_path))
+    monkeypatch.setattr(underwriting_agent, "get_credit_bureau", lambda: CreditBureau(_Bureau()))
+    return underwriting_agent.UnderwritingAgent()
+
+
+@pytest.mark.parametrize("tenure", [12, 18, 36, 72])
+@pytest.mark.parametrize("amount", [300000, 1200000, 1600000])
+def test_batch_matches_evaluate_loan(agent, amount, tenure):
+    scalar = agent.evaluate_loan(CUSTOMER, {"proposed_amount": amount, "tenure": tenure})
+    res = evaluate_arrays([780], [CUSTOMER["pre_approved_limit"]], [CUSTOMER["monthly_income"]], [amount], [tenure])
+
+    assert next(decisions(res)) == scalar
+
+
+def test_off_list_tenure_is_chosen(agent):
+    res = evaluate_arrays([780], [800000], [150000], [500000], [18])
+    decision = next(decisions(res))
+
+    assert decision["chosen_plan"]["tenure"] == 18
+    assert [opt["tenure"] for opt in decision["all_options"]] == [12, 18, 24, 36, 48, 60]
@@ -0,0 +1,53 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.routers import upload
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(upload, "UPLOAD_DIR", tmp_path)
+    monkeypatch.setattr(upload, "MAX_UPLOAD_BYTES", 1024)
+    monkeypatch.setattr(upload, "MAX_BODY_BYTES", 1024 + 512)
+    app = FastAPI()
+    app.include_router(upload.router)
+    return TestClient(app)
+
+
+def test_upload_is_stored_once_per_content(client, tmp_path):
+    files = {"file": ("payslip.PDF", b"%PDF-1.4 payslip", "application/pdf")}
+    first = client.post("/upload/", files=files, data={"note": "march"}).json()
+    again = client.post("/upload/", files=files).json()
+
+    assert first["filename"] == "payslip.PDF" and first["size"] == 16 and not first["duplicate"]
+    assert again["duplicate"] and again["path"] == first["path"]
+    assert (tmp_path / f"{first['sha256']}.pdf").read_bytes() == b"%PDF-1.4 payslip"
+
+
+def test_chunked_upload_without_content_length_is_cut_off(client, tmp_path):
+    boundary = "cmboundary"
+    head = (f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"big.bin\"\r\n"
+            "Content-Type: application/octet-stream\r\n\r\n").encode()
+
+    def body():
+        yield head
+        for _ in range(64):
+            yield b"x" * 256
+        yield f"\r\n--{boundary}--\r\n".encode()
+
+    r = client.post("/upload/", content=body(), headers={"content-type": f"multipart/form-data; boundary={boundary}"})
+
+    assert r.status_code == 413
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_upload_without_file_field_is_rejected(client):
+    assert client.post("/upload/", files={"other": ("a.txt", b"hi")}).status_code == 400
+    assert client.post("/upload/", json={"file": "x"}).status_code == 400
+
+
+def test_malformed_content_length_is_a_bad_request(client):
+    headers = {"content-type": "multipart/form-data; boundary=cmboundary", "content-length": "lots"}
+
+    assert client.post("/upload/", content=b"--cmboundary--\r\n", headers=headers).status_code == 400
@@ -1,6 +1,7 @@
-import { useState, useEffect } from "react";
+import { useState, useEffect, useRef } from "react";
 import axios from "axios";
 import { BASE_URL } from "./config";
+import { ChatSocket, SocketUnavailableError, type ChatReply, type PushEvent } from "./chatSocket";
 import Navbar from "./components/Navbar";
 import ChatWindow from "./components/ChatWindow";
 import FileUpload from "./components/FileUpload";
@@ -55,6 +56,21 @@ export default function App() {
     }
   }, [viewState]);
 
+  // --- One WebSocket for the whole conversation (POST /chat/ if it can't connect) ---
+  const socketRef = useRef<ChatSocket | null>(null);
+  useEffect(() => () => socketRef.current?.close(), []);
+
+  const chatSocket = () => {
+    if (!socketRef.current) {
+      socketRef.current = new ChatSocket(
+        () => localStorage.getItem("capitalmitra_session"),
+        (id) => localStorage.setItem("capitalmitra_session", id),
+        handlePushEvent
+      );
+    }
+    return socketRef.current;
+  };
+
   // --- Persist chat state ---
   useEffect(() => {
     if (messages.length > 0)
@@ -94,16 +110,66 @@ export default function App() {
     ]);
   };
 
+  // ========================
+  // 🔔 SERVER PUSH
+  // ========================
+  const handlePushEvent = (event: PushEvent) => {
+    if (event.type === "otp") {
+      if (event.status === "sent") toast.success("📧 Your OTP has been delivered.");
+      else toast.error("⚠️ We couldn’t deliver your OTP. Type 'resend' to try again.");
+    } else if (event.status === "done" && event.download) {
+      setLoanDetails((prev) => ({ ...prev, sanctionLetterUrl: `${BASE_URL}${event.download}` }));
+      toast.success("📄 Your sanction letter is ready.");
+    } else {
+      toast.error("⚠️ Your sanction letter could not be generated. Please try again.");
+    }
+  };
+
   // ========================
   // 🤖 GET BACKEND RESPONSE
   // ========================
+  const sendOverHttp = async (userMessage: string): Promise<ChatReply> => {
+    const sessionId = localStorage.getItem("capitalmitra_session");
+    const res = await axios.post(
+      `${BASE_URL}/chat/`,
+      { message: userMessage },
+      { headers: sessionId ? { "X-Session-ID": sessionId } : {} }
+    );
+    if (res.data?.session_id) localStorage.setItem("capitalmitra_session", res.data.session_id);
+    return res.data;
+  };
+
   const getBotResponse = async (userMessage: string) => {
     setIsLoading(true);
+    // AI answers stream in token by token; they grow one bubble until the reply arrives
+    const streamId = `stream-${Date.now()}`;
+    let streamed = "";
+    const onToken = (token: string) => {
+      streamed += token;
+      setMessages((prev) =>
+        prev.some((m) => m.id === streamId)
+          ? prev.map((m) => (m.id === streamId ? { ...m, text: streamed } : m))
+          : [...prev, { id: streamId, text: streamed, isBot: true, timestamp: new Date().toLocaleTimeString([], { hour: "2-digit", minute: "2-digit" }) }]
+      );
+    };
+
     try {
-      const res = await axios.post(`${BASE_URL}/chat/`, { message: userMessage });
-      const data = res.data;
+      let data: ChatReply;
+      try {
+        data = await chatSocket().send(userMessage, onToken);
+      } catch (err) {
+        if (!(err instanceof SocketUnavailableError)) throw err;
+        data = await sendOverHttp(userMessage);
+      }
 
-      if (data?.message) addBotMessage(data.message);
+      if (data?.message) {
+        if (streamed) {
+          const text = data.message;
+          setMessages((prev) => prev.map((m) => (m.id === streamId ? { ...m, text } : m)));
+        } else {
+          addBotMessage(data.message);
+        }
+      }
 
       // ✅ Dynamic: If backend returns sanction info, go to Sanction View
       if (data?.approved || data?.sanction_letter) {
@@ -177,7 +243,10 @@ export default function App() {
     setLoanDetails({ amount: "", interestRate: "", tenure: "" });
     setCurrentStage(1);
     setViewState("landing");
+    socketRef.current?.close();
+    socketRef.current = null;
     localStorage.removeItem("capitalmitra_chat");
+    localStorage.removeItem("capitalmitra_session");
   };
 
   // ========================
@@ -0,0 +1,108 @@
+import { BASE_URL } from "./config";
+
+// Body of a chat reply — the same fields POST /chat/ returns
+// eslint-disable-next-line @typescript-eslint/no-explicit-any
+export type ChatReply = { message?: string; session_id?: string; [key: string]: any };
+
+// Pushed when an OTP delivery or a sanction letter render finishes
+export interface PushEvent {
+  type: "otp" | "letter";
+  job: string;
+  status: string;
+  error?: string | null;
+  download?: string;
+}
+
+// The socket could not be opened at all: nothing was sent, so POST /chat/ is a safe fallback
+export class SocketUnavailableError extends Error {}
+
+interface Pending {
+  resolve: (reply: ChatReply) => void;
+  reject: (err: Error) => void;
+  onToken?: (token: string) => void;
+}
+
+/**
+ * One WebSocket to /chat/ws carrying every turn of the conversation.
+ * Connects lazily on the first message and reconnects on the next one after a drop;
+ * `send` rejects with SocketUnavailableError if the socket can't be opened.
+ */
+export class ChatSocket {
+  private ws: WebSocket | null = null;
+  private opening: Promise<WebSocket> | null = null;
+  private pending: Pending | null = null;
+
+  constructor(
+    private sessionId: () => string | null,
+    private onSession: (id: string) => void,
+    private onEvent: (event: PushEvent) => void
+  ) {}
+
+  async send(message: string, onToken?: (token: string) => void): Promise<ChatReply> {
+    const ws = await this.connect();
+    return new Promise((resolve, reject) => {
+      this.pending = { resolve, reject, onToken };
+      ws.send(JSON.stringify({ type: "message", message }));
+    });
+  }
+
+  close() {
+    this.ws?.close();
+    this.ws = null;
+  }
+
+  private connect(): Promise<WebSocket> {
+    if (this.ws?.readyState === WebSocket.OPEN) return Promise.resolve(this.ws);
+    if (this.opening) return this.opening;
+
+    const id = this.sessionId();
+    const url = `${BASE_URL.replace(/^http/, "ws")}/chat/ws${id ? `?session_id=${encodeURIComponent(id)}` : ""}`;
+    this.opening = new Promise((resolve, reject) => {
+      const ws = new WebSocket(url);
+      ws.onopen = () => {
+        this.ws = ws;
+        this.opening = null;
+        resolve(ws);
+      };
+      ws.onerror = () => {
+        this.opening = null;
+        reject(new SocketUnavailableError("WebSocket connection failed"));
+      };
+      ws.onclose = () => {
+        if (this.ws === ws) this.ws = null;
+        this.pending?.reject(new Error("WebSocket closed"));
+        this.pending = null;
+      };
+      ws.onmessage = (e) => this.dispatch(ws, JSON.parse(e.data));
+    });
+    return this.opening;
+  }
+
+  // eslint-disable-next-line @typescript-eslint/no-explicit-any
+  private dispatch(ws: WebSocket, frame: any) {
+    switch (frame.type) {
+      case "session":
+        this.onSession(frame.session_id);
+        break;
+      case "token":
+        this.pending?.onToken?.(frame.token);
+        break;
+      case "reply":
+        if (frame.session_id) this.onSession(frame.session_id);
+        this.pending?.resolve(frame);
+        this.pending = null;
+        break;
+      case "error":
+        this.pending?.reject(new Error(frame.detail));
+        this.pending = null;
+        break;
+      case "ping":
+        ws.send(JSON.stringify({ type: "pong" }));
+        break;
+      case "otp":
+      case "letter":
+        this.onEvent(frame);
+        break;
+    }
+  }
+}